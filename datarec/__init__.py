@@ -1,5 +1,8 @@
 from .io.rawdata import RawData
-from .data.dataset import DataRec, from_pickle
+from .data.dataset import DataRec, from_pickle, from_snapshot
+from .data.mapped import MappedDataRec
+from .data.lazy import LazyDataRec
+from .data.partition import PartitionedDataRec
 from datarec.registry.utils import available_datasets, print_available_datasets
 
 
@@ -14,7 +17,11 @@ from .io.cache import (
 __all__ = [
     # Core classes
     "DataRec",
+    "MappedDataRec",
+    "LazyDataRec",
+    "PartitionedDataRec",
     "from_pickle",
+    "from_snapshot",
     "RawData",
     # Cache management
     "cache_summary",
@@ -0,0 +1,374 @@
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from datarec.data.characteristics import CHARACTERISTICS, CHARACTERISTIC_REQUIREMENTS
+
+# number of hash-disjoint groups of sampled IDs used to estimate the error of degree-based characteristics
+REPLICATES = 10
+
+
+def hash_ids(values) -> np.ndarray:
+    """
+    Hashes an array-like of IDs to 64-bit integers with `pd.util.hash_array`.
+
+    Integer IDs stored as floats (e.g., a chunk of a file where pandas parsed an ID column with
+    missing values as float64) are hashed as integers, so an ID gets the same hash in every chunk.
+
+    Args:
+        values (array-like): The IDs (numbers or strings).
+
+    Returns:
+        (np.ndarray): A uint64 array with the hash of every ID.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'f' and np.isfinite(values).all() \
+            and (np.abs(values) < 2 ** 63).all() and (values == np.trunc(values)).all():
+        values = values.astype(np.int64)
+    return pd.util.hash_array(values)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    Computes the number of significant bits of every uint64 value (0 for 0).
+    """
+    # each 32-bit half is exactly representable as a float, whose exponent is its bit length
+    high = np.frexp((values >> np.uint64(32)).astype(np.float64))[1]
+    low = np.frexp((values & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+    return np.where(high > 0, high + 32, low)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog counter of the distinct values of a stream.
+
+    Every hash updates one of `2 ** precision` registers, so memory is constant and the
+    relative standard error of the estimate is about `1.04 / sqrt(2 ** precision)`
+    (0.8% with the default precision). Small cardinalities are estimated with linear counting.
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Initializes the HyperLogLog object.
+
+        Args:
+            precision (int): The number of hash bits selecting the register, between 4 and 18.
+
+        Raises:
+            ValueError: If `precision` is out of range.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18.')
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> None:
+        """
+        Adds a chunk of hashed values.
+
+        Args:
+            hashes (np.ndarray): The uint64 hashes of the values, e.g. from `hash_ids`.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        shift = np.uint64(64 - self.precision)
+        registers = (hashes >> shift).astype(np.intp)
+        remaining = hashes << np.uint64(self.precision)
+        # position of the first set bit among the remaining 64 - precision bits
+        ranks = np.minimum(64 - _bit_length(remaining), 64 - self.precision) + 1
+        np.maximum.at(self.registers, registers, ranks.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Merges the counter of another stream with the same precision.
+
+        Args:
+            other (HyperLogLog): The other counter.
+        """
+        if other.precision != self.precision:
+            raise ValueError('Only counters with the same precision can be merged.')
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def relative_error(self) -> float:
+        """
+        The relative standard error of the estimate.
+        """
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def estimate(self) -> float:
+        """
+        Estimates the number of distinct values added so far.
+
+        Returns:
+            (float): The estimated cardinality.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+
+class DegreeSample:
+    """
+    Exact degrees of a uniform sample of the distinct IDs of a stream.
+
+    An ID is sampled when the top `level` bits of its hash are zero, so every occurrence of
+    a sampled ID is counted and its degree is exact. When more than `capacity` IDs are
+    sampled, the level is raised and half of them, on average, are dropped. As long as the
+    stream has at most `capacity` distinct IDs, the sample holds all of them.
+    """
+
+    def __init__(self, capacity: int = 1_000_000):
+        """
+        Initializes the DegreeSample object.
+
+        Args:
+            capacity (int): The maximum number of sampled IDs.
+        """
+        if capacity < REPLICATES:
+            raise ValueError(f'capacity must be at least {REPLICATES}.')
+        self.capacity = capacity
+        self.level = 0
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.degrees = np.empty(0, dtype=np.int64)
+
+    @property
+    def rate(self) -> float:
+        """
+        The probability that an ID is sampled.
+        """
+        return 2.0 ** -self.level
+
+    @property
+    def complete(self) -> bool:
+        """
+        Whether the sample holds all the distinct IDs seen so far.
+        """
+        return self.level == 0
+
+    def _sampled(self, hashes: np.ndarray) -> np.ndarray:
+        if self.level == 0:
+            return np.ones(len(hashes), dtype=bool)
+        return (hashes >> np.uint64(64 - self.level)) == 0
+
+    def update(self, hashes: np.ndarray) -> None:
+        """
+        Adds a chunk of hashed IDs.
+
+        Args:
+            hashes (np.ndarray): The uint64 hashes of the IDs, e.g. from `hash_ids`.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        keys, counts = np.unique(hashes[self._sampled(hashes)], return_counts=True)
+        keys, positions = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        self.degrees = np.bincount(positions, weights=np.concatenate([self.degrees, counts]),
+                                   minlength=len(keys)).astype(np.int64)
+        self.keys = keys
+
+        while len(self.keys) > self.capacity:
+            self.level += 1
+            kept = self._sampled(self.keys)
+            self.keys, self.degrees = self.keys[kept], self.degrees[kept]
+
+    def replicates(self) -> List[np.ndarray]:
+        """
+        Splits the sampled degrees into hash-disjoint groups, each a smaller uniform sample.
+
+        Returns:
+            (List[np.ndarray]): The degrees of each group.
+        """
+        groups = (self.keys % np.uint64(REPLICATES)).astype(np.intp)
+        return [self.degrees[groups == group] for group in range(REPLICATES)]
+
+
+class StreamingCharacteristics:
+    """
+    Approximate dataset characteristics computed in one pass over chunks of interactions.
+
+    The data is never held in memory: every chunk updates, for users and items,
+        - a `HyperLogLog` counter, estimating `n_users` and `n_items`;
+        - a `DegreeSample`, holding the exact degrees of a uniform sample of the IDs, used for
+          the Gini coefficients.
+    All the registered characteristics are then evaluated on these estimates. When the number
+    of distinct users (items) does not exceed `sample_size`, the sample holds all of them and
+    their count and Gini coefficient are exact.
+
+    `error_bounds` reports the standard error of each characteristic: the HyperLogLog error
+    is propagated through the characteristic, and the sampling error of the Gini coefficients
+    is estimated from hash-disjoint replicates of the sample.
+
+    Example:
+        >>> stats = StreamingCharacteristics()
+        >>> for chunk in pd.read_csv('ratings.csv', chunksize=1_000_000):
+        ...     stats.update(chunk['user'], chunk['item'])
+        >>> stats.compute(['n_users', 'density', 'gini_item'])
+        >>> stats.error_bounds(['n_users', 'density', 'gini_item'])
+    """
+
+    def __init__(self, precision: int = 14, sample_size: int = 1_000_000):
+        """
+        Initializes the StreamingCharacteristics object.
+
+        Args:
+            precision (int): The precision of the HyperLogLog counters.
+            sample_size (int): The maximum number of users (and items) whose degree is kept.
+        """
+        self.n_interactions = 0
+        self._counters = {'users': HyperLogLog(precision), 'items': HyperLogLog(precision)}
+        self._samples = {'users': DegreeSample(sample_size), 'items': DegreeSample(sample_size)}
+        # intermediates replaced while estimating the error bounds
+        self._overrides: Dict[str, object] = {}
+
+    def update(self, users, items) -> None:
+        """
+        Adds a chunk of interactions.
+
+        Args:
+            users (array-like): The user ID of every interaction.
+            items (array-like): The item ID of every interaction, aligned with `users`.
+
+        Raises:
+            ValueError: If `users` and `items` have different lengths.
+        """
+        if len(users) != len(items):
+            raise ValueError('users and items must have the same length.')
+        for on, values in (('users', users), ('items', items)):
+            hashes = hash_ids(values)
+            self._counters[on].update(hashes)
+            self._samples[on].update(hashes)
+        self.n_interactions += len(users)
+
+    def update_chunk(self, chunk: pd.DataFrame, user_col: Union[str, int], item_col: Union[str, int]) -> None:
+        """
+        Adds a chunk of interactions stored in a DataFrame. Rows with a missing ID are skipped.
+
+        Args:
+            chunk (pd.DataFrame): The interactions.
+            user_col (Union[str, int]): The user ID column.
+            item_col (Union[str, int]): The item ID column.
+        """
+        chunk = chunk[[user_col, item_col]].dropna()
+        self.update(chunk[user_col].to_numpy(), chunk[item_col].to_numpy())
+
+    def _count(self, on: str) -> float:
+        sample = self._samples[on]
+        return len(sample.keys) if sample.complete else self._counters[on].estimate()
+
+    def _count_error(self, on: str) -> float:
+        if self._samples[on].complete:
+            return 0.0
+        return self._counters[on].relative_error * self._counters[on].estimate()
+
+    def intermediate(self, name: str):
+        """
+        Returns the estimate of an intermediate statistic, as `DataRec.intermediate` does.
+
+        Degree vectors are those of the sampled users/items.
+
+        Args:
+            name (str): 'n_users', 'n_items', 'n_interactions', 'user_degrees' or 'item_degrees'.
+
+        Returns:
+            (Any): The estimated statistic.
+        """
+        if name in self._overrides:
+            return self._overrides[name]
+        if name == 'n_users':
+            return self._count('users')
+        if name == 'n_items':
+            return self._count('items')
+        if name == 'n_interactions':
+            return self.n_interactions
+        if name == 'user_degrees':
+            return self._samples['users'].degrees
+        if name == 'item_degrees':
+            return self._samples['items'].degrees
+        raise ValueError(f"Intermediate '{name}' is not available in streaming mode.")
+
+    def _names(self, names: Optional[Iterable[str]]) -> List[str]:
+        names = list(CHARACTERISTICS) if names is None else list(names)
+        unknown = [name for name in names if name not in CHARACTERISTICS]
+        if unknown:
+            raise ValueError(f"Unknown characteristics {unknown}. Choose from {list(CHARACTERISTICS)}.")
+        return names
+
+    def compute(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Computes the approximate characteristics.
+
+        Args:
+            names (Iterable[str], optional): The characteristics to compute. If None, all the
+                registered ones.
+
+        Returns:
+            (Dict[str, float]): A dictionary mapping each characteristic name to its estimate.
+
+        Raises:
+            ValueError: If a characteristic is not registered.
+        """
+        return {name: CHARACTERISTICS[name](self) for name in self._names(names)}
+
+    def _with(self, overrides: dict, name: str) -> float:
+        self._overrides = overrides
+        try:
+            return CHARACTERISTICS[name](self)
+        finally:
+            self._overrides = {}
+
+    def error_bounds(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Estimates the standard error of the approximate characteristics.
+
+        Args:
+            names (Iterable[str], optional): The characteristics. If None, all the registered ones.
+
+        Returns:
+            (Dict[str, float]): A dictionary mapping each characteristic name to the standard
+                error of its estimate, in the unit of the characteristic (0 when it is exact).
+        """
+        bounds = {}
+        for name in self._names(names):
+            requirements = CHARACTERISTIC_REQUIREMENTS.get(name, ())
+            variance = 0.0
+            for intermediate, on in (('n_users', 'users'), ('n_items', 'items')):
+                error = self._count_error(on)
+                if intermediate in requirements and error > 0:
+                    value = self.intermediate(intermediate)
+                    upper = self._with({intermediate: value + error}, name)
+                    lower = self._with({intermediate: max(value - error, 1.0)}, name)
+                    variance += ((upper - lower) / 2) ** 2
+            for intermediate, on in (('user_degrees', 'users'), ('item_degrees', 'items')):
+                if intermediate in requirements and not self._samples[on].complete:
+                    estimates = [self._with({intermediate: degrees}, name)
+                                 for degrees in self._samples[on].replicates() if len(degrees)]
+                    if len(estimates) > 1:
+                        variance += np.var(estimates, ddof=1) / len(estimates)
+            bounds[name] = float(np.sqrt(variance))
+        return bounds
+
+
+def approximate_characteristics(chunks: Iterable[pd.DataFrame], user_col: Union[str, int],
+                                item_col: Union[str, int], precision: int = 14,
+                                sample_size: int = 1_000_000) -> StreamingCharacteristics:
+    """
+    Profiles a stream of interaction chunks in one pass, without loading it.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): The chunks of interactions, e.g. the iterator returned
+            by `pd.read_csv(..., chunksize=...)`.
+        user_col (Union[str, int]): The user ID column.
+        item_col (Union[str, int]): The item ID column.
+        precision (int): The precision of the HyperLogLog counters.
+        sample_size (int): The maximum number of users (and items) whose degree is kept.
+
+    Returns:
+        (StreamingCharacteristics): The streaming estimates, see `compute` and `error_bounds`.
+    """
+    stats = StreamingCharacteristics(precision=precision, sample_size=sample_size)
+    for chunk in chunks:
+        stats.update_chunk(chunk, user_col, item_col)
+    return stats
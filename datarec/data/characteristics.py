@@ -2,55 +2,107 @@ from __future__ import annotations
 
 import math
 import numpy as np
-from typing import TYPE_CHECKING, Callable, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Tuple
 
 if TYPE_CHECKING:  # avoids circular import at runtime
     from datarec.data import DataRec
 
 CHARACTERISTICS: Dict[str, Callable[..., float]] = {}
+# characteristic name -> names of the intermediates it reads through `DataRec.intermediate`
+CHARACTERISTIC_REQUIREMENTS: Dict[str, Tuple[str, ...]] = {}
+INTERMEDIATES: Dict[str, Callable[..., Any]] = {}
 
 
-def characteristic(func=None, *, name=None):
+def characteristic(func=None, *, name=None, requires: Iterable[str] = ()):
     if func is None:
-        return lambda f: characteristic(f, name=name)
+        return lambda f: characteristic(f, name=name, requires=requires)
 
     key = name or func.__name__
     if key in CHARACTERISTICS:
         raise ValueError(f"{key} already registered")
     CHARACTERISTICS[key] = func
+    CHARACTERISTIC_REQUIREMENTS[key] = tuple(requires)
     return func
 
-@characteristic
+
+def intermediate(func=None, *, name=None):
+    """
+    Registers a statistic shared by several characteristics (e.g., the degree vectors).
+
+    Intermediates are computed once per data version by `DataRec.intermediate` and reused
+    by every characteristic that declares them in `requires`.
+    """
+    if func is None:
+        return lambda f: intermediate(f, name=name)
+
+    key = name or func.__name__
+    if key in INTERMEDIATES:
+        raise ValueError(f"{key} already registered")
+    INTERMEDIATES[key] = func
+    return func
+
+
+@intermediate(name='n_users')
+def _n_users(dr: DataRec):
+    return dr.n_users
+
+
+@intermediate(name='n_items')
+def _n_items(dr: DataRec):
+    return dr.n_items
+
+
+@intermediate(name='n_interactions')
+def _n_interactions(dr: DataRec):
+    return len(dr.data)
+
+
+@intermediate(name='user_degrees')
+def _user_degrees(dr: DataRec):
+    """
+    Number of interactions of each user, counted with `np.bincount` on the user codes.
+    """
+    return dr.user_index.degrees
+
+
+@intermediate(name='item_degrees')
+def _item_degrees(dr: DataRec):
+    """
+    Number of interactions of each item, counted with `np.bincount` on the item codes.
+    """
+    return dr.item_index.degrees
+
+@characteristic(requires=('n_users',))
 def n_users(dr: DataRec, scale_factor: int = 1000):
     """
     Calculates the scaled square root of the user-item interaction space.
     """
-    return int(dr.data[dr.user_col].nunique())
+    return dr.intermediate('n_users')
 
-@characteristic
+@characteristic(requires=('n_items',))
 def n_items(dr: DataRec, scale_factor: int = 1000):
     """
     Calculates the scaled square root of the user-item interaction space.
     """
-    return int(dr.data[dr.item_col].nunique())
+    return dr.intermediate('n_items')
 
-@characteristic
+@characteristic(requires=('n_interactions',))
 def n_interactions(dr: DataRec, scale_factor: int = 1000):
     """
     Calculates the scaled square root of the user-item interaction space.
     """
-    return int(len(dr.data))
+    return dr.intermediate('n_interactions')
 
 
-@characteristic
+@characteristic(requires=('n_users', 'n_items'))
 def space_size(dr: DataRec, scale_factor: int = 1000):
     """
     Calculates the scaled square root of the user-item interaction space.
     """
-    return math.sqrt(dr.n_users * dr.n_items) / scale_factor
+    return math.sqrt(dr.intermediate('n_users') * dr.intermediate('n_items')) / scale_factor
 
 
-@characteristic
+@characteristic(requires=('n_users', 'n_items'))
 def space_size_log(dr: DataRec):
     """
     Calculates the log10 of the space_size metric.
@@ -58,15 +110,15 @@ def space_size_log(dr: DataRec):
     return math.log10(space_size(dr))
 
 
-@characteristic
+@characteristic(requires=('n_users', 'n_items'))
 def shape(dr: DataRec):
     """
     Calculates the shape of the interaction matrix (n_users / n_items).
     """
-    return dr.n_users / dr.n_items
+    return dr.intermediate('n_users') / dr.intermediate('n_items')
 
 
-@characteristic
+@characteristic(requires=('n_users', 'n_items'))
 def shape_log(dr: DataRec):
     """
     Calculates the log10 of the shape metric.
@@ -74,15 +126,15 @@ def shape_log(dr: DataRec):
     return math.log10(shape(dr))
 
 
-@characteristic
+@characteristic(requires=('n_interactions', 'n_users', 'n_items'))
 def density(dr: DataRec):
     """
     Calculates the density of the user-item interaction matrix.
     """
-    return dr.transactions / (dr.n_users * dr.n_items)
+    return dr.intermediate('n_interactions') / (dr.intermediate('n_users') * dr.intermediate('n_items'))
 
 
-@characteristic
+@characteristic(requires=('n_interactions', 'n_users', 'n_items'))
 def density_log(dr: DataRec):
     """
     Calculates the log10 of the density metric.
@@ -106,33 +158,33 @@ def gini(x):
     return (np.sum((2 * cum_index - n - 1) * x)) / (n * np.sum(x))
 
 
-@characteristic
+@characteristic(requires=('item_degrees',))
 def gini_item(dr: DataRec):
     """
     Calculates the Gini coefficient for item popularity.
     """
-    return gini(np.array(list(dr.sorted_items.values())))
+    return gini(dr.intermediate('item_degrees'))
 
 
-@characteristic
+@characteristic(requires=('user_degrees',))
 def gini_user(dr: DataRec):
     """
     Calculates the Gini coefficient for user activity.
     """
-    return gini(np.array(list(dr.sorted_users.values())))
+    return gini(dr.intermediate('user_degrees'))
 
 
-@characteristic
+@characteristic(requires=('n_interactions', 'n_users'))
 def ratings_per_user(dr: DataRec):
     """
     Calculates the average number of ratings per user.
     """
-    return dr.transactions / dr.n_users
+    return dr.intermediate('n_interactions') / dr.intermediate('n_users')
 
-@characteristic
+@characteristic(requires=('n_interactions', 'n_items'))
 def ratings_per_item(dr: DataRec):
     """
     Calculates the average number of ratings per item.
     """
-    return dr.transactions / dr.n_items
+    return dr.intermediate('n_interactions') / dr.intermediate('n_items')
 
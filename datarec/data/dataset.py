@@ -1,13 +1,15 @@
+import hashlib
 import math
 import warnings
 import pandas as pd
 import numpy as np
-from typing import Union, Optional, Any
-from collections import Counter
-from .utils import set_column_name, quartiles, popularity, Encoder
+from typing import Union, Optional, Any, Tuple
+from .utils import (set_column_name, quartile_bins, popularity_buckets, Encoder, compact_ids, compact_ratings,
+                    compact_timestamps, copy_on_write_enabled)
+from .index import InteractionIndex
 from datarec.io.rawdata import RawData
 from datarec.pipeline import Pipeline
-from datarec.data.characteristics import CHARACTERISTICS
+from datarec.data.characteristics import CHARACTERISTICS, CHARACTERISTIC_REQUIREMENTS, INTERMEDIATES
 from datarec.io import paths
 
 DATAREC_USER_COL = 'user_id'
@@ -45,7 +47,8 @@ class DataRec:
             rawdata (RawData): The input dataset wrapped in a RawData object.
                 If None, the DataRec is initialized empty.
             copy (bool): Whether to copy the input DataFrame to avoid 
-                modifying the original RawData.
+                modifying the original RawData. With pandas copy-on-write enabled, the copy
+                shares the column buffers until one of the two frames is modified.
             dataset_name (str): A name to identify the dataset.
             version_name (str): A version identifier 
                 for the dataset.
@@ -55,13 +58,20 @@ class DataRec:
         """
         self.path = None
         self._data = None
+        # frames appended after `_data`, concatenated to it on the first access to `data`
+        self._chunks = []
+        # statistics derived from the data (unique ids, degrees, indexes), computed on demand.
+        # Every entry is tagged with the data version it was computed on, and the version is
+        # bumped whenever the data, its id columns or their encoding change
+        self._data_version = 0
+        self._stats = {}
         self.dataset_name = dataset_name
         self.version_name = version_name
 
         rawdata_step = None
         if rawdata is not None:
             if copy:
-                self._data: pd.DataFrame = rawdata.data.copy()
+                self._data: pd.DataFrame = rawdata.data.copy(deep=not copy_on_write_enabled())
             else:
                 self._data: pd.DataFrame = rawdata.data
             
@@ -114,19 +124,13 @@ class DataRec:
         
         # Apply external encoders (e.g., from streaming readers) if provided
         if rawdata is not None:
+            # the IDs were encoded while reading
             if getattr(rawdata, "user_encoder", None):
                 self.user_id_encoder.apply_encoding(rawdata.user_encoder)
+                self.user_id_encoder.applied = True
             if getattr(rawdata, "item_encoder", None):
                 self.item_id_encoder.apply_encoding(rawdata.item_encoder)
-
-        # ------------------------------
-        # --------- PROPERTIES ---------
-        self._sorted_users = None
-        self._sorted_items = None
-
-        self._n_users = None
-        self._n_items = None
-        self._transactions = None
+                self.item_id_encoder.applied = True
 
         self.characteristics = CharacteristicAccessor(self)
 
@@ -161,7 +165,15 @@ class DataRec:
         Returns:
             (int): number of samples in the dataset.
         """
-        return len(self.data)
+        return self._n_rows()
+
+    def _n_rows(self) -> int:
+        """
+        Returns the number of rows, including the appended ones not yet concatenated.
+        """
+        if self._data is None:
+            return 0
+        return len(self._data) + sum(len(chunk) for chunk in getattr(self, '_chunks', ()))
 
     def set_columns(self, rawdata):
         """
@@ -184,8 +196,12 @@ class DataRec:
             self.timestamp_col = rawdata.timestamp
             self.__assigned_columns.append(self.timestamp_col)
 
-        # re-order columns
-        self._data = self.data[self.__assigned_columns]
+        # re-order columns. A frame already in order is not copied, only wrapped in a new frame
+        # sharing its columns, so that assigning a column does not change the caller's frame
+        if list(self.data.columns) == self.__assigned_columns:
+            self._data = self.data.copy(deep=False)
+        else:
+            self._data = self.data[self.__assigned_columns]
 
     def reset(self):
         
@@ -198,12 +214,55 @@ class DataRec:
         """
 
         self.__assigned_columns = []
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """
+        Bumps the data version, invalidating the cached statistics.
+
+        It is called whenever the data, its columns or its encoding are changed through the DataRec API.
+        """
+        self._data_version = getattr(self, '_data_version', 0) + 1
+        self._stats = {}
+
+    @property
+    def data_version(self) -> int:
+        """
+        Returns a counter increased at every change of the data made through the DataRec API.
+        """
+        return self._data_version
+
+    def _cached(self, name: str, compute) -> Any:
+        """
+        Returns a statistic from the cache, computing it if missing or stale.
+
+        An entry is stale if it was computed on a previous data version or on a different
+        number of rows, which also guards against changes made to `data` directly.
+
+        Args:
+            name (str): The name of the statistic.
+            compute (Callable): A function with no arguments computing the statistic.
+
+        Returns:
+            (Any): The value of the statistic.
+        """
+        if not hasattr(self, '_stats'):  # DataRec pickled by a previous version
+            self._data_version, self._stats = 0, {}
+        key = (self._data_version, self._n_rows())
+        entry = self._stats.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, compute())
+            self._stats[name] = entry
+        return entry[1]
 
     @property
     def data(self) -> pd.DataFrame:
         """
         The underlying pandas DataFrame holding the interaction data.
         """
+        if getattr(self, '_chunks', None):
+            self._data = pd.concat([self._data, *self._chunks], axis=0)
+            self._chunks = []
         return self._data
 
     @data.setter
@@ -216,6 +275,7 @@ class DataRec:
             raise ValueError(f'Data must be RawData or None if empty. Found {type(value)}')
         value = value if value is not None else pd.DataFrame()
 
+        self._chunks = []
         self._data = value.data
         self.reset()
         self.set_columns(value)
@@ -246,6 +306,7 @@ class DataRec:
                                                             value=value,
                                                             default_name=DATAREC_USER_COL,
                                                             rename=rename)
+        self._invalidate()
 
     @property
     def item_col(self):
@@ -273,6 +334,7 @@ class DataRec:
                                                             value=value,
                                                             default_name=DATAREC_ITEM_COL,
                                                             rename=rename)
+        self._invalidate()
 
     @property
     def rating_col(self):
@@ -300,6 +362,7 @@ class DataRec:
                                                               value=value,
                                                               default_name=DATAREC_RATING_COL,
                                                               rename=rename)
+        self._invalidate()
 
     @property
     def timestamp_col(self):
@@ -327,34 +390,51 @@ class DataRec:
                                                                  value=value,
                                                                  default_name=DATAREC_TIMESTAMP_COL,
                                                                  rename=rename)
+        self._invalidate()
 
     @property
     def users(self):
         """
         Returns a list of unique user IDs in the dataset.
         """
-        return self.data[self.user_col].unique().tolist()
+        return list(self._cached('users', lambda: self.data[self.user_col].unique().tolist()))
 
     @property
     def items(self):
         """
         Returns a list of unique item IDs in the dataset.
         """
-        return self.data[self.item_col].unique().tolist()
+        return list(self._cached('items', lambda: self.data[self.item_col].unique().tolist()))
 
     @property
     def n_users(self):
         """
         Returns the number of unique users.
         """
-        return int(self.data[self.user_col].nunique())
+        return len(self.user_index)
 
     @property
     def n_items(self):
         """
         Returns the number of unique items.
         """
-        return int(self.data[self.item_col].nunique())
+        return len(self.item_index)
+
+    @property
+    def user_degrees(self) -> pd.Series:
+        """
+        Returns the number of interactions of each user, in order of first appearance.
+        """
+        index = self.user_index
+        return pd.Series(index.degrees, index=index.keys)
+
+    @property
+    def item_degrees(self) -> pd.Series:
+        """
+        Returns the number of interactions of each item, in order of first appearance.
+        """
+        index = self.item_index
+        return pd.Series(index.degrees, index=index.keys)
 
     @property
     def columns(self):
@@ -369,36 +449,65 @@ class DataRec:
         Sets the column names of the internal DataFrame.
         """
         self.data.columns = columns
+        self._invalidate()
+
+    @staticmethod
+    def _sorted_by_degree(degrees: pd.Series) -> dict:
+        """
+        Sorts ids by interaction count, breaking ties by id.
+        """
+        degrees = degrees.sort_index()
+        degrees = degrees.iloc[np.argsort(degrees.to_numpy(), kind='stable')]
+        return dict(zip(degrees.index, degrees.to_numpy().tolist()))
 
     @property
     def sorted_items(self):
         """
         Returns a dictionary of items sorted by their interaction count.
         """
-        if self._sorted_items is None:
-            count_items = self.data.groupby(self.item_col).count().sort_values(by=[self.user_col])
-            self._sorted_items = dict(zip(count_items.index, count_items[self.user_col]))
-        return self._sorted_items
+        return dict(self._cached('sorted_items', lambda: self._sorted_by_degree(self.item_degrees)))
 
     @property
     def sorted_users(self):
         """
         Returns a dictionary of users sorted by their interaction count.
         """
-        if self._sorted_users is None:
-            count_users = self.data.groupby(self.user_col).count().sort_values(by=[self.item_col])
-            self._sorted_users = dict(zip(count_users.index, count_users[self.item_col]))
-        return self._sorted_users
+        return dict(self._cached('sorted_users', lambda: self._sorted_by_degree(self.user_degrees)))
 
     @property
     def transactions(self):
         """
         Returns the total number of interactions (rows) in the dataset.
         """
-        if self._transactions is None:
-            self._transactions = len(self.data)
-        return self._transactions
+        return self._n_rows()
     
+    def _get_index(self, on: str) -> InteractionIndex:
+        """
+        Returns the cached index of the rows by user or by item, building it if needed.
+
+        Args:
+            on (str): 'users' or 'items'.
+
+        Returns:
+            (InteractionIndex): The index of the rows.
+        """
+        column = self.user_col if on == 'users' else self.item_col
+        return self._cached(f'{on}_index', lambda: InteractionIndex(self.data[column]))
+
+    @property
+    def user_index(self) -> InteractionIndex:
+        """
+        Returns the CSR index of the rows grouped by user.
+        """
+        return self._get_index('users')
+
+    @property
+    def item_index(self) -> InteractionIndex:
+        """
+        Returns the CSR index of the rows grouped by item.
+        """
+        return self._get_index('items')
+
     @property
     def origin(self):
         """
@@ -435,11 +544,14 @@ class DataRec:
         if users:
             if not self.user_id_encoder.is_encoded():
                 raise ValueError("User encoder is empty. Build or apply an encoding before calling encode().")
-            self.data[self.user_col] = self.user_id_encoder.encode(self.data[self.user_col].tolist())
+            self.data[self.user_col] = self.user_id_encoder.encode_array(self.data[self.user_col])
+            self.user_id_encoder.applied = True
         if items:
             if not self.item_id_encoder.is_encoded():
                 raise ValueError("Item encoder is empty. Build or apply an encoding before calling encode().")
-            self.data[self.item_col] = self.item_id_encoder.encode(self.data[self.item_col].tolist())
+            self.data[self.item_col] = self.item_id_encoder.encode_array(self.data[self.item_col])
+            self.item_id_encoder.applied = True
+        self._invalidate()
 
     def decode(self, users=True, items=True) -> None:
         """
@@ -449,9 +561,12 @@ class DataRec:
             items (bool): If True, encodes item IDs.
         """
         if users:
-            self.data[self.user_col] = self.user_id_encoder.decode(self.data[self.user_col].tolist())
+            self.data[self.user_col] = self.user_id_encoder.decode_array(self.data[self.user_col])
+            self.user_id_encoder.applied = False
         if items:
-            self.data[self.item_col] = self.item_id_encoder.decode(self.data[self.item_col].tolist())
+            self.data[self.item_col] = self.item_id_encoder.decode_array(self.data[self.item_col])
+            self.item_id_encoder.applied = False
+        self._invalidate()
 
     def reset_encoding(self, on='all') -> None:
         """
@@ -493,6 +608,66 @@ class DataRec:
             raise ValueError("Parameter 'on' must be either 'users' or 'items'.")
         
 
+    def memory_usage(self, deep: bool = True) -> pd.Series:
+        """
+        Returns the memory usage of the data, column by column.
+
+        Args:
+            deep (bool): If True, also counts the memory of the Python objects (e.g., strings)
+                stored in object columns, as in `pd.DataFrame.memory_usage`.
+
+        Returns:
+            (pd.Series): The memory usage in bytes of the index (under 'Index') and of each column.
+        """
+        return self.data.memory_usage(index=True, deep=deep)
+
+    def fingerprint(self) -> str:
+        """
+        Returns a digest of the rows of the data, in order, cached per data version.
+
+        Every row (index and values) is hashed with `pd.util.hash_pandas_object` and the row
+        hashes are digested with SHA-256 together with the column names, so two DataRec objects
+        have the same fingerprint when they hold the same rows in the same order. It identifies
+        the dataset a saved split refers to (see `SplitIndex.save`).
+
+        Returns:
+            (str): The hexadecimal digest.
+        """
+        def compute():
+            hasher = hashlib.sha256(repr(list(self.data.columns)).encode())
+            hasher.update(pd.util.hash_pandas_object(self.data, index=True).to_numpy().tobytes())
+            return hasher.hexdigest()
+
+        return self._cached('fingerprint', compute)
+
+    def compact(self, verbose: bool = False) -> dict:
+        """
+        Shrinks the memory footprint of the data by downcasting its columns in place.
+
+        User and item IDs become int32 (integer IDs) or categoricals (string IDs), ratings
+        become int8 (integer ratings) or float32, and timestamps become int64 epoch seconds.
+        IDs keep their values, so encodings and lookups are unaffected.
+
+        Args:
+            verbose (bool): If True, prints the memory usage before and after.
+
+        Returns:
+            (dict): The memory usage of the data in bytes, under the 'before' and 'after' keys.
+        """
+        before = int(self.memory_usage(deep=True).sum())
+
+        converters = [(self.user_col, compact_ids), (self.item_col, compact_ids),
+                      (self.rating_col, compact_ratings), (self.timestamp_col, compact_timestamps)]
+        for column, converter in converters:
+            if column is not None and column in self.data.columns:
+                self.data[column] = converter(self.data[column])
+        self._invalidate()
+
+        after = int(self.memory_usage(deep=True).sum())
+        if verbose:
+            print(f'Compacted data from {before} to {after} bytes')
+        return {'before': before, 'after': after}
+
     # -- CHARACTERISTICS --
 
     def characteristic(self, name: str, **kwargs: Any) -> Any:
@@ -507,6 +682,62 @@ class DataRec:
             The value of the requested characteristic.
         """
         return getattr(self.characteristics, name)(**kwargs)
+
+    def intermediate(self, name: str) -> Any:
+        """
+        Returns a statistic shared by the characteristics (e.g., 'user_degrees'), computed once per data version.
+
+        Args:
+            name (str): The name of a registered intermediate.
+
+        Returns:
+            The value of the intermediate.
+
+        Raises:
+            ValueError: If the intermediate is not registered.
+        """
+        if name not in INTERMEDIATES:
+            raise ValueError(f"Unknown intermediate '{name}'. Choose from {sorted(INTERMEDIATES)}.")
+        return self._cached(f'intermediate:{name}', lambda: INTERMEDIATES[name](self))
+
+    def compute_characteristics(self, names: Optional[list] = None, errors: str = 'raise') -> dict:
+        """
+        Computes several characteristics in a single pass over the data.
+
+        The intermediates declared by the requested characteristics (e.g., the user and item
+        degree vectors) are computed once and shared, so the dataset is scanned once
+        regardless of the number of characteristics.
+
+        Args:
+            names (list, optional): The characteristics to compute. If None, all the registered ones.
+            errors (str): 'raise' to propagate the first error, 'store' to set the value of a failing
+                characteristic to None and its message under the '<name>_error' key.
+
+        Returns:
+            (dict): A dictionary mapping each characteristic name to its value.
+
+        Raises:
+            ValueError: If a characteristic is not registered or `errors` is not valid.
+        """
+        if errors not in ('raise', 'store'):
+            raise ValueError("errors must be either 'raise' or 'store'.")
+        names = list(CHARACTERISTICS) if names is None else list(names)
+        unknown = [name for name in names if name not in CHARACTERISTICS]
+        if unknown:
+            raise ValueError(f"Unknown characteristics {unknown}. Choose from {self.list_characteristics()}.")
+
+        results = {}
+        for name in names:
+            try:
+                for requirement in CHARACTERISTIC_REQUIREMENTS.get(name, ()):
+                    self.intermediate(requirement)
+                results[name] = CHARACTERISTICS[name](self)
+            except Exception as exc:
+                if errors == 'raise':
+                    raise
+                results[name] = None
+                results[f"{name}_error"] = str(exc)
+        return results
     
     def space_size(self, **kwargs):
         return self.characteristic("space_size", **kwargs)
@@ -538,6 +769,59 @@ class DataRec:
     def ratings_per_item(self, **kwargs):
         return self.characteristic("ratings_per_item", **kwargs)
 
+    def frequency_arrays(self, on: str = 'users') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the absolute frequency of each user or item, as arrays.
+
+        Args:
+            on (str): 'users' or 'items'.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray]): The codes of the users/items, i.e. their positions in
+                `user_index.keys`/`item_index.keys`, sorted in descending order of frequency
+                (ties in order of first appearance), and their number of interactions.
+        """
+        if on not in ('users', 'items'):
+            raise ValueError("Parameter 'on' must be either 'users' or 'items'.")
+        degrees = self._get_index(on).degrees
+        codes = np.argsort(-degrees, kind='stable')
+        return codes, degrees[codes]
+
+    def quartile_arrays(self, on: str = 'users') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Assigns quartile indices (0-3) to users or items based on their frequency, as arrays.
+
+        Args:
+            on (str): 'users' or 'items'.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray]): The codes of the users/items, sorted as in
+                `frequency_arrays`, and their quartile index (0 = lowest, 3 = highest frequency).
+        """
+        codes, counts = self.frequency_arrays(on)
+        return codes, quartile_bins(counts)
+
+    def popularity_arrays(self, on: str = 'users') -> dict:
+        """
+        Categorizes users or items into popularity groups based on quartiles, as arrays.
+
+        Args:
+            on (str): 'users' or 'items'.
+
+        Returns:
+            (dict): A dictionary mapping popularity categories ('most popular', 'popular',
+                'common', 'long tail') to the codes of the users/items in them, sorted in
+                descending order of frequency.
+        """
+        codes, bins = self.quartile_arrays(on)
+        return {category: codes[positions] for category, positions in popularity_buckets(bins).items()}
+
+    def _keys_of(self, on: str, codes: np.ndarray) -> list:
+        """
+        Converts user or item codes to the list of their IDs.
+        """
+        return self._get_index(on).keys[codes].tolist()
+
     def users_frequency(self):
         """
         Computes the absolute frequency of each user in the dataset.
@@ -546,8 +830,8 @@ class DataRec:
             (dict): A dictionary mapping user IDs to the number of interactions, 
                 sorted in descending order of frequency.
         """
-        fr = dict(Counter(self.data[self.user_col]))
-        return dict(sorted(fr.items(), key=lambda item: item[1], reverse=True))
+        codes, counts = self.frequency_arrays('users')
+        return dict(zip(self._keys_of('users', codes), counts.tolist()))
 
     def users_relative_frequency(self):
         """
@@ -557,7 +841,8 @@ class DataRec:
             (dict): A dictionary mapping user IDs to their relative frequency 
                 (fraction of total transactions).
         """
-        return {u: (f / self.transactions) for u, f in self.users_frequency().items()}
+        codes, counts = self.frequency_arrays('users')
+        return dict(zip(self._keys_of('users', codes), (counts / self.transactions).tolist()))
 
     def items_frequency(self):
         """
@@ -567,8 +852,8 @@ class DataRec:
             (dict): A dictionary mapping item IDs to the number of interactions, 
                 sorted in descending order of frequency.
         """
-        fr = dict(Counter(self.data[self.item_col]))
-        return dict(sorted(fr.items(), key=lambda item: item[1], reverse=True))
+        codes, counts = self.frequency_arrays('items')
+        return dict(zip(self._keys_of('items', codes), counts.tolist()))
 
     def items_relative_frequency(self):
         """
@@ -578,7 +863,8 @@ class DataRec:
             (dict): A dictionary mapping item IDs to their relative frequency 
                 (fraction of total transactions).
         """
-        return {u: (f / self.transactions) for u, f in self.items_frequency().items()}
+        codes, counts = self.frequency_arrays('items')
+        return dict(zip(self._keys_of('items', codes), (counts / self.transactions).tolist()))
 
     def users_quartiles(self):
         """
@@ -588,7 +874,8 @@ class DataRec:
             (dict): A dictionary mapping each user ID to a quartile index (0-3),
                 where 0 = lowest, 3 = highest frequency.
         """ 
-        return quartiles(self.users_frequency())
+        codes, bins = self.quartile_arrays('users')
+        return dict(zip(self._keys_of('users', codes), bins.tolist()))
 
     def items_quartiles(self):
         """
@@ -598,7 +885,8 @@ class DataRec:
             (dict): A dictionary mapping each item ID to a quartile index (0-3),
                 where 0 = lowest, 3 = highest frequency.
         """
-        return quartiles(self.items_frequency())
+        codes, bins = self.quartile_arrays('items')
+        return dict(zip(self._keys_of('items', codes), bins.tolist()))
 
     def users_popularity(self):
         """
@@ -608,7 +896,7 @@ class DataRec:
             (dict): A dictionary mapping popularity categories ('long tail', 
                 'common', 'popular', 'most popular') to lists of user IDs.
         """
-        return popularity(self.users_quartiles())
+        return {category: self._keys_of('users', codes) for category, codes in self.popularity_arrays('users').items()}
 
     def items_popularity(self):
         """
@@ -618,7 +906,7 @@ class DataRec:
             (dict): A dictionary mapping popularity categories ('long tail', 
                 'common', 'popular', 'most popular') to lists of item IDs.
         """
-        return popularity(self.items_quartiles())
+        return {category: self._keys_of('items', codes) for category, codes in self.popularity_arrays('items').items()}
     
     def get_user_interactions(self, user_id: Any) -> pd.DataFrame:
         """
@@ -627,11 +915,27 @@ class DataRec:
         Args:
             user_id (Any): The ID of the user whose interactions are to be retrieved.
         """
-        if user_id in self.users:
-            df = self.data[self.data[self.user_col] == user_id]
-            return df
-        else:   
+        try:
+            rows = self.user_index.rows(user_id)
+        except KeyError:
             raise ValueError(f"User ID {user_id} not found in dataset.")
+        return self.data.iloc[rows]
+
+    def get_users_interactions(self, user_ids: list) -> pd.DataFrame:
+        """
+        Retrieves all interactions for several users at once.
+
+        Args:
+            user_ids (list): The IDs of the users whose interactions are to be retrieved.
+
+        Returns:
+            (pd.DataFrame): The interactions, grouped by user in the order of `user_ids`.
+        """
+        try:
+            rows = self.user_index.rows_many(user_ids)
+        except KeyError as e:
+            raise ValueError(f"User IDs not found in dataset: {e}")
+        return self.data.iloc[rows]
 
     def get_item_interactions(self, item_id: Any) -> pd.DataFrame:
         """
@@ -640,11 +944,27 @@ class DataRec:
         Args:
             item_id (Any): The ID of the item whose interactions are to be retrieved.
         """
-        if item_id in self.items:
-            df = self.data[self.data[self.item_col] == item_id]
-            return df
-        else:   
+        try:
+            rows = self.item_index.rows(item_id)
+        except KeyError:
             raise ValueError(f"Item ID {item_id} not found in dataset.")
+        return self.data.iloc[rows]
+
+    def get_items_interactions(self, item_ids: list) -> pd.DataFrame:
+        """
+        Retrieves all interactions for several items at once.
+
+        Args:
+            item_ids (list): The IDs of the items whose interactions are to be retrieved.
+
+        Returns:
+            (pd.DataFrame): The interactions, grouped by item in the order of `item_ids`.
+        """
+        try:
+            rows = self.item_index.rows_many(item_ids)
+        except KeyError as e:
+            raise ValueError(f"Item IDs not found in dataset: {e}")
+        return self.data.iloc[rows]
 
     def list_characteristics(self) -> list[str]:
         """Return the names of all characteristics that can be computed on this dataset."""
@@ -657,27 +977,35 @@ class DataRec:
             for name, func in CHARACTERISTICS.items()
         }
 
-    def copy(self):
+    def copy(self, deep: Optional[bool] = None):
         """
-        Create a deep copy of the current DataRec object.
+        Create a copy of the current DataRec object.
         
         This method duplicates the DataRec instance, including its data,
-        metadata (user, item, rating, timestamp columns), pipeline, and internal
-        state such as privacy settings and implicit flags.
+        metadata (user, item, rating, timestamp columns), pipeline and encoders.
+        Encoders are shared with the original until one of them is rebuilt or reset.
+
+        Args:
+            deep (Optional[bool]): Whether to copy the column buffers. If None, they are shared
+                when pandas copy-on-write is enabled, since the copy and the original then diverge
+                only when one of them is modified, and copied otherwise. If False, they are always
+                shared, and in-place changes to the values of one frame affect the other one.
         
         Returns:
-            (DataRec): A new DataRec object that is a deep copy of the current instance.
+            (DataRec): A new DataRec object that is a copy of the current instance.
         """
-        pipeline = self.pipeline.copy()
+        if deep is None:
+            deep = not copy_on_write_enabled()
 
-        new_dr = DataRec(rawdata=self.to_rawdata(),
-                         pipeline=pipeline,
-                         copy=True)
+        new_dr = DataRec(rawdata=self.to_rawdata(), copy=False,
+                         dataset_name=self.dataset_name, version_name=self.version_name)
+        if deep:
+            new_dr._data = new_dr._data.copy(deep=True)
 
-        new_dr._user_col = self.user_col
-        new_dr._item_col = self.item_col
-        new_dr._rating_col = self.rating_col
-        new_dr._timestamp_col = self.timestamp_col
+        new_dr.pipeline = self.pipeline.copy()
+        new_dr._origin = self._origin
+        new_dr.user_id_encoder = self.user_id_encoder.copy()
+        new_dr.item_id_encoder = self.item_id_encoder.copy()
         return new_dr
 
     def to_rawdata(self):
@@ -696,6 +1024,113 @@ class DataRec:
         raw.rating = self.rating_col
         raw.timestamp = self.timestamp_col
         return raw
+
+    def append(self, rawdata: Union[RawData, pd.DataFrame], encode: Optional[bool] = None) -> None:
+        """
+        Appends new interactions in place, e.g., the daily batch of a log.
+
+        The new rows are stored as a separate chunk and concatenated with the existing ones on
+        the first access to `data`, so a sequence of appends copies the history at most once.
+        The user and item encoders are extended with the new IDs only, keeping the private IDs
+        already assigned. The cached user and item indexes, and the unique IDs, degrees and
+        characteristics derived from them, are updated from the new rows instead of being
+        recomputed over the whole history; the other cached statistics are invalidated.
+
+        The appended rows are not recorded in the pipeline, since they do not come from a
+        reproducible step.
+
+        Args:
+            rawdata (RawData | pd.DataFrame): The new interactions. The columns of a RawData
+                object are matched by role (user, item, rating, timestamp), while a DataFrame
+                must have the columns of this DataRec.
+            encode (Optional[bool]): Whether to encode the IDs of the new rows with the extended
+                encoders. If None, the IDs of the users (items) are encoded when the stored user
+                (item) IDs are encoded, i.e., after `encode` and until `decode`.
+
+        Raises:
+            ValueError: If the new interactions miss a column of this DataRec, if `encode` is
+                True and an encoder is empty, or if a DataFrame is appended to an empty DataRec.
+        """
+        if self._data is None:
+            if not isinstance(rawdata, RawData):
+                raise ValueError('Only a RawData object can be appended to an empty DataRec.')
+            self.data = rawdata
+            return
+
+        roles = [(self.user_col, 'user'), (self.item_col, 'item'),
+                 (self.rating_col, 'rating'), (self.timestamp_col, 'timestamp')]
+        targets = [column for column, _ in roles if column is not None]
+        if isinstance(rawdata, RawData):
+            frame, sources = rawdata.data, [getattr(rawdata, role) for column, role in roles if column is not None]
+        else:
+            frame, sources = rawdata, targets
+        missing = [target for target, source in zip(targets, sources) if source is None or source not in frame.columns]
+        if missing:
+            raise ValueError(f'The new interactions miss the columns {missing}.')
+        chunk = frame[sources].set_axis(targets, axis=1)
+
+        # rows labelled 0..n-1 keep being labelled by position
+        n_rows = self._n_rows()
+        labels = self._data.index
+        if isinstance(labels, pd.RangeIndex) and labels.start == 0 and labels.step == 1:
+            chunk.index = pd.RangeIndex(n_rows, n_rows + len(chunk))
+
+        for column, encoder in ((self.user_col, self.user_id_encoder), (self.item_col, self.item_id_encoder)):
+            if encode and not encoder.is_encoded():
+                raise ValueError(f"The encoder of column '{column}' is empty. Build or apply an encoding first.")
+            if encoder.is_encoded():
+                encoder.extend(chunk[column])
+                if encoder.applied if encode is None else encode:
+                    chunk[column] = encoder.encode_array(chunk[column])
+
+        # extend the cached indexes computed on the current rows with the new rows
+        stats = {}
+        for on, column in (('users', self.user_col), ('items', self.item_col)):
+            entry = self._stats.get(f'{on}_index')
+            if entry is None or entry[0] != (self._data_version, n_rows):
+                continue
+            index = entry[1].extend(chunk[column])
+            stats[f'{on}_index'] = index
+            uniques = self._stats.get(on)
+            if uniques is not None and uniques[0] == entry[0] and not chunk[column].isna().any():
+                stats[on] = uniques[1] + index.keys[len(entry[1]):].tolist()
+
+        self._chunks.append(chunk)
+        self._invalidate()
+        key = (self._data_version, self._n_rows())
+        self._stats = {name: (key, value) for name, value in stats.items()}
+
+    def partition(self, n: int, by: str = 'user'):
+        """
+        Splits the interactions into shards by hashing the user (or item) IDs.
+
+        Every user (item) has all its interactions in a single shard, so user-local (item-local)
+        processors and splitters can run on the shards in parallel with `map_partitions`.
+
+        Args:
+            n (int): The number of shards.
+            by (str): 'user' or 'item'.
+
+        Returns:
+            (PartitionedDataRec): The shards of this DataRec object, which is not modified.
+        """
+        from datarec.data.partition import PartitionedDataRec
+
+        return PartitionedDataRec(self, n, by=by)
+
+    def lazy(self):
+        """
+        Starts a lazy query plan on the current DataRec object.
+
+        Processors, projections, encodings and splits added to the returned object are only
+        recorded, and are executed in an optimized order by `collect`.
+
+        Returns:
+            (LazyDataRec): An empty plan over this DataRec object, which is never modified.
+        """
+        from datarec.data.lazy import LazyDataRec
+
+        return LazyDataRec(self)
     
     ##### PIPELINE FUNCTIONS #####
 
@@ -833,6 +1268,26 @@ class DataRec:
 
         print(f'DataRec correctly saved to {filepath}')
 
+    def to_snapshot(self, dirpath: str = '') -> None:
+        """
+        Save the current DataRec object as a columnar snapshot directory.
+
+        Every column is stored as a `.npy` file (IDs as codes plus a vocabulary), the encoders as
+        arrays and the pipeline as YAML, so the snapshot loads much faster than a pickle.
+
+        Args:
+            dirpath (str): The path of the snapshot directory. If empty, the snapshot is saved in
+                the cache directory of the dataset version.
+        """
+        from datarec.data.snapshot import save_snapshot
+
+        if dirpath == '':
+            dirpath = paths.snapshot_version_directory(self.dataset_name, self.version_name)
+
+        print(f'Saving DataRec to {dirpath}')
+        save_snapshot(self, dirpath)
+        print(f'DataRec correctly saved to {dirpath}')
+
 
 class CharacteristicAccessor:
     """
@@ -884,3 +1339,31 @@ def from_pickle(dataset_name:str = '', version_name:str = '', filepath: str = ''
     print(f'DataRec correctly loaded from {filepath}')
 
     return dr
+
+
+def from_snapshot(dataset_name: str = '', version_name: str = '', dirpath: str = '',
+                  mmap_mode: Optional[str] = 'c') -> DataRec:
+    """
+    Load a DataRec object from a columnar snapshot directory.
+
+    Args:
+        dataset_name (str): The name of the dataset.
+        version_name (str): The version identifier of the dataset.
+        dirpath (str): The path to the snapshot directory.
+        mmap_mode (Optional[str]): The memory-mapping mode of the numeric columns, as in `np.load`.
+            The default 'c' (copy-on-write) reads the files lazily while keeping the data writable.
+    Returns:
+        (DataRec): The loaded DataRec object.
+    """
+    from datarec.data.snapshot import load_snapshot
+
+    if dirpath == '':
+        if dataset_name == '' and version_name == '':
+            raise ValueError("Either dataset_name and version_name or dirpath must be provided.")
+        dirpath = paths.snapshot_version_directory(dataset_name, version_name)
+
+    print(f'Loading DataRec from {dirpath}')
+    dr = load_snapshot(dirpath, mmap_mode=mmap_mode)
+    print(f'DataRec correctly loaded from {dirpath}')
+
+    return dr
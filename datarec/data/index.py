@@ -0,0 +1,175 @@
+from typing import Any, Iterable
+import numpy as np
+import pandas as pd
+
+
+class InteractionIndex:
+    """
+    Compressed sparse row (CSR) index of the rows of a dataset grouped by the values of a column.
+
+    The column is factorized once: `positions` holds the row positions sorted by key (rows of
+    the same key keep their original order) and `indptr[k]:indptr[k + 1]` delimits the rows of
+    the k-th key. Looking up the rows of a key costs a hash probe plus a slice, i.e., O(degree)
+    instead of a scan of the whole dataset. Rows with a missing key are not indexed.
+    """
+
+    def __init__(self, values: Any):
+        """
+        Initializes the InteractionIndex object.
+
+        Args:
+            values (array-like): The column to be indexed (e.g., the user column).
+        """
+        codes, uniques = pd.factorize(values)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+        self.keys = pd.Index(uniques, tupleize_cols=False)
+        self._set_codes(codes, counts)
+        # the codes live in a buffer shared with the indexes extended from this one, which
+        # only write past its end (see `extend`)
+        self._buffer = [codes, len(codes)]
+
+    def _set_codes(self, codes: np.ndarray, counts: np.ndarray) -> None:
+        self.codes = codes
+        self.indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        self.n_rows = len(codes)
+        self._positions = None
+
+    def extend(self, values: Any) -> "InteractionIndex":
+        """
+        Returns the index of the rows of this index followed by new rows.
+
+        Only the new rows are factorized: their keys are looked up among the existing ones,
+        the unseen keys are appended in order of first appearance and their degrees are added
+        to the existing ones. The codes are written in a buffer whose capacity doubles when
+        full, so a sequence of extensions costs time proportional to the new rows only.
+        This index is not modified.
+
+        Args:
+            values (array-like): The column of the new rows.
+
+        Returns:
+            (InteractionIndex): The index of all the rows.
+        """
+        values = pd.Index(values, tupleize_cols=False)
+        codes = self.keys.get_indexer(values)
+        unseen = codes < 0
+        new_codes, new_keys = pd.factorize(values[unseen])
+        codes[unseen] = np.where(new_codes >= 0, new_codes + len(self.keys), -1)
+
+        buffer, filled = self._buffer
+        n_rows = self.n_rows + len(codes)
+        # another index was already extended from this one: it owns the tail of the buffer
+        if filled != self.n_rows or len(buffer) < n_rows:
+            grown = np.empty(max(n_rows, 2 * len(buffer)), dtype=buffer.dtype)
+            grown[:self.n_rows] = self.codes
+            shared = [grown, n_rows]
+        else:
+            shared = self._buffer
+            shared[1] = n_rows
+        buffer = shared[0]
+        buffer[self.n_rows:n_rows] = codes
+
+        index = InteractionIndex.__new__(InteractionIndex)
+        index.keys = self.keys.append(pd.Index(new_keys, tupleize_cols=False)) if len(new_keys) else self.keys
+        counts = np.bincount(codes[codes >= 0], minlength=len(index.keys))
+        counts[:len(self.keys)] += self.degrees
+        index._set_codes(buffer[:n_rows], counts)
+        index._buffer = shared
+        return index
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Returns the row positions sorted by key. They are sorted on first access, so counting
+        keys and degrees never pays for the sort.
+        """
+        if self._positions is None:
+            valid = np.flatnonzero(self.codes >= 0)
+            self._positions = valid[np.argsort(self.codes[valid], kind='stable')]
+        return self._positions
+
+    def __len__(self):
+        """
+        Returns the number of distinct keys.
+        """
+        return len(self.keys)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.keys
+
+    @property
+    def degrees(self) -> np.ndarray:
+        """
+        Returns the number of rows of every key, aligned with `keys`.
+        """
+        return np.diff(self.indptr)
+
+    def get_loc(self, key: Any) -> int:
+        """
+        Returns the code of a key.
+
+        Args:
+            key (Any): The key to be looked up.
+
+        Returns:
+            (int): The position of the key in `keys`.
+
+        Raises:
+            KeyError: If the key is not indexed.
+        """
+        return self.keys.get_loc(key)
+
+    def rows(self, key: Any) -> np.ndarray:
+        """
+        Returns the row positions of a key, in their original order.
+
+        Args:
+            key (Any): The key to be looked up.
+
+        Returns:
+            (np.ndarray): The row positions of the key.
+
+        Raises:
+            KeyError: If the key is not indexed.
+        """
+        code = self.get_loc(key)
+        return self.positions[self.indptr[code]:self.indptr[code + 1]]
+
+    def rows_many(self, keys: Iterable[Any]) -> np.ndarray:
+        """
+        Returns the row positions of several keys, grouped by key in the requested order.
+
+        Args:
+            keys (Iterable): The keys to be looked up.
+
+        Returns:
+            (np.ndarray): The row positions of the keys.
+
+        Raises:
+            KeyError: If some keys are not indexed.
+        """
+        keys = pd.Index(list(keys) if not isinstance(keys, (np.ndarray, pd.Series, pd.Index)) else keys,
+                        tupleize_cols=False)
+        codes = self.keys.get_indexer(keys)
+        if (codes < 0).any():
+            raise KeyError(f'Keys {keys[codes < 0][:5].tolist()} not in index.')
+        return self.rows_of_codes(codes)
+
+    def rows_of_codes(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Returns the row positions of several key codes, grouped by code in the given order.
+
+        Args:
+            codes (np.ndarray): Positions of the keys in `keys`.
+
+        Returns:
+            (np.ndarray): The row positions of the keys.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        starts = self.indptr[codes]
+        lengths = self.indptr[codes + 1] - starts
+        # contiguous gather of the slices: the i-th output row is starts[k] + (i - first output row of k)
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return self.positions[offsets + np.arange(lengths.sum())]
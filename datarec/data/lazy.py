@@ -0,0 +1,437 @@
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from datarec.data.dataset import DataRec
+from datarec.data.utils import Encoder
+from datarec.io.rawdata import RawData
+
+
+def _describe_operation(operation) -> str:
+    """
+    Formats a processor or splitter as `ClassName(param=value, ...)`.
+    """
+    params = getattr(operation, 'params', {}) or {}
+    return f"{operation.__class__.__name__}({', '.join(f'{k}={v!r}' for k, v in params.items())})"
+
+
+class _Node:
+    """
+    A node of the logical plan of a `LazyDataRec`.
+    """
+
+    def uses(self, columns: Dict[str, Optional[str]]) -> Set[str]:
+        """
+        Returns the columns read by the node, given the standard columns of its input.
+        """
+        return {column for column in columns.values() if column is not None}
+
+
+class _Operation(_Node):
+    """
+    A node applying a processor. The columns it reads are declared by `processor.reads`.
+    """
+
+    def __init__(self, processor):
+        self.processor = processor
+
+    def uses(self, columns: Dict[str, Optional[str]]) -> Set[str]:
+        reads = getattr(self.processor, 'reads', None)
+        if reads is None:
+            return super().uses(columns)
+        # the IDs are always needed to build the output
+        return {columns[name] for name in ('user', 'item', *reads) if columns[name] is not None}
+
+
+class _Filter(_Operation):
+    """
+    A row-wise processor: the outcome for a row does not depend on the other rows.
+    """
+
+    def __str__(self):
+        return f'Filter {_describe_operation(self.processor)}'
+
+
+class _Process(_Operation):
+    """
+    A processor that depends on the whole dataset (e.g., a k-core filter).
+    """
+
+    def __str__(self):
+        return f'Process {_describe_operation(self.processor)}'
+
+
+class _Select(_Node):
+    """
+    A projection on a subset of the columns.
+    """
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+
+    def uses(self, columns: Dict[str, Optional[str]]) -> Set[str]:
+        return set(self.columns)
+
+    def __str__(self):
+        return f"Select [{', '.join(map(str, self.columns))}]"
+
+
+class _Encode(_Node):
+    """
+    The encoding of the user and/or item IDs to integer IDs.
+    """
+
+    def __init__(self, users: bool, items: bool, offset: int):
+        self.users = users
+        self.items = items
+        self.offset = offset
+
+    def uses(self, columns: Dict[str, Optional[str]]) -> Set[str]:
+        return {columns[on] for on, flag in (('user', self.users), ('item', self.items)) if flag}
+
+    def __str__(self):
+        targets = [name for name, flag in (('users', self.users), ('items', self.items)) if flag]
+        return f"Encode {' and '.join(targets)} (offset={self.offset})"
+
+
+class _Split(_Node):
+    """
+    A splitter. It is always the last node of a plan.
+    """
+
+    def __init__(self, splitter):
+        self.splitter = splitter
+
+    def __str__(self):
+        return f'Split {_describe_operation(self.splitter)}'
+
+
+class _FusedStage:
+    """
+    A block of filters, projections and encodings executed in a single pass.
+
+    The masks of the filters are combined and evaluated on the input rows, the encoding
+    vocabularies are built on the rows kept at their position in the plan, and the output
+    rows and columns are taken from the input only once. The last filter of a block may
+    rewrite the rows (e.g., `Binarize`).
+    """
+
+    def __init__(self, nodes: List[_Node], columns: List[str]):
+        self.nodes = nodes
+        self.columns = columns
+
+    def run(self, datarec: DataRec) -> DataRec:
+        data = datarec.data
+        mask = None
+        encoders = {}
+        for node in self.nodes:
+            if isinstance(node, _Filter):
+                step_mask = np.asarray(node.processor.row_mask(datarec), dtype=bool)
+                mask = step_mask if mask is None else mask & step_mask
+            elif isinstance(node, _Encode):
+                for on, flag in (('user', node.users), ('item', node.items)):
+                    if flag:
+                        column = data[getattr(datarec, f'{on}_col')]
+                        values = column if mask is None else column[mask]
+                        encoder = Encoder()
+                        encoder.build_encoding(pd.unique(values).tolist(), offset=node.offset)
+                        encoder.applied = True
+                        encoders[on] = encoder
+
+        rows = slice(None) if mask is None else np.flatnonzero(mask)
+        # a previous stage may have dropped a column (e.g., `Binarize(drop_rating_col=True)`)
+        columns = [column for column in self.columns if column in data.columns]
+        result = data.iloc[rows, data.columns.get_indexer(columns)]
+        if mask is None:
+            result = result.copy()
+
+        filters = [node.processor for node in self.nodes if isinstance(node, _Filter)]
+        if filters and filters[-1].rewrites_rows:
+            result = filters[-1].transform_rows(result, datarec)
+
+        for on, encoder in encoders.items():
+            column = getattr(datarec, f'{on}_col')
+            result[column] = encoder.encode_array(result[column])
+
+        pipeline = datarec.pipeline.copy()
+        for processor in filters:
+            pipeline.add_step(name='process', operation=processor.__class__.__name__, params=processor.params)
+
+        def kept(column):
+            return column if column is not None and column in result.columns else None
+
+        new_datarec = DataRec(RawData(result, user=datarec.user_col, item=datarec.item_col,
+                                      rating=kept(datarec.rating_col), timestamp=kept(datarec.timestamp_col)),
+                              dataset_name=datarec.dataset_name, version_name=datarec.version_name)
+        new_datarec.pipeline = pipeline
+        new_datarec.user_id_encoder = encoders.get('user', datarec.user_id_encoder.copy())
+        new_datarec.item_id_encoder = encoders.get('item', datarec.item_id_encoder.copy())
+        return new_datarec
+
+    def describe(self, source_columns: List[str]) -> List[str]:
+        filters = [node for node in self.nodes if isinstance(node, _Filter)]
+        lines = []
+        if filters:
+            lines.append('Filter ' + ' & '.join(_describe_operation(node.processor) for node in filters)
+                         + (' (one mask)' if len(filters) > 1 else ''))
+        lines.extend(str(node) for node in self.nodes if isinstance(node, _Encode))
+        dropped = [column for column in source_columns if column not in self.columns]
+        projection = f"Take [{', '.join(map(str, self.columns))}]"
+        if dropped:
+            projection += f" (drops [{', '.join(map(str, dropped))}])"
+        lines.append(projection)
+        return lines
+
+
+class LazyDataRec:
+    """
+    Deferred view of a `DataRec`: operations are recorded as a logical plan and executed by `collect`.
+
+    Processors, projections (`select`), ID encodings (`encode`) and splitters are not applied
+    when they are added, but only when the result is collected. Before execution the plan is
+    optimized:
+        - row-wise processors (e.g., `FilterByRatingThreshold`, `FilterByTime`) are pushed
+          below projections and encodings, and consecutive ones are merged into a single mask;
+        - filters, projections and encodings between two group-dependent operations (e.g.,
+          `UserKCore` or a splitter) run as one pass, materializing the data only once;
+        - columns that are not used by later operations nor selected in the output are dropped
+          when the data is first read.
+    The result is the same as applying the operations one by one on a `DataRec`. Row-wise
+    processors are assumed not to read the ID columns, which may already be encoded in the
+    eager execution.
+
+    `explain` shows the logical and the optimized plan.
+
+    Example:
+        >>> lazy = (datarec.lazy()
+        ...         .process(FilterByRatingThreshold(rating_threshold=4))
+        ...         .process(UserKCore(core=5))
+        ...         .select(['user_id', 'item_id'])
+        ...         .split(RandomHoldOut(test_ratio=0.2)))
+        >>> print(lazy.explain())
+        >>> splits = lazy.collect()
+    """
+
+    def __init__(self, datarec: DataRec, plan: Tuple[_Node, ...] = ()):
+        """
+        Initializes the LazyDataRec object.
+
+        Args:
+            datarec (DataRec): The DataRec object the plan is applied to. It is never modified.
+            plan (tuple): The nodes of the logical plan.
+        """
+        self.datarec = datarec
+        self.plan = tuple(plan)
+
+    def __repr__(self):
+        return f'LazyDataRec({self.datarec.dataset_name!r}, {len(self.plan)} operations)'
+
+    # -- PLAN BUILDING --
+
+    def _append(self, node: _Node) -> "LazyDataRec":
+        if self.plan and isinstance(self.plan[-1], _Split):
+            raise ValueError('No operation can follow a split.')
+        return LazyDataRec(self.datarec, self.plan + (node,))
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        The columns of the result, according to the projections of the plan.
+        """
+        columns = list(self.datarec.data.columns)
+        for node in self.plan:
+            if isinstance(node, _Select):
+                columns = list(node.columns)
+        return columns
+
+    def process(self, processor) -> "LazyDataRec":
+        """
+        Adds a processor to the plan.
+
+        Args:
+            processor: A processor providing `run` (e.g., `UserKCore`). Row-wise processors
+                (`row_wise = True`) are fused with the neighbouring filters.
+
+        Returns:
+            (LazyDataRec): A new LazyDataRec object with the extended plan.
+        """
+        if not callable(getattr(processor, 'run', None)):
+            raise TypeError(f'{processor!r} is not a processor.')
+        if getattr(processor, 'row_wise', False):
+            return self._append(_Filter(processor))
+        return self._append(_Process(processor))
+
+    def select(self, columns: List[str]) -> "LazyDataRec":
+        """
+        Adds a projection to the plan.
+
+        Args:
+            columns (List[str]): The columns to be kept, in order. The user and item columns
+                must be included.
+
+        Returns:
+            (LazyDataRec): A new LazyDataRec object with the extended plan.
+
+        Raises:
+            ValueError: If a column is not available or the user or item column is missing.
+        """
+        columns = list(columns)
+        missing = [column for column in columns if column not in self.columns]
+        if missing:
+            raise ValueError(f'Columns {missing} not in the dataset.')
+        for column in (self.datarec.user_col, self.datarec.item_col):
+            if column not in columns:
+                raise ValueError(f'Column "{column}" is required and cannot be dropped.')
+        return self._append(_Select(columns))
+
+    def encode(self, users: bool = True, items: bool = True, offset: int = 0) -> "LazyDataRec":
+        """
+        Adds the encoding of the IDs to the plan, as `build_encoding` followed by `encode`.
+
+        The vocabulary is built on the IDs present at this point of the plan.
+
+        Args:
+            users (bool): If True, encodes the user IDs.
+            items (bool): If True, encodes the item IDs.
+            offset (int): The starting integer for the private IDs.
+
+        Returns:
+            (LazyDataRec): A new LazyDataRec object with the extended plan.
+        """
+        return self._append(_Encode(users, items, offset))
+
+    def split(self, splitter) -> "LazyDataRec":
+        """
+        Adds a splitter to the plan. A split must be the last operation.
+
+        Args:
+            splitter: A splitter providing `run` (e.g., `RandomHoldOut`).
+
+        Returns:
+            (LazyDataRec): A new LazyDataRec object with the extended plan.
+        """
+        if not callable(getattr(splitter, 'run', None)):
+            raise TypeError(f'{splitter!r} is not a splitter.')
+        return self._append(_Split(splitter))
+
+    # -- OPTIMIZATION --
+
+    def _standard_columns(self) -> Dict[str, Optional[str]]:
+        datarec = self.datarec
+        return {'user': datarec.user_col, 'item': datarec.item_col,
+                'rating': datarec.rating_col, 'timestamp': datarec.timestamp_col}
+
+    def _live_columns(self) -> List[Optional[Set[str]]]:
+        """
+        Computes, for every position of the plan, the columns needed by the rest of the plan.
+
+        Returns:
+            (list): One entry per node plus one for the end of the plan, holding the columns
+                needed after that position, or None if all the columns are needed.
+        """
+        standard = self._standard_columns()
+        live: Optional[Set[str]] = None
+        result = [live]
+        for node in reversed(self.plan):
+            if isinstance(node, _Select):
+                live = set(node.columns) if live is None else live & set(node.columns)
+            elif live is not None:
+                live = live | node.uses(standard)
+            result.append(live)
+        return list(reversed(result))
+
+    def optimize(self) -> list:
+        """
+        Builds the physical plan.
+
+        Returns:
+            (list): The stages of the plan, in execution order: `_FusedStage` objects for the
+                single-pass blocks, and `_Process`/`_Split` nodes for the other operations.
+        """
+        live = self._live_columns()
+        columns = list(self.datarec.data.columns)
+        stages = []
+        block: List[_Node] = []
+
+        def close(position):
+            nonlocal columns
+            needed = live[position]
+            previous, columns = columns, [column for column in columns if needed is None or column in needed]
+            # a block of projections that keep every column is a no-op after the first stage
+            if stages and columns == previous and all(isinstance(node, _Select) for node in block):
+                return
+            stages.append(_FusedStage(block, columns))
+
+        for position, node in enumerate(self.plan):
+            if isinstance(node, (_Filter, _Encode)):
+                block.append(node)
+                if isinstance(node, _Filter) and node.processor.rewrites_rows:
+                    # the rows are rewritten after the projection, so it keeps the columns they read
+                    close(position)
+                    block = []
+            elif isinstance(node, _Select):
+                block.append(node)
+                columns = list(node.columns)
+            else:
+                # the source is projected before the first group-dependent operation
+                if block or (not stages and live[position] is not None
+                             and not set(columns) <= live[position]):
+                    close(position)
+                    block = []
+                stages.append(node)
+
+        if block or not stages:
+            close(len(self.plan))
+        return stages
+
+    def explain(self, optimized: bool = True) -> str:
+        """
+        Describes the plan.
+
+        Args:
+            optimized (bool): If True, shows the optimized plan, stage by stage, otherwise the
+                logical plan as recorded.
+
+        Returns:
+            (str): The description of the plan, one operation per line.
+        """
+        datarec = self.datarec
+        source = (f"Scan '{datarec.dataset_name}' ({len(datarec)} rows, "
+                  f"[{', '.join(map(str, datarec.data.columns))}])")
+        if not optimized:
+            return '\n'.join(['Logical plan:', f'  {source}'] + [f'  {node}' for node in self.plan])
+
+        lines = ['Optimized plan:', f'  {source}']
+        columns = list(datarec.data.columns)
+        materializations = 0
+        for number, stage in enumerate(self.optimize(), start=1):
+            if isinstance(stage, _FusedStage):
+                lines.append(f'  Stage {number}: single pass')
+                lines.extend(f'    {line}' for line in stage.describe(columns))
+                columns = stage.columns
+            else:
+                lines.append(f'  Stage {number}: {stage}')
+            materializations += 1
+        lines.append(f'  ({materializations} materializations)')
+        return '\n'.join(lines)
+
+    # -- EXECUTION --
+
+    def collect(self) -> Union[DataRec, Dict[str, DataRec]]:
+        """
+        Executes the optimized plan.
+
+        Returns:
+            (Union[DataRec, Dict[str, DataRec]]): The resulting DataRec object, or the
+                dictionary of splits if the plan ends with a split.
+        """
+        result = self.datarec
+        for stage in self.optimize():
+            if isinstance(stage, _FusedStage):
+                result = stage.run(result)
+            elif isinstance(stage, _Process):
+                result = stage.processor.run(result)
+            else:
+                result = stage.splitter.run(result)
+        return result
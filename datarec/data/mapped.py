@@ -0,0 +1,582 @@
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split as split
+
+from datarec.data.dataset import DataRec, DATAREC_USER_COL, DATAREC_ITEM_COL, DATAREC_RATING_COL, DATAREC_TIMESTAMP_COL
+from datarec.data.snapshot import (SnapshotWriter, PIPELINE_FILE, read_meta, load_vocabulary, decode_column,
+                                   load_snapshot)
+from datarec.io.rawdata import RawData
+from datarec.pipeline import Pipeline
+from datarec.pipeline.pipeline_step import PipelineStep
+
+
+class MappedDataRec:
+    """
+    Out-of-core counterpart of `DataRec`, backed by the memory-mapped columns of a snapshot.
+
+    The data stays on disk in the snapshot format of `DataRec.to_snapshot` (one `.npy` file per
+    column, user and item IDs stored as integer codes plus a vocabulary) and is only read through
+    memory maps, `chunksize` rows at a time. Degrees, k-core filters, row-wise processors and
+    splits run as chunked NumPy passes over the codes, and their results are written to new
+    snapshot directories, so memory grows with the number of users and items (plus one byte per
+    row for masks) rather than with the data. A regular `DataRec` is materialized on demand with
+    `to_datarec`.
+
+    Example:
+        >>> mapped = MappedDataRec.read_tabular('ratings.csv', 'ratings.snapshot', sep=',', header=0,
+        ...                                     user_col='user', item_col='item', rating_col='rating')
+        >>> mapped = mapped.process(UserItemIterativeKCore(user_core=5, item_core=5), 'kcore.snapshot')
+        >>> splits = mapped.random_hold_out(test_ratio=0.2, dirpath='splits')
+        >>> train = splits['train'].to_datarec()
+    """
+
+    def __init__(self, dirpath: str, chunksize: int = 1_000_000):
+        """
+        Initializes the MappedDataRec object.
+
+        Args:
+            dirpath (str): The path of the snapshot directory.
+            chunksize (int): The number of rows read at a time.
+
+        Raises:
+            FileNotFoundError: If the directory does not contain a snapshot.
+        """
+        self.dirpath = dirpath
+        self.chunksize = chunksize
+        self.meta = read_meta(dirpath)
+        self._columns = {column['name']: column for column in self.meta['columns']}
+        self._arrays = {}
+        self._vocabularies = {}
+        self._degrees = {}
+
+    def __len__(self):
+        return self.meta['n_rows']
+
+    def __repr__(self):
+        return f'MappedDataRec({self.dirpath!r}, rows={len(self)}, columns={self.columns})'
+
+    @property
+    def dataset_name(self) -> str:
+        """
+        The name of the dataset.
+        """
+        return self.meta['dataset_name']
+
+    @property
+    def version_name(self) -> str:
+        """
+        The version of the dataset.
+        """
+        return self.meta['version_name']
+
+    @property
+    def user_col(self) -> str:
+        """
+        The name of the user ID column.
+        """
+        return self.meta['user_col']
+
+    @property
+    def item_col(self) -> str:
+        """
+        The name of the item ID column.
+        """
+        return self.meta['item_col']
+
+    @property
+    def rating_col(self) -> Optional[str]:
+        """
+        The name of the rating column.
+        """
+        return self.meta['rating_col']
+
+    @property
+    def timestamp_col(self) -> Optional[str]:
+        """
+        The name of the timestamp column.
+        """
+        return self.meta['timestamp_col']
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        The names of the columns.
+        """
+        return list(self._columns)
+
+    @property
+    def pipeline(self) -> Pipeline:
+        """
+        The pipeline that produced the data, read from the snapshot.
+        """
+        return Pipeline.from_yaml(os.path.join(self.dirpath, PIPELINE_FILE))
+
+    def add_step(self, step: PipelineStep) -> None:
+        """
+        Appends a step to the pipeline stored in the snapshot.
+
+        Args:
+            step (PipelineStep): The step to be appended.
+        """
+        pipeline = self.pipeline
+        pipeline.steps.append(step)
+        pipeline.to_yaml(os.path.join(self.dirpath, PIPELINE_FILE))
+
+    # -- COLUMN ACCESS --
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns the stored values of a column as a read-only memory-mapped array.
+
+        Args:
+            name (str): The name of the column.
+
+        Returns:
+            (np.ndarray): The stored values, i.e. the integer codes for ID and other coded columns.
+        """
+        if name not in self._columns:
+            raise ValueError(f'Column "{name}" not in the dataset.')
+        if name not in self._arrays:
+            path = os.path.join(self.dirpath, self._columns[name]['file'] + '.npy')
+            self._arrays[name] = np.load(path, mmap_mode='r').view(np.ndarray)
+        return self._arrays[name]
+
+    def vocabulary(self, name: str) -> Optional[np.ndarray]:
+        """
+        Returns the vocabulary of a coded column, ordered by code.
+
+        Args:
+            name (str): The name of the column.
+
+        Returns:
+            (Optional[np.ndarray]): The vocabulary, or None if the column is not coded.
+        """
+        if name not in self._vocabularies:
+            self._vocabularies[name] = load_vocabulary(self.dirpath, self._columns[name])
+        return self._vocabularies[name]
+
+    def _slices(self, chunksize: Optional[int] = None) -> Iterator[slice]:
+        chunksize = chunksize or self.chunksize
+        for start in range(0, len(self), chunksize):
+            yield slice(start, min(start + chunksize, len(self)))
+
+    def _decode(self, name: str, values: np.ndarray):
+        return decode_column(values, self._columns[name], self.vocabulary(name))
+
+    def iter_chunks(self, chunksize: Optional[int] = None, columns: Optional[List[str]] = None,
+                    decode: bool = True) -> Iterator[pd.DataFrame]:
+        """
+        Iterates over the data in chunks of rows.
+
+        Args:
+            chunksize (Optional[int]): The number of rows per chunk. Defaults to `self.chunksize`.
+            columns (Optional[List[str]]): The columns to be read. Defaults to all the columns.
+            decode (bool): If True, coded columns are decoded to their values, otherwise the
+                integer codes are returned.
+
+        Yields:
+            (pd.DataFrame): The rows of the chunk, indexed by row position.
+        """
+        columns = columns or self.columns
+        for chunk in self._slices(chunksize):
+            data = {name: self._decode(name, self.column(name)[chunk]) if decode else np.asarray(self.column(name)[chunk])
+                    for name in columns}
+            yield pd.DataFrame(data, index=pd.RangeIndex(chunk.start, chunk.stop))
+
+    def _chunk_datarec(self, chunk: pd.DataFrame) -> DataRec:
+        """
+        Wraps a decoded chunk in a DataRec, so that processors can be evaluated on it.
+        """
+        return DataRec(RawData(chunk, user=self.user_col, item=self.item_col, rating=self.rating_col,
+                               timestamp=self.timestamp_col),
+                       copy=False, dataset_name=self.dataset_name, version_name=self.version_name)
+
+    # -- STATISTICS --
+
+    def _codes_size(self, name: str) -> Tuple[np.ndarray, int]:
+        vocabulary = self.vocabulary(name)
+        if vocabulary is None:
+            raise ValueError(f'Column "{name}" is not coded.')
+        return self.column(name), len(vocabulary)
+
+    def degrees(self, on: str = 'users', mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Counts the interactions of every user or item with a chunked `np.bincount` over the codes.
+
+        Args:
+            on (str): 'users' or 'items'.
+            mask (Optional[np.ndarray]): A boolean row mask restricting the counted rows.
+
+        Returns:
+            (np.ndarray): The degree of every code of the vocabulary.
+        """
+        if on not in ('users', 'items'):
+            raise ValueError("Parameter 'on' must be either 'users' or 'items'.")
+        name = self.user_col if on == 'users' else self.item_col
+        if mask is None and name in self._degrees:
+            return self._degrees[name]
+
+        codes, size = self._codes_size(name)
+        degree = np.zeros(size, dtype=np.int64)
+        for chunk in self._slices():
+            chunk_codes = np.asarray(codes[chunk])
+            if mask is not None:
+                chunk_codes = chunk_codes[mask[chunk]]
+            degree += np.bincount(chunk_codes[chunk_codes >= 0], minlength=size)
+
+        if mask is None:
+            self._degrees[name] = degree
+        return degree
+
+    @property
+    def n_users(self) -> int:
+        """
+        The number of users with at least one interaction.
+        """
+        return int(np.count_nonzero(self.degrees('users')))
+
+    @property
+    def n_items(self) -> int:
+        """
+        The number of items with at least one interaction.
+        """
+        return int(np.count_nonzero(self.degrees('items')))
+
+    @property
+    def transactions(self) -> int:
+        """
+        The number of interactions.
+        """
+        return len(self)
+
+    # -- MASKS --
+
+    def kcore_mask(self, cores: List[Tuple[str, int]], rounds: Optional[int] = None) -> np.ndarray:
+        """
+        Computes the rows surviving a k-core filter with chunked passes over the codes.
+
+        Each sweep applies the cores in order, as `KCore` applied to each column in turn:
+        the degrees of the surviving rows are counted, then the rows of the nodes below their
+        core are dropped. With `rounds=None` the sweeps run until nothing is removed. Rows whose
+        key is missing are dropped, as `groupby` does.
+
+        Args:
+            cores (List[Tuple[str, int]]): A list of `(column, core)` pairs, in the order they are applied.
+            rounds (Optional[int]): The number of sweeps. If None, sweeps until convergence.
+
+        Returns:
+            (np.ndarray): A boolean mask marking the rows to keep.
+        """
+        alive = np.ones(len(self), dtype=bool)
+        missing = {column: np.asarray(pd.isna(self.vocabulary(column)), dtype=bool) for column, _ in cores}
+
+        done = 0
+        while rounds is None or done < rounds:
+            removed = 0
+            for column, core in cores:
+                on = 'users' if column == self.user_col else 'items'
+                keep = (self.degrees(on, alive) >= core) & ~missing[column]
+                codes = self.column(column)
+                for chunk in self._slices():
+                    before = alive[chunk]
+                    after = before & keep[codes[chunk]]
+                    removed += int(np.count_nonzero(before)) - int(np.count_nonzero(after))
+                    alive[chunk] = after
+            done += 1
+            if removed == 0:
+                break
+        return alive
+
+    def row_mask(self, processor) -> np.ndarray:
+        """
+        Evaluates a row-wise processor (e.g., `FilterByRatingThreshold`) chunk by chunk.
+
+        Args:
+            processor (Processor): A processor with `row_wise = True`.
+
+        Returns:
+            (np.ndarray): A boolean mask marking the rows to keep.
+        """
+        if not getattr(processor, 'row_wise', False):
+            raise ValueError(f'{processor.__class__.__name__} is not a row-wise processor.')
+        mask = np.empty(len(self), dtype=bool)
+        for chunk in self.iter_chunks():
+            mask[chunk.index[0]:chunk.index[-1] + 1] = processor.row_mask(self._chunk_datarec(chunk))
+        return mask
+
+    # -- OUTPUTS --
+
+    def _write(self, labels: np.ndarray, targets: Dict[int, str], step: PipelineStep) -> Dict[int, "MappedDataRec"]:
+        """
+        Writes the rows of every label to its own snapshot in a single pass.
+
+        Args:
+            labels (np.ndarray): A label per row, or a boolean mask (True is label 1).
+            targets (Dict[int, str]): The snapshot directory of every label to be written.
+            step (PipelineStep): The step added to the pipeline of the outputs.
+
+        Returns:
+            (Dict[int, MappedDataRec]): The written snapshots, by label.
+        """
+        pipeline = self.pipeline
+        pipeline.steps.append(step)
+        writers = {label: SnapshotWriter(dirpath, self.user_col, self.item_col, self.rating_col, self.timestamp_col,
+                                         dataset_name=self.dataset_name, version_name=self.version_name,
+                                         pipeline=pipeline, origin=self.meta['origin'], template=self.dirpath)
+                   for label, dirpath in targets.items()}
+        try:
+            for chunk in self._slices():
+                chunk_labels = labels[chunk]
+                arrays = {name: np.asarray(self.column(name)[chunk]) for name in self.columns}
+                for label, writer in writers.items():
+                    selected = chunk_labels == label
+                    writer.write({name: values[selected] for name, values in arrays.items()})
+        except BaseException:
+            for writer in writers.values():
+                writer.discard()
+            raise
+        for writer in writers.values():
+            writer.close()
+        return {label: MappedDataRec(dirpath, chunksize=self.chunksize) for label, dirpath in targets.items()}
+
+    def filter(self, mask: np.ndarray, dirpath: str, step: Optional[PipelineStep] = None) -> "MappedDataRec":
+        """
+        Writes the rows selected by a mask to a new snapshot.
+
+        Args:
+            mask (np.ndarray): A boolean mask marking the rows to keep.
+            dirpath (str): The path of the output snapshot directory.
+            step (Optional[PipelineStep]): The step recorded in the pipeline of the output.
+
+        Returns:
+            (MappedDataRec): The filtered data.
+        """
+        step = step or PipelineStep('process', 'filter', {})
+        return self._write(np.asarray(mask, dtype=bool), {True: dirpath}, step)[True]
+
+    def process(self, processor, dirpath: str) -> "MappedDataRec":
+        """
+        Applies a processor out of core, writing the result to a new snapshot.
+
+        Supported processors are the row-wise filters (e.g., `FilterByRatingThreshold`,
+        `FilterByTime`) and the k-core filters (`UserKCore`, `ItemKCore`,
+        `UserItemIterativeKCore`, `UserItemNRoundsKCore`). Other processors need the data in
+        memory: materialize it with `to_datarec` first.
+
+        Args:
+            processor (Processor): The processor to be applied.
+            dirpath (str): The path of the output snapshot directory.
+
+        Returns:
+            (MappedDataRec): The processed data.
+
+        Raises:
+            NotImplementedError: If the processor cannot run out of core.
+        """
+        from datarec.processing.kcore import UserKCore, ItemKCore, UserItemIterativeKCore, UserItemNRoundsKCore
+
+        if isinstance(processor, UserKCore):
+            mask = self.kcore_mask([(self.user_col, processor.core)], rounds=1)
+        elif isinstance(processor, ItemKCore):
+            mask = self.kcore_mask([(self.item_col, processor.core)], rounds=1)
+        elif isinstance(processor, UserItemIterativeKCore):
+            mask = self.kcore_mask([(self.user_col, processor._user_core), (self.item_col, processor._item_core)])
+        elif isinstance(processor, UserItemNRoundsKCore):
+            mask = self.kcore_mask([(self.user_col, processor._user_core), (self.item_col, processor._item_core)],
+                                   rounds=processor._rounds)
+        elif getattr(processor, 'row_wise', False) and not getattr(processor, 'rewrites_rows', False):
+            mask = self.row_mask(processor)
+        else:
+            raise NotImplementedError(f'{processor.__class__.__name__} cannot run out of core. '
+                                      f'Use to_datarec() to process the data in memory.')
+
+        step = PipelineStep('process', processor.__class__.__name__, getattr(processor, 'params', {}))
+        return self.filter(mask, dirpath, step)
+
+    def _split(self, labels: np.ndarray, dirpath: str, step: PipelineStep) -> Dict[str, "MappedDataRec"]:
+        names = {0: 'train', 1: 'test', 2: 'val'}
+        present = np.zeros(len(names), dtype=bool)
+        for chunk in self._slices():
+            present |= np.bincount(labels[chunk], minlength=len(names)).astype(bool)
+        targets = {label: os.path.join(dirpath, name) for label, name in names.items() if present[label]}
+        return {names[label]: split for label, split in self._write(labels, targets, step).items()}
+
+    def random_hold_out(self, test_ratio: float = 0, val_ratio: float = 0, seed: int = 42,
+                        dirpath: str = '') -> Dict[str, "MappedDataRec"]:
+        """
+        Randomly splits the rows into training, test and validation sets, as `RandomHoldOut`.
+
+        The rows are selected as `RandomHoldOut` selects them (by splitting the row positions with
+        `train_test_split`), so replaying the recorded step gives the same splits. Only the split
+        labels, one byte per row, and the positions are held in memory.
+
+        Args:
+            test_ratio (float): The proportion of the rows in the test set.
+            val_ratio (float): The proportion of the remaining rows in the validation set.
+            seed (int): The random seed.
+            dirpath (str): The directory where the 'train', 'test' and 'val' snapshots are written.
+
+        Returns:
+            (Dict[str, MappedDataRec]): The non-empty splits under the 'train', 'test' and 'val' keys.
+        """
+        for ratio in (test_ratio, val_ratio):
+            if ratio < 0 or ratio > 1:
+                raise ValueError('ratio must be between 0 and 1')
+
+        train = np.arange(len(self))
+        if test_ratio:
+            train, test = split(train, test_size=test_ratio, random_state=seed)
+        else:
+            test = train[:0]
+        if val_ratio:
+            train, val = split(train, test_size=val_ratio, random_state=seed)
+        else:
+            val = train[:0]
+
+        labels = np.zeros(len(self), dtype=np.int8)
+        labels[test] = 1
+        labels[val] = 2
+
+        step = PipelineStep('split', 'RandomHoldOut', {'test_ratio': test_ratio, 'val_ratio': val_ratio, 'seed': seed})
+        return self._split(labels, dirpath, step)
+
+    def temporal_threshold_split(self, val_threshold: float, test_threshold: float,
+                                 dirpath: str = '') -> Dict[str, "MappedDataRec"]:
+        """
+        Splits the rows by timestamp thresholds, as `TemporalThresholdSplit`.
+
+        Args:
+            val_threshold (float): Rows before this timestamp go to the training set.
+            test_threshold (float): Rows from this timestamp on go to the test set, the others
+                to the validation set.
+            dirpath (str): The directory where the 'train', 'test' and 'val' snapshots are written.
+
+        Returns:
+            (Dict[str, MappedDataRec]): The non-empty splits under the 'train', 'test' and 'val' keys.
+
+        Raises:
+            ValueError: If `val_threshold` is not strictly less than `test_threshold`.
+            TypeError: If the data has no timestamp column.
+        """
+        if val_threshold >= test_threshold:
+            raise ValueError('val_threshold must be strictly less than test_threshold')
+        if self.timestamp_col is None:
+            raise TypeError('This DataRec does not contain temporal information')
+
+        labels = np.empty(len(self), dtype=np.int8)
+        timestamps = self.column(self.timestamp_col)
+        for chunk in self._slices():
+            values = np.asarray(self._decode(self.timestamp_col, timestamps[chunk]))
+            labels[chunk] = np.where(values < val_threshold, 0, np.where(values < test_threshold, 2, 1))
+
+        step = PipelineStep('split', 'TemporalThresholdSplit',
+                            {'val_threshold': val_threshold, 'test_threshold': test_threshold})
+        return self._split(labels, dirpath, step)
+
+    # -- CONVERSION --
+
+    def to_datarec(self, mmap_mode: Optional[str] = 'c') -> DataRec:
+        """
+        Materializes the data as a regular DataRec.
+
+        Args:
+            mmap_mode (Optional[str]): The memory-mapping mode of the numeric columns, as in `np.load`.
+
+        Returns:
+            (DataRec): The data in memory.
+        """
+        return load_snapshot(self.dirpath, mmap_mode=mmap_mode)
+
+    @classmethod
+    def from_datarec(cls, datarec: DataRec, dirpath: str, chunksize: int = 1_000_000) -> "MappedDataRec":
+        """
+        Stores a DataRec on disk, with its encoders, and maps it.
+
+        Args:
+            datarec (DataRec): The data to be stored.
+            dirpath (str): The path of the snapshot directory.
+            chunksize (int): The number of rows written and read at a time.
+
+        Returns:
+            (MappedDataRec): The mapped data.
+        """
+        with SnapshotWriter(dirpath, datarec.user_col, datarec.item_col, datarec.rating_col, datarec.timestamp_col,
+                            dataset_name=datarec.dataset_name, version_name=datarec.version_name,
+                            pipeline=datarec.pipeline, origin=datarec.origin,
+                            encoders={'user': datarec.user_id_encoder, 'item': datarec.item_id_encoder}) as writer:
+            for start in range(0, len(datarec.data), chunksize):
+                writer.write(datarec.data.iloc[start:start + chunksize])
+        return cls(dirpath, chunksize=chunksize)
+
+    @classmethod
+    def from_chunks(cls, chunks, dirpath: str, user_col: str = DATAREC_USER_COL, item_col: str = DATAREC_ITEM_COL,
+                    rating_col: Optional[str] = None, timestamp_col: Optional[str] = None,
+                    dataset_name: str = 'datarec', version_name: str = 'no_version_provided',
+                    pipeline: Optional[Pipeline] = None, chunksize: int = 1_000_000) -> "MappedDataRec":
+        """
+        Writes an iterable of DataFrame chunks to disk and maps the result.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The chunks, with the same columns.
+            dirpath (str): The path of the snapshot directory.
+            user_col (str): The name of the user column.
+            item_col (str): The name of the item column.
+            rating_col (Optional[str]): The name of the rating column, if any.
+            timestamp_col (Optional[str]): The name of the timestamp column, if any.
+            dataset_name (str): The name of the dataset.
+            version_name (str): The version of the dataset.
+            pipeline (Optional[Pipeline]): The pipeline that produced the data.
+            chunksize (int): The number of rows read at a time from the result.
+
+        Returns:
+            (MappedDataRec): The mapped data.
+        """
+        with SnapshotWriter(dirpath, user_col, item_col, rating_col, timestamp_col, dataset_name=dataset_name,
+                            version_name=version_name, pipeline=pipeline) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+        return cls(dirpath, chunksize=chunksize)
+
+    @classmethod
+    def read_tabular(cls, filepath: str, dirpath: str, *, user_col, item_col, rating_col=None, timestamp_col=None,
+                     chunksize: int = 1_000_000, dataset_name: str = 'datarec',
+                     version_name: str = 'no_version_provided', **read_kwargs) -> "MappedDataRec":
+        """
+        Streams a tabular file into a snapshot without loading it in memory.
+
+        Columns are renamed to the standard DataRec names and rows with missing values are
+        dropped, as in the streaming mode of `read_transactions_tabular`.
+
+        Args:
+            filepath (str): Path to the tabular data file.
+            dirpath (str): The path of the snapshot directory.
+            user_col: Column name or index for the user field.
+            item_col: Column name or index for the item field.
+            rating_col: Column name or index for the rating field.
+            timestamp_col: Column name or index for the timestamp field.
+            chunksize (int): Rows per chunk.
+            dataset_name (str): The name of the dataset.
+            version_name (str): The version of the dataset.
+            **read_kwargs: Further arguments of `pandas.read_csv` (e.g., `sep`, `header`).
+
+        Returns:
+            (MappedDataRec): The mapped data.
+        """
+        from datarec.io.readers.transactions.tabular import _resolve_columns
+
+        standard = [DATAREC_USER_COL, DATAREC_ITEM_COL,
+                    DATAREC_RATING_COL if rating_col is not None else None,
+                    DATAREC_TIMESTAMP_COL if timestamp_col is not None else None]
+
+        def chunks():
+            for chunk in pd.read_csv(filepath, chunksize=chunksize, **read_kwargs):
+                names = _resolve_columns(chunk, user_col, item_col, rating_col, timestamp_col)
+                chunk = chunk[[name for name in names if name is not None]].dropna()
+                chunk.columns = [name for name in standard if name is not None]
+                yield chunk
+
+        return cls.from_chunks(chunks(), dirpath, rating_col=standard[2], timestamp_col=standard[3],
+                               dataset_name=dataset_name, version_name=version_name, chunksize=chunksize)
@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from datarec.data.approximate import hash_ids
+from datarec.data.dataset import DataRec
+from datarec.io.rawdata import RawData
+from datarec.splitters.splitter import Splitter
+
+
+def _shard(datarec: DataRec, positions: np.ndarray) -> DataRec:
+    """
+    Builds the DataRec of a shard from the positions of its rows.
+    """
+    rawdata = RawData(datarec.data.take(positions), user=datarec.user_col, item=datarec.item_col,
+                      rating=datarec.rating_col, timestamp=datarec.timestamp_col)
+    shard = DataRec(rawdata, dataset_name=datarec.dataset_name, version_name=datarec.version_name)
+    if not len(positions):
+        # DataRec does not read the columns of an empty RawData
+        shard.set_columns(rawdata)
+    shard.pipeline = datarec.pipeline.copy()
+    shard.user_id_encoder = datarec.user_id_encoder.copy()
+    shard.item_id_encoder = datarec.item_id_encoder.copy()
+    return shard
+
+
+def _concat(datarecs: List[DataRec], ignore_index: bool = False) -> DataRec:
+    """
+    Concatenates the DataRec objects returned for the shards, in shard order.
+
+    If `ignore_index` is True, the rows are indexed from 0 instead of keeping their labels.
+    """
+    first = datarecs[0]
+    data = pd.concat([datarec.data for datarec in datarecs], axis=0, ignore_index=ignore_index)
+    result = DataRec(RawData(data, user=first.user_col, item=first.item_col, rating=first.rating_col,
+                             timestamp=first.timestamp_col),
+                     dataset_name=first.dataset_name, version_name=first.version_name)
+    result.pipeline = first.pipeline.copy()
+    result.user_id_encoder = first.user_id_encoder.copy()
+    result.item_id_encoder = first.item_id_encoder.copy()
+    return result
+
+
+def _combine(results: list, ignore_index: bool = False) -> Any:
+    """
+    Combines the results of a function applied to every shard.
+
+    DataRec objects and DataFrames are concatenated, dictionaries (e.g., the output of a
+    splitter) are combined key by key, and any other result is returned as a list. If
+    `ignore_index` is True, the concatenated rows are indexed from 0.
+    """
+    values = [result for result in results if result is not None]
+    if not values:
+        return None
+    if all(isinstance(value, DataRec) for value in values):
+        return _concat(values, ignore_index=ignore_index)
+    if all(isinstance(value, pd.DataFrame) for value in values):
+        return pd.concat(values, axis=0, ignore_index=ignore_index)
+    if all(isinstance(value, dict) for value in values):
+        keys = list(dict.fromkeys(key for value in values for key in value))
+        return {key: _combine([value.get(key) for value in values], ignore_index=ignore_index) for key in keys}
+    return results
+
+
+class PartitionedDataRec:
+    """
+    A DataRec split into shards by hashing the user (or item) IDs.
+
+    All the interactions of a user (item) fall in the same shard, so operations that treat
+    every user (item) independently, such as user-stratified splitters or per-user filters,
+    give the same result on the shards as on the whole dataset. `map_partitions` runs them over
+    the shards in a process pool and concatenates the results in shard order; within a
+    shard, the rows keep their original order. The shard of an ID depends only on the ID and
+    on the number of shards, so the result is deterministic.
+
+    Processors and splitters declare in `local_to` the entities ('user', 'item') they are local
+    to; `map_partitions` refuses to run them over shards of another entity.
+
+    Example:
+        >>> partitioned = datarec.partition(64, by='user')
+        >>> splits = partitioned.map_partitions(LeaveOneOut(test=True, validation=False), workers=64)
+    """
+
+    def __init__(self, datarec: DataRec, n: int, by: str = 'user'):
+        """
+        Initializes the PartitionedDataRec object.
+
+        Args:
+            datarec (DataRec): The DataRec object to be partitioned. It is not modified.
+            n (int): The number of shards.
+            by (str): 'user' or 'item', the entity whose interactions are kept together.
+
+        Raises:
+            ValueError: If `n` is not positive or `by` is not valid.
+        """
+        if not isinstance(n, int) or n < 1:
+            raise ValueError('The number of partitions must be a positive integer.')
+        if by not in ('user', 'item'):
+            raise ValueError("Parameter 'by' must be either 'user' or 'item'.")
+
+        self.n = n
+        self.by = by
+        column = datarec.user_col if by == 'user' else datarec.item_col
+        self.assignments = (hash_ids(datarec.data[column]) % np.uint64(n)).astype(np.intp)
+        order = np.argsort(self.assignments, kind='stable')
+        bounds = np.searchsorted(self.assignments[order], np.arange(n + 1))
+        self.partitions: List[DataRec] = [_shard(datarec, order[bounds[i]:bounds[i + 1]]) for i in range(n)]
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self.partitions)
+
+    def __getitem__(self, index: int) -> DataRec:
+        return self.partitions[index]
+
+    def __repr__(self):
+        sizes = [len(partition) for partition in self.partitions]
+        return f'PartitionedDataRec(n={self.n}, by={self.by!r}, sizes={sizes})'
+
+    def map_partitions(self, func: Callable, workers: Optional[int] = None) -> Any:
+        """
+        Applies a function to every shard and combines the results.
+
+        Args:
+            func (Callable): A function taking a DataRec, or a processor or splitter, whose
+                `run` method is used. It must be picklable (e.g., a module-level function)
+                when more than one worker is used.
+            workers (Optional[int]): The number of worker processes. If None, one per shard
+                (at most the number of CPUs); if 1, the shards are processed in this process.
+
+        Returns:
+            (Any): The concatenated DataRec or DataFrame, the dictionary of concatenated
+                splits, or the list of results if they cannot be concatenated. The splits of a
+                splitter are indexed from 0, as each shard indexes its own splits from 0.
+
+        Raises:
+            ValueError: If `func` is a processor or splitter that is not local to the
+                partitioning entity.
+        """
+        ignore_index = isinstance(func, Splitter)
+        if callable(getattr(func, 'run', None)):
+            if self.by not in getattr(func, 'local_to', ()):
+                raise ValueError(f'{func.__class__.__name__} is not local to each {self.by}, '
+                                 f'so it cannot run on partitions by {self.by}.')
+            func = func.run
+
+        if workers == 1 or self.n == 1:
+            results = [func(partition) for partition in self.partitions]
+        else:
+            if workers is None:
+                workers = min(self.n, os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(func, self.partitions))
+        return _combine(results, ignore_index=ignore_index)
+
+    def collect(self) -> DataRec:
+        """
+        Concatenates the shards back into a single DataRec, in shard order.
+
+        Returns:
+            (DataRec): The concatenated DataRec object.
+        """
+        return _concat(self.partitions)
@@ -1,15 +1,17 @@
 import os
+import shutil
 import yaml
 import importlib
 import urllib.request
 from dataclasses import dataclass
 from typing import Optional, Union, Dict, Any
-from datarec.io.paths import registry_version_filepath, registry_dataset_filepath, pickle_version_filepath
+from datarec.io.paths import registry_version_filepath, registry_dataset_filepath, pickle_version_filepath, snapshot_version_directory
 from datarec.data.source import Source, SOURCE_TYPES
 from datarec.io.readers.transactions import read_transactions_json, read_transactions_tabular, read_transactions_jsonl
 from datarec.io.readers.sequences import read_sequence_tabular_inline, read_sequence_tabular_wide, read_sequences_json, read_sequences_json_array, read_sequence_tabular_implicit
 from datarec.data.dataset import DataRec
-from datarec import from_pickle
+from datarec import from_pickle, from_snapshot
+from datarec.data.snapshot import is_snapshot
 
 @dataclass
 class Resource:
@@ -115,7 +117,17 @@ class Interactions(Resource):
         """
         Returns the path of the cached version of the resource.
         Returns:
-            (str): The path of the cached resource file.
+            (str): The path of the cached resource snapshot directory.
+        """
+        if self.dataset_name is None or self.version is None:
+            raise ValueError("Dataset name and version must be set to get cache path")
+        return snapshot_version_directory(self.dataset_name, self.version)
+
+    def legacy_cache_path(self) -> str:
+        """
+        Returns the path of the pickled cache written by previous versions of DataRec.
+        Returns:
+            (str): The path of the pickled resource file.
         """
         if self.dataset_name is None or self.version is None:
             raise ValueError("Dataset name and version must be set to get cache path")
@@ -125,14 +137,14 @@ class Interactions(Resource):
         """
         Checks if a cached version of the resource exists.
         Returns:
-            (bool): True if the cached file exists, otherwise False.
+            (bool): True if the cached snapshot (or a legacy pickle) exists, otherwise False.
         """
         if self._cache_ready:
             return True
         
         if self.dataset_name is None or self.version is None:
             raise ValueError("Dataset name and version must be set to check for cache")
-        self._cache_ready = os.path.exists(self.cache_path())
+        self._cache_ready = is_snapshot(self.cache_path()) or os.path.exists(self.legacy_cache_path())
         return self._cache_ready
         
     def prepare(self, use_cache=True, *args, **kwargs):
@@ -153,8 +165,15 @@ class Interactions(Resource):
             DataRec: The loaded dataset.
         """
         if use_cache and self._has_cache():
-            print(f"Loading resource '{self.resource_name}' from cache at {self.cache_path()}.")
-            return from_pickle(filepath=self.cache_path())
+            if is_snapshot(self.cache_path()):
+                print(f"Loading resource '{self.resource_name}' from cache at {self.cache_path()}.")
+                return from_snapshot(dirpath=self.cache_path())
+            print(f"Loading resource '{self.resource_name}' from cache at {self.legacy_cache_path()}.")
+            datarec_ = from_pickle(filepath=self.legacy_cache_path())
+            # migrate the legacy pickle to the snapshot format
+            if to_cache:
+                datarec_.to_snapshot(self.cache_path())
+            return datarec_
 
         if self.format == 'transactions_tabular':
             schema = self.schema
@@ -310,9 +329,9 @@ class Interactions(Resource):
         # set the origin of the dataset to registry, since it is being loaded from a resource file defined in the registry
         datarec_.set_origin_registry()
         
-        # cache the dataset in pickle format
+        # cache the dataset as a columnar snapshot
         if to_cache:
-            datarec_.to_pickle()
+            datarec_.to_snapshot(self.cache_path())
 
         return datarec_
     
@@ -323,7 +342,10 @@ class Interactions(Resource):
             (None): None
         """
         if self._has_cache():
-            os.remove(self.cache_path())
+            if os.path.exists(self.cache_path()):
+                shutil.rmtree(self.cache_path())
+            if os.path.exists(self.legacy_cache_path()):
+                os.remove(self.legacy_cache_path())
             self._cache_ready = False
             print(f"Cache for resource '{self.resource_name}' has been removed.")
 
@@ -0,0 +1,516 @@
+"""
+Directory-based columnar snapshots of DataRec objects.
+
+A snapshot stores every column of the data as its own `.npy` file, so it can be loaded with
+memory mapping instead of being unpickled. Columns of Python objects (e.g., string IDs) and
+categoricals are stored as integer codes plus a vocabulary array, strings being saved as
+fixed-width unicode arrays. The encoders are stored as arrays and the pipeline as YAML.
+
+Layout of a snapshot directory:
+
+    meta.yml              dataset name, version, origin, column roles and dtypes
+    pipeline.yml          the pipeline (see `Pipeline.to_yaml`)
+    column_<i>.npy        the values of numeric/datetime columns, or the codes of the others
+    column_<i>_vocab.npy  the vocabulary of coded columns
+    index.npy             the row index, when it is not the default range index
+    <user|item>_encoder_<array>.npy        the arrays of the user/item encoders, when built
+                                           (see `Encoder.to_arrays`)
+"""
+import os
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from datarec.data.dataset import DataRec
+from datarec.data.utils import Encoder
+from datarec.pipeline import Pipeline
+
+SNAPSHOT_VERSION = 1
+META_FILE = 'meta.yml'
+PIPELINE_FILE = 'pipeline.yml'
+
+
+def is_snapshot(dirpath: str) -> bool:
+    """
+    Checks if a directory contains a DataRec snapshot.
+
+    Args:
+        dirpath (str): The path of the directory.
+
+    Returns:
+        (bool): True if the directory contains a snapshot, False otherwise.
+    """
+    return os.path.isfile(os.path.join(dirpath, META_FILE))
+
+
+def _vocabulary_array(values) -> np.ndarray:
+    """
+    Converts a vocabulary to an array that can be saved without pickling when possible.
+    """
+    index = pd.Index(values, tupleize_cols=False)
+    if index.inferred_type == 'string':
+        return index.to_numpy(dtype=str)
+    array = index.to_numpy()
+    if array.dtype == object:
+        # mixed or non-string objects: try a native dtype, otherwise the array is pickled
+        try:
+            converted = np.asarray(array.tolist())
+        except (TypeError, ValueError):
+            return array
+        if converted.dtype != object and converted.ndim == 1 and len(converted) == len(array) \
+                and pd.Index(converted).equals(index):
+            return converted
+    return array
+
+
+def _load_array(path: str, mmap_mode: Optional[str]) -> np.ndarray:
+    try:
+        # a plain ndarray view keeps the mapping without leaking the np.memmap subclass
+        return np.load(path, mmap_mode=mmap_mode).view(np.ndarray)
+    except ValueError:
+        # object arrays are pickled and cannot be memory mapped
+        return np.load(path, allow_pickle=True)
+
+
+def _save_column(dirpath: str, position: int, column: pd.Series) -> dict:
+    """
+    Saves one column of the data and returns its description for the metadata.
+    """
+    name = f'column_{position}'
+    dtype = column.dtype
+    meta = {'name': column.name, 'file': name}
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        meta['kind'] = 'categorical'
+        meta['ordered'] = bool(dtype.ordered)
+        codes, vocabulary = column.cat.codes.to_numpy(), dtype.categories
+    elif isinstance(dtype, pd.DatetimeTZDtype):
+        meta['kind'] = 'datetime_tz'
+        meta['tz'] = str(dtype.tz)
+        np.save(os.path.join(dirpath, name + '.npy'), column.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy())
+        return meta
+    elif isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        meta['kind'] = 'array'
+        np.save(os.path.join(dirpath, name + '.npy'), column.to_numpy())
+        return meta
+    else:
+        # object and extension columns are coded, missing values having code -1
+        meta['kind'] = 'coded'
+        meta['dtype'] = str(dtype)
+        codes, vocabulary = pd.factorize(column, use_na_sentinel=True)
+
+    np.save(os.path.join(dirpath, name + '.npy'), codes)
+    np.save(os.path.join(dirpath, name + '_vocab.npy'), _vocabulary_array(vocabulary))
+    return meta
+
+
+def load_vocabulary(dirpath: str, meta: dict) -> Optional[np.ndarray]:
+    """
+    Loads the vocabulary of a coded or categorical column of a snapshot.
+
+    Args:
+        dirpath (str): The path of the snapshot directory.
+        meta (dict): The description of the column in the snapshot metadata.
+
+    Returns:
+        (Optional[np.ndarray]): The vocabulary ordered by code, or None for plain columns.
+    """
+    if meta['kind'] not in ('coded', 'categorical'):
+        return None
+    vocabulary = np.load(os.path.join(dirpath, meta['file'] + '_vocab.npy'), allow_pickle=True)
+    if vocabulary.dtype.kind == 'U':
+        vocabulary = vocabulary.astype(object)
+    return vocabulary
+
+
+def decode_column(values: np.ndarray, meta: dict, vocabulary: Optional[np.ndarray]):
+    """
+    Turns the stored values of a snapshot column (or a slice of them) into column values.
+
+    Args:
+        values (np.ndarray): The stored values, i.e. the codes of coded and categorical columns.
+        meta (dict): The description of the column in the snapshot metadata.
+        vocabulary (Optional[np.ndarray]): The vocabulary returned by `load_vocabulary`.
+
+    Returns:
+        (array-like): The column values, with the dtype of the saved column.
+    """
+    kind = meta['kind']
+    if kind == 'array':
+        return values
+    if kind == 'datetime_tz':
+        return pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(meta['tz'])
+    if kind == 'categorical':
+        return pd.Categorical.from_codes(np.asarray(values), categories=vocabulary, ordered=meta['ordered'])
+
+    codes = np.asarray(values)
+    vocabulary = vocabulary.astype(object)
+    missing = codes < 0
+    if missing.any():
+        column = np.full(len(codes), np.nan, dtype=object)
+        column[~missing] = vocabulary[codes[~missing]]
+    else:
+        column = vocabulary[codes]
+    if meta['dtype'] != 'object':
+        return pd.array(column, dtype=meta['dtype'])
+    return column
+
+
+def _load_column(dirpath: str, meta: dict, mmap_mode: Optional[str]):
+    """
+    Loads one column of the data described by its metadata.
+    """
+    values = _load_array(os.path.join(dirpath, meta['file'] + '.npy'), mmap_mode)
+    return decode_column(values, meta, load_vocabulary(dirpath, meta))
+
+
+def read_meta(dirpath: str) -> dict:
+    """
+    Reads the metadata of a snapshot.
+
+    Args:
+        dirpath (str): The path of the snapshot directory.
+
+    Returns:
+        (dict): The snapshot metadata.
+
+    Raises:
+        FileNotFoundError: If the directory does not contain a snapshot.
+        ValueError: If the snapshot was written by an unsupported version.
+    """
+    if not is_snapshot(dirpath):
+        raise FileNotFoundError(f'No DataRec snapshot found at {dirpath}')
+    with open(os.path.join(dirpath, META_FILE), 'r') as f:
+        meta = yaml.safe_load(f)
+    if meta.get('snapshot_version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {meta.get('snapshot_version')}")
+    return meta
+
+
+def _publish(tmp_dirpath: str, dirpath: str, meta: dict) -> None:
+    """
+    Writes the metadata of a complete snapshot and moves it to its final path.
+    """
+    with open(os.path.join(tmp_dirpath, META_FILE), 'w') as f:
+        yaml.safe_dump(meta, f, sort_keys=False)
+    if os.path.exists(dirpath):
+        shutil.rmtree(dirpath)
+    os.replace(tmp_dirpath, dirpath)
+
+
+def _temporary_directory(dirpath: str) -> str:
+    """
+    Creates an empty directory next to `dirpath` where a snapshot is written before being published.
+    """
+    tmp_dirpath = dirpath.rstrip(os.sep) + '.tmp'
+    if os.path.exists(tmp_dirpath):
+        shutil.rmtree(tmp_dirpath)
+    os.makedirs(tmp_dirpath)
+    return tmp_dirpath
+
+
+def _save_encoders(dirpath: str, encoders: Dict[str, Encoder]) -> Tuple[List[str], List[str]]:
+    """
+    Saves the non-empty user and item encoders, returning the entities they encode and those
+    whose stored IDs are encoded.
+    """
+    saved, applied = [], []
+    for on, encoder in encoders.items():
+        if encoder.is_encoded():
+            for key, array in encoder.to_arrays().items():
+                np.save(os.path.join(dirpath, f'{on}_encoder_{key}.npy'), array)
+            saved.append(on)
+            if encoder.applied:
+                applied.append(on)
+    return saved, applied
+
+
+def _encoder_files(dirpath: str, on: str) -> Dict[str, str]:
+    """
+    Returns the paths of the saved arrays of the user or item encoder, by array name.
+    """
+    names = ('keys', 'keys_utf8', 'keys_offsets', 'values')
+    paths = {name: os.path.join(dirpath, f'{on}_encoder_{name}.npy') for name in names}
+    return {name: path for name, path in paths.items() if os.path.exists(path)}
+
+
+def save_snapshot(datarec: DataRec, dirpath: str) -> None:
+    """
+    Saves a DataRec object as a columnar snapshot directory.
+
+    The snapshot is written to a temporary directory that replaces `dirpath` only once complete,
+    so an interrupted save never leaves a partial snapshot behind.
+
+    Args:
+        datarec (DataRec): The DataRec object to save.
+        dirpath (str): The path of the snapshot directory. It is replaced if it exists.
+    """
+    tmp_dirpath = _temporary_directory(dirpath)
+
+    data = datarec.data
+    columns = [_save_column(tmp_dirpath, position, data.iloc[:, position]) for position in range(data.shape[1])]
+
+    index = data.index
+    default_index = isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+    if not default_index:
+        np.save(os.path.join(tmp_dirpath, 'index.npy'), index.to_numpy())
+
+    encoders, applied = _save_encoders(tmp_dirpath, {'user': datarec.user_id_encoder,
+                                                     'item': datarec.item_id_encoder})
+
+    datarec.pipeline.to_yaml(os.path.join(tmp_dirpath, PIPELINE_FILE))
+
+    meta = {
+        'snapshot_version': SNAPSHOT_VERSION,
+        'dataset_name': datarec.dataset_name,
+        'version_name': datarec.version_name,
+        'origin': datarec.origin,
+        'n_rows': len(data),
+        'user_col': datarec.user_col,
+        'item_col': datarec.item_col,
+        'rating_col': datarec.rating_col,
+        'timestamp_col': datarec.timestamp_col,
+        'columns': columns,
+        'index': not default_index,
+        'encoders': encoders,
+        'applied_encoders': applied,
+    }
+    _publish(tmp_dirpath, dirpath, meta)
+
+
+def load_snapshot(dirpath: str, mmap_mode: Optional[str] = 'c') -> DataRec:
+    """
+    Loads a DataRec object from a columnar snapshot directory.
+
+    Args:
+        dirpath (str): The path of the snapshot directory.
+        mmap_mode (Optional[str]): The memory-mapping mode of the numeric columns, as in `np.load`.
+            The default 'c' (copy-on-write) reads the files lazily while keeping the data
+            writable; use None to read the columns into memory.
+
+    Returns:
+        (DataRec): The loaded DataRec object.
+
+    Raises:
+        FileNotFoundError: If the directory does not contain a snapshot.
+        ValueError: If the snapshot was written by an unsupported version.
+    """
+    meta = read_meta(dirpath)
+
+    index = None
+    if meta['index']:
+        index = np.load(os.path.join(dirpath, 'index.npy'), allow_pickle=True)
+    columns = {column['name']: _load_column(dirpath, column, mmap_mode) for column in meta['columns']}
+    data = pd.DataFrame(columns, index=index, copy=False)
+    if index is None:
+        data.index = pd.RangeIndex(meta['n_rows'])
+
+    # the frame is assigned as is: going through RawData would select (and copy) its columns
+    datarec = DataRec(dataset_name=meta['dataset_name'], version_name=meta['version_name'])
+    datarec._data = data
+    for role in ('user_col', 'item_col', 'rating_col', 'timestamp_col'):
+        if meta[role] is not None:
+            getattr(datarec, f'set_{role}')(meta[role])
+
+    for on in meta['encoders']:
+        encoder = Encoder.from_arrays(**{name: np.load(path, allow_pickle=True)
+                                         for name, path in _encoder_files(dirpath, on).items()})
+        # snapshots written before the flag was recorded are assumed to hold the private IDs
+        encoder.applied = on in meta.get('applied_encoders', meta['encoders'])
+        setattr(datarec, f'{on}_id_encoder', encoder)
+
+    datarec.pipeline = Pipeline.from_yaml(os.path.join(dirpath, PIPELINE_FILE))
+    datarec._origin = meta['origin']
+    return datarec
+
+
+class _ArrayFile:
+    """
+    Appends arrays to a raw file that becomes a `.npy` file once complete.
+    """
+
+    def __init__(self, path: str, dtype=None):
+        self.path = path
+        self.dtype = np.dtype(dtype) if dtype is not None else None
+        self.length = 0
+        self._file = open(path + '.part', 'wb')
+
+    def append(self, values) -> None:
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        if self.dtype is None:
+            self.dtype = values.dtype
+        values.tofile(self._file)
+        self.length += len(values)
+
+    def close(self) -> None:
+        self._file.close()
+        header = {'descr': np.lib.format.dtype_to_descr(self.dtype or np.dtype(np.float64)),
+                  'fortran_order': False, 'shape': (self.length,)}
+        with open(self.path, 'wb') as out, open(self.path + '.part', 'rb') as part:
+            np.lib.format.write_array_header_1_0(out, header)
+            shutil.copyfileobj(part, out, 16 * 1024 * 1024)
+        os.remove(self.path + '.part')
+
+
+class SnapshotWriter:
+    """
+    Writes a snapshot chunk by chunk, so data larger than memory can be stored.
+
+    Chunks are appended to one file per column. Object columns (e.g., string IDs) and the user
+    and item columns are encoded incrementally with an `IncrementalEncoder`, whose vocabulary is
+    saved when the writer is closed. If a `template` snapshot is given, the chunks must instead
+    hold the stored values of its columns (e.g., the codes of the IDs), which are written as they
+    are, and the vocabularies and encoders of the template are reused. Otherwise, the user and
+    item encoders of a DataRec (see `DataRec.build_encoding`) can be passed as `encoders`.
+
+    The snapshot becomes visible at `dirpath` only when the writer is closed. Used as a context
+    manager, the writer is closed on success and discarded on error.
+
+    Example:
+        >>> with SnapshotWriter(path, user_col='user_id', item_col='item_id') as writer:
+        ...     for chunk in pd.read_csv(filepath, chunksize=1_000_000):
+        ...         writer.write(chunk)
+    """
+
+    def __init__(self, dirpath: str, user_col: str, item_col: str, rating_col: Optional[str] = None,
+                 timestamp_col: Optional[str] = None, dataset_name: str = 'datarec',
+                 version_name: str = 'no_version_provided', pipeline: Optional[Pipeline] = None,
+                 origin: str = 'unknown', template: Optional[str] = None,
+                 encoders: Optional[Dict[str, Encoder]] = None):
+        """
+        Initializes the SnapshotWriter object.
+
+        Args:
+            dirpath (str): The path of the snapshot directory. It is replaced if it exists.
+            user_col (str): The name of the user column.
+            item_col (str): The name of the item column.
+            rating_col (Optional[str]): The name of the rating column, if any.
+            timestamp_col (Optional[str]): The name of the timestamp column, if any.
+            dataset_name (str): The name of the dataset.
+            version_name (str): The version of the dataset.
+            pipeline (Optional[Pipeline]): The pipeline that produced the data.
+            origin (str): The origin of the dataset.
+            template (Optional[str]): The path of a snapshot whose columns are written as stored.
+            encoders (Optional[Dict[str, Encoder]]): The user and item encoders to be saved, under
+                the 'user' and 'item' keys. Ignored if `template` is given.
+        """
+        self.dirpath = dirpath
+        self.template = template
+        self.pipeline = pipeline if pipeline is not None else Pipeline()
+        self.n_rows = 0
+        self._meta = {
+            'snapshot_version': SNAPSHOT_VERSION,
+            'dataset_name': dataset_name,
+            'version_name': version_name,
+            'origin': origin,
+            'n_rows': 0,
+            'user_col': user_col,
+            'item_col': item_col,
+            'rating_col': rating_col,
+            'timestamp_col': timestamp_col,
+            'columns': None,
+            'index': False,
+            'encoders': [],
+            'applied_encoders': [],
+        }
+        self._tmp_dirpath = _temporary_directory(dirpath)
+        self._files = {}
+        self._encoders = {}
+        self._id_encoders = encoders or {}
+
+        if template is not None:
+            template_meta = read_meta(template)
+            self._meta['columns'] = [dict(column) for column in template_meta['columns']]
+            self._meta['encoders'] = list(template_meta['encoders'])
+            self._meta['applied_encoders'] = list(template_meta.get('applied_encoders', template_meta['encoders']))
+            for column in self._meta['columns']:
+                dtype = np.load(os.path.join(template, column['file'] + '.npy'), mmap_mode='r').dtype
+                self._files[column['name']] = _ArrayFile(os.path.join(self._tmp_dirpath, column['file'] + '.npy'), dtype)
+
+    def _init_columns(self, chunk: pd.DataFrame) -> None:
+        """
+        Describes the columns from the first chunk.
+        """
+        from datarec.data.utils import IncrementalEncoder
+
+        id_columns = (self._meta['user_col'], self._meta['item_col'])
+        columns = []
+        for position, name in enumerate(chunk.columns):
+            dtype = chunk[name].dtype
+            column = {'name': name, 'file': f'column_{position}'}
+            if name in id_columns or not (isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM'):
+                column.update(kind='coded', dtype='object' if dtype == object else str(dtype))
+                self._encoders[name] = IncrementalEncoder(offset=0, dtype=np.int32)
+                file_dtype = np.int32
+            else:
+                column['kind'] = 'array'
+                file_dtype = dtype
+            self._files[name] = _ArrayFile(os.path.join(self._tmp_dirpath, column['file'] + '.npy'), file_dtype)
+            columns.append(column)
+        self._meta['columns'] = columns
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """
+        Appends a chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): The rows, with the same columns in every chunk. With a template,
+                a dictionary of arrays is also accepted.
+        """
+        if self._meta['columns'] is None:
+            self._init_columns(chunk)
+        for name, file in self._files.items():
+            values = chunk[name]
+            encoder = self._encoders.get(name)
+            file.append(encoder.encode_chunk(values) if encoder is not None else np.asarray(values))
+        self.n_rows = file.length
+
+    def close(self) -> None:
+        """
+        Completes the snapshot and moves it to `dirpath`.
+        """
+        if self._meta['columns'] is None:
+            raise ValueError('No chunk was written to the snapshot.')
+        for file in self._files.values():
+            file.close()
+
+        for column in self._meta['columns']:
+            vocabulary_file = column['file'] + '_vocab.npy'
+            if column['name'] in self._encoders:
+                keys = self._encoders[column['name']].keys
+                np.save(os.path.join(self._tmp_dirpath, vocabulary_file), _vocabulary_array(keys))
+            elif self.template is not None and column['kind'] in ('coded', 'categorical'):
+                shutil.copyfile(os.path.join(self.template, vocabulary_file),
+                                os.path.join(self._tmp_dirpath, vocabulary_file))
+        if self.template is not None:
+            for on in self._meta['encoders']:
+                for path in _encoder_files(self.template, on).values():
+                    shutil.copyfile(path, os.path.join(self._tmp_dirpath, os.path.basename(path)))
+        else:
+            self._meta['encoders'], self._meta['applied_encoders'] = _save_encoders(self._tmp_dirpath,
+                                                                                    self._id_encoders)
+
+        self.pipeline.to_yaml(os.path.join(self._tmp_dirpath, PIPELINE_FILE))
+        self._meta['n_rows'] = self.n_rows
+        _publish(self._tmp_dirpath, self.dirpath, self._meta)
+
+    def discard(self) -> None:
+        """
+        Drops the partially written snapshot.
+        """
+        for file in self._files.values():
+            if not file._file.closed:
+                file._file.close()
+        shutil.rmtree(self._tmp_dirpath, ignore_errors=True)
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -82,7 +82,7 @@ class PairwiseTorchDataset(BaseTorchDataset):
         super().__init__(datarec, copy_data)
         self.num_negatives = num_negatives
         self.item_pool = item_pool or self.df[self.item_col].unique()
-        self.user_pos_items = self.df.groupby(self.user_col)[self.item_col].apply(set).to_dict()
+        self.user_pos_items = self.df.groupby(self.user_col, observed=True)[self.item_col].apply(set).to_dict()
 
     def sample_negatives(self, user: Any) -> List[Any]:
         """
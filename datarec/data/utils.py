@@ -1,7 +1,8 @@
 import hashlib
 import os
-from typing import Union
-import statistics
+from typing import Dict, Optional, Union
+import numpy as np
+import pandas as pd
 
 
 def set_column_name(columns: list, value: Union[str, int], rename=True, default_name=None) -> (list, str):
@@ -56,6 +57,75 @@ def set_column_name(columns: list, value: Union[str, int], rename=True, default_
     return columns, selected_column
 
 
+POPULARITY_CATEGORIES = {3: 'most popular', 2: 'popular', 1: 'common', 0: 'long tail'}
+
+
+def quartile_cuts(values: np.ndarray) -> np.ndarray:
+    """
+    Computes the three quartile cut points of an array of values.
+
+    The cut points are the same as `statistics.quantiles(values)` (the 'exclusive' method), but
+    only the order statistics they depend on are selected with `np.partition`, without sorting
+    the values.
+
+    Args:
+        values (np.ndarray): The values (e.g., frequency counts).
+
+    Returns:
+        (np.ndarray): The first quartile, the median and the third quartile.
+
+    Raises:
+        ValueError: If there are less than two values.
+    """
+    values = np.asarray(values)
+    size = len(values)
+    if size < 2:
+        raise ValueError('At least two values are required to compute the quartiles.')
+
+    # positions and interpolation weights of `statistics.quantiles(method='exclusive', n=4)`
+    steps = np.arange(1, 4) * (size + 1)
+    upper = np.clip(steps // 4, 1, size - 1)
+    delta = steps - upper * 4
+    selected = np.partition(values, np.unique(np.concatenate([upper - 1, upper])))
+    return (selected[upper - 1] * (4 - delta) + selected[upper] * delta) / 4
+
+
+def quartile_bins(values: np.ndarray) -> np.ndarray:
+    """
+    Assigns quartile indices (0-3) to an array of values.
+
+    Each value is binned against the cut points of `quartile_cuts` with `np.searchsorted`:
+        0: long tail (lowest quartile)
+        1: common
+        2: popular
+        3: most popular (highest quartile)
+    A value equal to a cut point falls in the lower quartile.
+
+    Args:
+        values (np.ndarray): The values (e.g., frequency counts).
+
+    Returns:
+        (np.ndarray): An int8 array with the quartile index of every value.
+    """
+    return np.searchsorted(quartile_cuts(values), values, side='left').astype(np.int8)
+
+
+def popularity_buckets(bins: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Groups the positions of an array of quartile indices by popularity category.
+
+    Args:
+        bins (np.ndarray): The quartile indices (0-3), e.g. from `quartile_bins`.
+
+    Returns:
+        (Dict[str, np.ndarray]): A dictionary mapping each popularity category ('most popular',
+            'popular', 'common', 'long tail') to the positions in `bins` falling in it, in
+            increasing order.
+    """
+    bins = np.asarray(bins)
+    return {category: np.flatnonzero(bins == quartile) for quartile, category in POPULARITY_CATEGORIES.items()}
+
+
 def quartiles(count: dict):
     """ 
     Assigns quartile indices (0-3) to items based on their frequency counts.
@@ -67,27 +137,16 @@ def quartiles(count: dict):
         2: popular
         3: most popular (highest quartile)
 
+    This is a dictionary adapter over `quartile_bins`.
+
     Args:
         count (dict): A dictionary mapping items to numeric counts or frequencies.
 
     Returns:
         (dict): A dictionary mapping each item to its quartile index (0-3).
     """
-    q1, q2, q3 = statistics.quantiles(count.values())
-
-    def assign(value):
-        if value <= q2:
-            if value <= q1:
-                return 0
-            else:
-                return 1
-        else:
-            if value <= q3:
-                return 2
-            else:
-                return 3
-
-    return {k: assign(f) for k, f in count.items()}
+    values = np.fromiter(count.values(), dtype=float, count=len(count))
+    return dict(zip(count.keys(), quartile_bins(values).tolist()))
 
 
 def popularity(quartiles: dict):
@@ -100,28 +159,18 @@ def popularity(quartiles: dict):
         2 -> 'popular'
         3 -> 'most popular'
 
+    This is a dictionary adapter over `popularity_buckets`.
+
     Args:
         quartiles (dict): A dictionary mapping items to quartile indices (0-3).
 
     Returns:
         (dict): A dictionary mapping each popularity category to a list of items.
     """
-    categories_map = \
-        {3: 'most popular',
-         2: 'popular',
-         1: 'common',
-         0: 'long tail'}
-
-    categories = \
-        {'most popular': [],
-         'popular': [],
-         'common': [],
-         'long tail': []}
-
-    for k, q in quartiles.items():
-        categories[categories_map[q]].append(k)
-
-    return categories
+    keys = list(quartiles.keys())
+    bins = np.fromiter(quartiles.values(), dtype=np.int8, count=len(quartiles))
+    return {category: [keys[position] for position in positions]
+            for category, positions in popularity_buckets(bins).items()}
 
 
 def verify_checksum(file_path: str, checksum: str, algorithm: str = "md5") -> None:
@@ -164,13 +213,253 @@ def verify_checksum(file_path: str, checksum: str, algorithm: str = "md5") -> No
 
 
 
+def copy_on_write_enabled() -> bool:
+    """
+    Checks whether pandas copy-on-write is enabled (`pd.set_option('mode.copy_on_write', True)`).
+
+    With copy-on-write, a shallow copy of a DataFrame shares the column buffers with the
+    original until one of them is modified, so copies can be taken without duplicating the data.
+
+    Returns:
+        (bool): True if copy-on-write is enabled.
+    """
+    return pd.options.mode.copy_on_write is True
+
+
+def compact_ids(values: pd.Series) -> pd.Series:
+    """
+    Stores an ID column with the smallest suitable dtype.
+
+    Integer IDs are downcast to int32 when they fit, while string (or mixed) IDs become
+    categoricals, which store every distinct value once plus an integer code per row.
+    The values are unchanged.
+
+    Args:
+        values (pd.Series): The ID column.
+
+    Returns:
+        (pd.Series): The compacted column.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    if pd.api.types.is_integer_dtype(values.dtype):
+        info = np.iinfo(np.int32)
+        if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max):
+            return values.astype(np.int32)
+        return values
+    if pd.api.types.is_float_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+        return values
+    return values.astype('category')
+
+
+def compact_ratings(values: pd.Series) -> pd.Series:
+    """
+    Downcasts a rating column.
+
+    Integer-valued ratings without missing values that fit in [-128, 127] (e.g., 1-5 stars or
+    binary feedback) become int8; any other numeric rating becomes float32.
+
+    Args:
+        values (pd.Series): The rating column.
+
+    Returns:
+        (pd.Series): The downcast column. Non-numeric columns are returned unchanged.
+    """
+    if not pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+        return values
+    array = values.to_numpy()
+    info = np.iinfo(np.int8)
+    if (len(array) and not np.isnan(array.astype(np.float64)).any()
+            and array.min() >= info.min and array.max() <= info.max
+            and np.array_equal(array, np.round(array))):
+        return values.astype(np.int8)
+    return values.astype(np.float32)
+
+
+def compact_timestamps(values: pd.Series) -> pd.Series:
+    """
+    Converts a timestamp column to int64 epoch seconds.
+
+    Datetime columns are converted to seconds since the epoch and integer-valued float
+    columns (e.g., read with missing values elsewhere in the file) to int64.
+
+    Args:
+        values (pd.Series): The timestamp column.
+
+    Returns:
+        (pd.Series): The converted column. Columns with missing values or fractional
+            timestamps are returned unchanged.
+    """
+    if values.isna().any():
+        return values
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        if getattr(values.dt, 'tz', None) is not None:
+            values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+        return (values - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+    if pd.api.types.is_float_dtype(values.dtype):
+        array = values.to_numpy()
+        if np.array_equal(array, np.round(array)):
+            return values.astype(np.int64)
+        return values
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return values.astype(np.int64)
+    return values
+
+
+def pack_strings(values) -> Dict[str, np.ndarray]:
+    """
+    Packs strings into one UTF-8 buffer and the offsets of every string in it.
+
+    Unlike a fixed-width unicode array, whose entries all take the space of the longest string,
+    the packed arrays take the UTF-8 bytes of the strings plus 8 bytes per string.
+
+    Args:
+        values (Iterable[str]): The strings.
+
+    Returns:
+        (Dict[str, np.ndarray]): The `utf8` buffer (uint8) and the `offsets` (int64), string
+            `i` being `utf8[offsets[i]:offsets[i + 1]]`.
+    """
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return {'utf8': np.frombuffer(b''.join(encoded), dtype=np.uint8), 'offsets': offsets}
+
+
+def unpack_strings(utf8: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Unpacks the strings packed by `pack_strings`.
+
+    Args:
+        utf8 (np.ndarray): The UTF-8 buffer.
+        offsets (np.ndarray): The offsets of the strings in the buffer.
+
+    Returns:
+        (np.ndarray): The strings, as an object array.
+    """
+    buffer = np.asarray(utf8, dtype=np.uint8).tobytes()
+    bounds = np.asarray(offsets).tolist()
+    strings = np.empty(len(bounds) - 1, dtype=object)
+    strings[:] = [buffer[start:end].decode('utf-8') for start, end in zip(bounds[:-1], bounds[1:])]
+    return strings
+
+
+def _keys_to_arrays(keys: pd.Index) -> Dict[str, np.ndarray]:
+    """
+    Exports the keys of a vocabulary as `keys_utf8` and `keys_offsets` if they are strings
+    (see `pack_strings`), or as a `keys` array otherwise.
+    """
+    if keys.inferred_type == 'string':
+        packed = pack_strings(keys)
+        return {'keys_utf8': packed['utf8'], 'keys_offsets': packed['offsets']}
+    return {'keys': keys.to_numpy()}
+
+
+def _keys_from_arrays(keys: Optional[np.ndarray], keys_utf8: Optional[np.ndarray],
+                      keys_offsets: Optional[np.ndarray]) -> np.ndarray:
+    """
+    Rebuilds the keys exported by `_keys_to_arrays`, or saved as a fixed-width unicode array.
+    """
+    if keys_utf8 is not None:
+        return unpack_strings(keys_utf8, keys_offsets)
+    keys = np.asarray(keys)
+    if keys.dtype.kind == 'U':
+        keys = keys.astype(object)
+    return keys
+
+
 class Encoder:
     """
     A simple encoder class to encode and decode IDs.
+
+    The vocabulary is stored as a `pd.Index` of public IDs aligned with an array of
+    private integer IDs. Encoding is a bulk hash lookup (`Index.get_indexer`) and decoding
+    is an array take, so whole columns are converted without Python-level loops.
+
+    Attributes:
+        applied (bool): Whether the column of the DataRec owning the encoder currently holds the
+            private IDs. It is set by `DataRec.encode` and cleared by `DataRec.decode`, since
+            building an encoding does not convert the column.
     """
 
     def __init__(self):
-        self.encoding = dict()
+        self._keys = pd.Index([])
+        self._values = np.empty(0, dtype=np.int64)
+        self._offset = None
+        self._reverse = None
+        self._encoding = None
+        self.applied = False
+
+    def _set_mapping(self, keys: pd.Index, values: np.ndarray) -> None:
+        """
+        Replaces the vocabulary and clears the derived lookups.
+
+        Args:
+            keys (pd.Index): The public IDs.
+            values (np.ndarray): The private IDs aligned with `keys`.
+        """
+        self._keys = keys
+        # read-only, so that copies of the encoder can share the vocabulary
+        self._values = np.asarray(values, dtype=np.int64).view()
+        self._values.flags.writeable = False
+        self._reverse = None
+        self._encoding = None
+        # contiguous encodings (offset, offset + 1, ...) are decoded by position
+        self._offset = None
+        if len(values) and np.array_equal(self._values, np.arange(self._values[0], self._values[0] + len(values))):
+            self._offset = int(self._values[0])
+
+    @property
+    def encoding(self) -> dict:
+        """
+        The encoding as a dictionary mapping public IDs to private IDs.
+        """
+        if self._encoding is None:
+            self._encoding = dict(zip(self._keys.tolist(), self._values.tolist()))
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, encoding: dict) -> None:
+        """
+        Replaces the encoding with a dictionary mapping public IDs to private IDs.
+        """
+        self._set_mapping(pd.Index(list(encoding.keys()), tupleize_cols=False),
+                          np.fromiter(encoding.values(), dtype=np.int64, count=len(encoding)))
+
+    @property
+    def keys(self) -> pd.Index:
+        """
+        The public IDs of the vocabulary.
+        """
+        return self._keys
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        The private IDs of the vocabulary, aligned with `keys`.
+        """
+        return self._values
+
+    def __len__(self):
+        return len(self._keys)
+
+    def copy(self) -> "Encoder":
+        """
+        Creates a copy of the encoder sharing the vocabulary.
+
+        The vocabulary is never modified in place: building, applying or resetting an encoding
+        replaces it, so the copy and the original diverge only when one of them changes.
+
+        Returns:
+            (Encoder): The copy of the encoder.
+        """
+        encoder = Encoder()
+        encoder._keys = self._keys
+        encoder._values = self._values
+        encoder._offset = self._offset
+        encoder._reverse = self._reverse
+        encoder.applied = self.applied
+        return encoder
 
     def is_encoded(self) -> bool:
         """
@@ -179,7 +468,7 @@ class Encoder:
         Returns:
             (bool): True if the encoding dictionary is not empty, False otherwise.
         """
-        return bool(self.encoding)
+        return len(self._keys) > 0
 
     def build_encoding(self, lst: list, offset: int=0) -> None:
         """
@@ -191,13 +480,39 @@ class Encoder:
         """
         if self.is_encoded():
             raise ValueError('Encoding dictionary is not empty. Please, reset it before building a new encoding.')
-        self.encoding = dict(zip(lst, range(offset, offset + len(lst))))
+        keys = pd.Index(lst, tupleize_cols=False)
+        if keys.is_unique:
+            self._set_mapping(keys, np.arange(offset, offset + len(keys), dtype=np.int64))
+        else:
+            self.encoding = dict(zip(lst, range(offset, offset + len(lst))))
 
     def reset_encoding(self) -> None:
         """
         Resets the encoding dictionary.
         """
-        self.encoding = dict()
+        self._set_mapping(pd.Index([]), np.empty(0, dtype=np.int64))
+        self.applied = False
+
+    def extend(self, ids) -> pd.Index:
+        """
+        Adds the public IDs missing from the encoding, keeping the private IDs already assigned.
+
+        The new IDs receive consecutive private IDs after the largest one (from 0 if the
+        encoding is empty), in order of first appearance.
+
+        Args:
+            ids (array-like): The public IDs, possibly repeated or already encoded.
+
+        Returns:
+            (pd.Index): The public IDs added to the encoding.
+        """
+        uniques = pd.Index(pd.unique(pd.Index(ids, tupleize_cols=False)), tupleize_cols=False)
+        new_keys = uniques[self._keys.get_indexer(uniques) < 0]
+        if len(new_keys):
+            start = int(self._values.max()) + 1 if len(self._values) else 0
+            self._set_mapping(self._keys.append(new_keys),
+                              np.concatenate([self._values, np.arange(start, start + len(new_keys), dtype=np.int64)]))
+        return new_keys
 
     def change_offset(self, offset: int) -> None:
         """
@@ -206,12 +521,10 @@ class Encoder:
         Args:
             offset (int): The new starting integer for the private IDs.
         """
-        if not self.encoding:
+        if not self.is_encoded():
             raise ValueError('Encoding dictionary is empty. Please, build the encoding first.')
-        lst = list(self.encoding.values())
-        current_min = min(lst)
-        new_offset = offset - current_min
-        self.encoding = {idx: el + new_offset for idx, el in self.encoding.items()}
+        new_offset = offset - int(self._values.min())
+        self._set_mapping(self._keys, self._values + new_offset)
 
     def apply_encoding(self, encoding: dict) -> None:
         """
@@ -223,7 +536,66 @@ class Encoder:
         if self.is_encoded():
             raise ValueError('Encoding dictionary is not empty. Please, reset it before applying a new encoding.')
         self.encoding = encoding
-    
+
+    def encode_array(self, values) -> np.ndarray:
+        """
+        Encodes an array-like of public IDs into integer IDs using the built encoding.
+
+        Args:
+            values (array-like): The public IDs (list, NumPy array or pandas Series).
+
+        Returns:
+            (np.ndarray): The encoded integer IDs.
+
+        Raises:
+            KeyError: If some IDs are not in the encoding.
+        """
+        if self.is_encoded() is False:
+            raise ValueError('Encoding dictionary is empty. Please, build the encoding first.')
+        values = pd.Index(values, tupleize_cols=False)
+        # look up each distinct ID once, then broadcast the result to every row
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        unique_positions = self._keys.get_indexer(uniques)
+        if (unique_positions >= 0).all():
+            return self._values[unique_positions][codes]
+
+        # factorize normalizes missing values (e.g., None to NaN): fall back to a row-wise lookup
+        positions = self._keys.get_indexer(values)
+        missing = positions < 0
+        if missing.any():
+            raise KeyError(f'IDs not in the encoding: {values[missing][:5].tolist()}')
+        return self._values[positions]
+
+    def decode_array(self, values) -> np.ndarray:
+        """
+        Decodes an array-like of private IDs back to public IDs.
+
+        Args:
+            values (array-like): The private IDs (list, NumPy array or pandas Series).
+
+        Returns:
+            (np.ndarray): The decoded public IDs.
+
+        Raises:
+            KeyError: If some IDs are not in the encoding.
+        """
+        if self.is_encoded() is False:
+            raise ValueError('Encoding dictionary is empty. Please, build the encoding first.')
+        values = np.asarray(values)
+        if self._offset is not None and values.dtype.kind in 'iu':
+            positions = values.astype(np.int64, copy=False) - self._offset
+            invalid = (positions < 0) | (positions >= len(self._keys))
+        else:
+            if self._reverse is None:
+                self._reverse = pd.Index(self._values)
+                if not self._reverse.is_unique:
+                    print('WARNING: the ID encoding could be incorrect. Please, check your data.')
+            positions = self._reverse.get_indexer(values)
+            invalid = positions < 0
+        if invalid.any():
+            raise KeyError(f'IDs not in the encoding: {values[invalid][:5].tolist()}')
+        return self._keys.take(positions).to_numpy()
+
     def encode(self, lst: list) -> list:
         """
         Encodes a list of public IDs into integer IDs using the built encoding.
@@ -234,9 +606,7 @@ class Encoder:
         Returns:
             (list): A list of encoded integer IDs.
         """
-        if self.is_encoded() is False:
-            raise ValueError('Encoding dictionary is empty. Please, build the encoding first.')
-        return [self.encoding[el] for el in lst]
+        return self.encode_array(lst).tolist()
 
     def decode(self, lst: list) -> list:
         """
@@ -248,13 +618,43 @@ class Encoder:
         Returns:
             (list): A list of decoded public IDs.
         """
-        if self.is_encoded() is False:
-            raise ValueError('Encoding dictionary is empty. Please, build the encoding first.')
-        decoder = {el: idx for idx, el in self.encoding.items()}
-        if len(decoder) != len(self.encoding):
-            print('WARNING: the ID encoding could be incorrect. Please, check your data.')
-        return [decoder[el] for el in lst]
-    
+        return self.decode_array(lst).tolist()
+
+    def to_arrays(self) -> dict:
+        """
+        Export the encoding as compact arrays.
+
+        String vocabularies are packed into a UTF-8 buffer and offsets (see `pack_strings`) and
+        numeric ones are stored as numeric arrays, so they can be saved without pickling Python
+        objects.
+
+        Returns:
+            (dict): A dictionary with the public IDs (`keys`, or `keys_utf8` and `keys_offsets`
+                for strings) and the aligned private IDs (`values`).
+        """
+        return {**_keys_to_arrays(self._keys), 'values': self._values}
+
+    @classmethod
+    def from_arrays(cls, keys: Optional[np.ndarray] = None, values: Optional[np.ndarray] = None,
+                    keys_utf8: Optional[np.ndarray] = None, keys_offsets: Optional[np.ndarray] = None) -> "Encoder":
+        """
+        Rebuild an encoder from the arrays produced by `to_arrays`.
+
+        Args:
+            keys (Optional[np.ndarray]): The public IDs, unless they are packed strings.
+            values (np.ndarray): The private IDs aligned with the public ones.
+            keys_utf8 (Optional[np.ndarray]): The UTF-8 buffer of packed string IDs.
+            keys_offsets (Optional[np.ndarray]): The offsets of packed string IDs.
+
+        Returns:
+            (Encoder): The rebuilt encoder.
+        """
+        encoder = cls()
+        keys = _keys_from_arrays(keys, keys_utf8, keys_offsets)
+        if len(keys):
+            encoder._set_mapping(pd.Index(keys, tupleize_cols=False), values)
+        return encoder
+
 
 class IncrementalEncoder:
     """
@@ -262,52 +662,245 @@ class IncrementalEncoder:
 
     Preserves reproducibility by keeping both forward (public -> int)
     and reverse (int -> public) mappings without requiring the full list upfront.
+    IDs are assigned in order of first appearance, starting from `offset`.
+
+    Chunks are encoded in bulk with `encode_chunk`: each chunk is factorized with pandas,
+    only its distinct keys are looked up in the vocabulary, and only the unseen ones are
+    merged into it. The vocabulary is kept as `pd.Index` segments of contiguous IDs, so
+    lookups are vectorized hash probes. It can be persisted as
+    compact arrays with `save`/`load`.
     """
 
-    def __init__(self, offset: int = 0):
+    def __init__(self, offset: int = 0, dtype=np.int64):
+        """
+        Initializes the IncrementalEncoder object.
+
+        Args:
+            offset (int): The first integer ID to be assigned.
+            dtype (np.dtype): The integer dtype of the codes returned by `encode_chunk`
+                (e.g., np.int32 to halve the memory of the encoded columns).
+        """
         self.offset = offset
-        self._forward: dict = {}          # public -> int
-        self._reverse: list = []          # index -> public (index = id - offset)
+        self.dtype = np.dtype(dtype)
+        self._segments: list = []         # [(keys, first id)], ids are contiguous across segments
+        self._size = 0
+        self._forward = None              # public -> int, built on demand
+        self._reverse = None              # index -> public (index = id - offset), built on demand
 
     def __len__(self):
-        return len(self._forward)
+        return self._size
+
+    def _lookup(self, keys: pd.Index) -> np.ndarray:
+        """
+        Looks up distinct keys in the vocabulary.
+
+        Args:
+            keys (pd.Index): The keys to be looked up.
+
+        Returns:
+            (np.ndarray): The id of each key, or -1 for unseen keys.
+        """
+        ids = np.full(len(keys), -1, dtype=np.int64)
+        for segment, start in self._segments:
+            todo = np.flatnonzero(ids < 0)
+            if todo.size == 0:
+                break
+            positions = segment.get_indexer(keys[todo])
+            found = positions >= 0
+            ids[todo[found]] = positions[found] + start
+        return ids
+
+    def _extend(self, keys: pd.Index) -> np.ndarray:
+        """
+        Appends unseen keys to the vocabulary.
+
+        Args:
+            keys (pd.Index): Distinct keys not yet in the vocabulary.
+
+        Returns:
+            (np.ndarray): The ids assigned to the keys.
+
+        Raises:
+            OverflowError: If the vocabulary does not fit the dtype of the encoder.
+        """
+        start = self.offset + self._size
+        if start + len(keys) - 1 > np.iinfo(self.dtype).max:
+            raise OverflowError(f'Vocabulary size exceeds the range of {self.dtype}.')
+
+        self._segments.append((keys, start))
+        self._size += len(keys)
+        # keep a main segment and a buffer of recent keys, merged once the buffer grows
+        # beyond a fraction of the main one: every chunk probes at most two hash tables
+        # and each key is rehashed a constant number of times on average
+        if len(self._segments) > 2:
+            (buffer, _), (recent, _) = self._segments[1], self._segments.pop()
+            self._segments[1] = (buffer.append(recent), self._segments[1][1])
+        if len(self._segments) == 2 and 4 * len(self._segments[1][0]) >= len(self._segments[0][0]):
+            (main, main_start), (buffer, _) = self._segments
+            self._segments = [(main.append(buffer), main_start)]
+
+        self._forward = None
+        self._reverse = None
+        return np.arange(start, start + len(keys), dtype=np.int64)
+
+    def encode_chunk(self, values) -> np.ndarray:
+        """
+        Encode a chunk of keys, creating new ids for the unseen ones.
+
+        Args:
+            values (array-like): The keys to be encoded (list, NumPy array or pandas Series).
+
+        Returns:
+            (np.ndarray): The encoded ids, with the dtype of the encoder.
+
+        Raises:
+            OverflowError: If the vocabulary does not fit the dtype of the encoder.
+        """
+        if isinstance(values, list):
+            values = pd.Index(values, tupleize_cols=False)
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        uniques = pd.Index(uniques, tupleize_cols=False)
+
+        ids = self._lookup(uniques)
+        unseen = np.flatnonzero(ids < 0)
+        if unseen.size:
+            ids[unseen] = self._extend(uniques[unseen])
+
+        return ids.astype(self.dtype, copy=False)[codes]
 
     def encode_one(self, key):
         """
         Encode a single key, creating a new id if unseen.
         """
-        if key in self._forward:
-            return self._forward[key]
-        idx = self.offset + len(self._forward)
-        self._forward[key] = idx
-        self._reverse.append(key)
-        return idx
+        return int(self.encode_chunk([key])[0])
 
     def encode_many(self, iterable):
         """
         Encode an iterable of keys, returning a list of int ids.
         """
-        return [self.encode_one(k) for k in iterable]
+        return self.encode_chunk(list(iterable)).tolist()
+
+    @property
+    def keys(self) -> pd.Index:
+        """
+        The keys of the vocabulary, ordered by id.
+        """
+        return self._keys()
+
+    def _keys(self) -> pd.Index:
+        """
+        Returns all the keys of the vocabulary, ordered by id.
+        """
+        if not self._segments:
+            return pd.Index([])
+        if len(self._segments) > 1:
+            keys = self._segments[0][0].append([segment for segment, _ in self._segments[1:]])
+            self._segments = [(keys, self.offset)]
+        return self._segments[0][0]
+
+    def decode_chunk(self, values) -> np.ndarray:
+        """
+        Decode a chunk of ids back to the original keys.
+
+        Args:
+            values (array-like): The ids to be decoded.
+
+        Returns:
+            (np.ndarray): The original keys.
+
+        Raises:
+            KeyError: If some ids are not in the encoder.
+        """
+        positions = np.asarray(values, dtype=np.int64) - self.offset
+        invalid = (positions < 0) | (positions >= self._size)
+        if invalid.any():
+            raise KeyError(f"Ids {(positions[invalid][:5] + self.offset).tolist()} not in encoder")
+        return self._keys().take(positions).to_numpy()
 
     def decode_one(self, idx: int):
         """
         Decode a single id back to the original key.
         """
         pos = idx - self.offset
-        if pos < 0 or pos >= len(self._reverse):
+        if pos < 0 or pos >= self._size:
             raise KeyError(f"Id {idx} not in encoder")
-        return self._reverse[pos]
+        return self.reverse[pos]
 
     def decode_many(self, iterable):
         """
         Decode an iterable of ids back to original keys.
         """
-        return [self.decode_one(i) for i in iterable]
+        return self.decode_chunk(list(iterable)).tolist()
+
+    def to_arrays(self) -> dict:
+        """
+        Export the vocabulary as compact arrays.
+
+        String vocabularies are packed into a UTF-8 buffer and offsets (see `pack_strings`) and
+        numeric ones are stored as numeric arrays, so they can be saved without pickling Python
+        objects.
+
+        Returns:
+            (dict): A dictionary with the keys ordered by id (`keys`, or `keys_utf8` and
+                `keys_offsets` for strings) and the `offset`.
+        """
+        return {**_keys_to_arrays(self._keys()), 'offset': np.int64(self.offset)}
+
+    @classmethod
+    def from_arrays(cls, keys: Optional[np.ndarray] = None, offset: int = 0, dtype=np.int64,
+                    keys_utf8: Optional[np.ndarray] = None,
+                    keys_offsets: Optional[np.ndarray] = None) -> "IncrementalEncoder":
+        """
+        Rebuild an encoder from the arrays produced by `to_arrays`.
+
+        Args:
+            keys (Optional[np.ndarray]): The keys ordered by id, unless they are packed strings.
+            offset (int): The id of the first key.
+            dtype (np.dtype): The integer dtype of the codes returned by `encode_chunk`.
+            keys_utf8 (Optional[np.ndarray]): The UTF-8 buffer of packed string keys.
+            keys_offsets (Optional[np.ndarray]): The offsets of packed string keys.
+
+        Returns:
+            (IncrementalEncoder): The rebuilt encoder.
+        """
+        encoder = cls(offset=int(offset), dtype=dtype)
+        keys = _keys_from_arrays(keys, keys_utf8, keys_offsets)
+        if len(keys):
+            encoder._extend(pd.Index(keys, tupleize_cols=False))
+        return encoder
+
+    def save(self, filepath: str) -> None:
+        """
+        Save the vocabulary to a `.npz` file.
+
+        Args:
+            filepath (str): The path of the output file.
+        """
+        np.savez(filepath, **self.to_arrays())
+
+    @classmethod
+    def load(cls, filepath: str, dtype=np.int64) -> "IncrementalEncoder":
+        """
+        Load an encoder saved with `save`.
+
+        Args:
+            filepath (str): The path of the `.npz` file.
+            dtype (np.dtype): The integer dtype of the codes returned by `encode_chunk`.
+
+        Returns:
+            (IncrementalEncoder): The loaded encoder.
+        """
+        with np.load(filepath, allow_pickle=True) as arrays:
+            return cls.from_arrays(**{name: arrays[name] for name in arrays.files}, dtype=dtype)
 
     @property
     def forward(self):
+        if self._forward is None:
+            self._forward = dict(zip(self.reverse, range(self.offset, self.offset + self._size)))
         return self._forward
 
     @property
     def reverse(self):
+        if self._reverse is None:
+            self._reverse = self._keys().tolist()
         return self._reverse
@@ -200,20 +200,20 @@ class FrameworkExporter:
     def to_elliot(self, train_data: DataRec, test_data: DataRec, val_data: DataRec):
         """
         Export to Elliot format.
+
+        The splits are written one at a time. Split views (see `SplitIndex.view`) are streamed from
+        the original dataset, so no split needs to be materialized.
+
         Args:
-            train_data (DataRec): Training data as DataRec object to convert to Elliot format.
-            test_data (DataRec): Test data as DataRec object to convert to Elliot format.
-            val_data (DataRec): Validation data as DataRec object to convert to Elliot format.
+            train_data (DataRec | SplitView): Training data to convert to Elliot format.
+            test_data (DataRec | SplitView): Test data to convert to Elliot format.
+            val_data (DataRec | SplitView): Validation data to convert to Elliot format.
         """
 
         frmk = Elliot(timestamp=self.timestamp, path=self.path)
 
-        for data, name in zip([train_data.to_rawdata(), test_data.to_rawdata(), val_data.to_rawdata()],
+        for data, name in zip([train_data, test_data, val_data],
                               [frmk.train_path, frmk.test_path, frmk.val_path]):
-            columns_order = [data.user, data.item, data.rating]
-            if self.timestamp:
-                columns_order.append(data.timestamp)
-
             write_transactions_tabular(data=data, filepath=name, sep='\t', header=False,
                           include_user=self.user, include_item=self.item, include_rating=self.rating, include_timestamp=self.timestamp)
 
@@ -123,3 +123,15 @@ def pickle_version_filepath(dataset_name: str, dataset_version: str) -> str:
         (str): the path of the pickled version of the dataset
     """
     return os.path.join(dataset_version_directory(dataset_name=dataset_name, dataset_version=dataset_version), dataset_name+'_'+dataset_version) + '.pkl'
+
+
+def snapshot_version_directory(dataset_name: str, dataset_version: str) -> str:
+    """
+    Given the dataset name and version returns the directory of the columnar snapshot of the dataset
+    Args:
+        dataset_name (str): name of the dataset
+        dataset_version (str): version of the dataset
+    Returns:
+        (str): the path of the snapshot directory of the dataset
+    """
+    return os.path.join(dataset_version_directory(dataset_name=dataset_name, dataset_version=dataset_version), dataset_name+'_'+dataset_version) + '.snapshot'
@@ -72,12 +72,16 @@ class RawData:
         Append new rows to the dataset.
 
         Args:
-            new_data (pd.DataFrame): DataFrame to append.
+            new_data (pd.DataFrame | RawData): Rows to append. A RawData object must have
+                compatible columns.
 
         Returns:
             None
         """
-        self.data.append(new_data)
+        if isinstance(new_data, RawData):
+            self.__check_rawdata_compatibility__(new_data)
+            new_data = new_data.data
+        self.data = pd.concat([self.data, new_data])
 
     def copy(self, deep=True) -> "RawData":
         """
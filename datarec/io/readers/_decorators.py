@@ -9,6 +9,7 @@ except ImportError:  # Python < 3.10
 from datarec.pipeline.pipeline_step import PipelineStep
 from datarec.pipeline.pipeline import Pipeline
 from datarec import DataRec
+from datarec.data.mapped import MappedDataRec
 
 from datarec.io.rawdata import RawData
 
@@ -43,11 +44,15 @@ def annotate_datarec_output(func: Callable[P, R]) -> Callable[P, DataRec]:
 
     Builds a read PipelineStep from the function signature, replacing `filepath`
     with `filename`. If the wrapped function returns RawData, it is wrapped into
-    a DataRec with a single-step pipeline. If it returns DataRec, the read step
-    is appended to its pipeline.
+    a DataRec with a single-step pipeline. If it returns DataRec (or an out-of-core
+    MappedDataRec), the read step is appended to its pipeline.
+
+    Every wrapped reader also accepts a `compact` keyword (default False): when
+    True, the returned DataRec is compacted with `DataRec.compact()`.
     """
     @wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs):
+        compact = bool(kwargs.pop("compact", False))
         result = func(*args, **kwargs)
 
         bound = inspect.signature(func).bind_partial(*args, **kwargs)
@@ -55,6 +60,8 @@ def annotate_datarec_output(func: Callable[P, R]) -> Callable[P, DataRec]:
         params = dict(bound.arguments)
         if "filepath" in params:
             params["filename"] = os.path.basename(params.pop("filepath"))
+        if compact:
+            params["compact"] = True
 
         pipeline_step = PipelineStep("read", func.__name__, params)
         # pipeline = Pipeline()
@@ -64,12 +71,19 @@ def annotate_datarec_output(func: Callable[P, R]) -> Callable[P, DataRec]:
             result.pipeline_step = pipeline_step
             dataset_name = params.get("dataset_name", "datarec")
             version_name = params.get("version_name", "no_version_provided")
-            return DataRec(
+            result = DataRec(
                 rawdata=result,
                 registry_dataset=False,
                 dataset_name=dataset_name,
                 version_name=version_name,
             )
+            if compact:
+                result.compact()
+            return result
+
+        if isinstance(result, MappedDataRec):
+            result.add_step(pipeline_step)
+            return cast(DataRec, result)
 
         if isinstance(result, DataRec):
             if result.pipeline is None:
@@ -77,6 +91,8 @@ def annotate_datarec_output(func: Callable[P, R]) -> Callable[P, DataRec]:
                 result.pipeline.steps.append(pipeline_step)
             else:
                 result.pipeline.steps.append(pipeline_step)
+            if compact:
+                result.compact()
             return result
 
         return cast(DataRec, result)
@@ -6,51 +6,7 @@ from typing import Optional, List, Union, cast
 from datarec.io.rawdata import RawData
 from datarec.io.readers._decorators import annotate_datarec_output
 from datarec import DataRec
-
-
-class IncrementalEncoder:
-    """
-    Streaming-friendly encoder that assigns integer IDs incrementally.
-
-    Keeps forward (public -> int) and reverse (int -> public) mappings without
-    requiring the full list upfront.
-    """
-
-    def __init__(self, offset: int = 0):
-        self.offset = offset
-        self._forward: dict = {}
-        self._reverse: list = []
-
-    def __len__(self):
-        return len(self._forward)
-
-    def encode_one(self, key):
-        if key in self._forward:
-            return self._forward[key]
-        idx = self.offset + len(self._forward)
-        self._forward[key] = idx
-        self._reverse.append(key)
-        return idx
-
-    def encode_many(self, iterable):
-        return [self.encode_one(k) for k in iterable]
-
-    def decode_one(self, idx: int):
-        pos = idx - self.offset
-        if pos < 0 or pos >= len(self._reverse):
-            raise KeyError(f"Id {idx} not in encoder")
-        return self._reverse[pos]
-
-    def decode_many(self, iterable):
-        return [self.decode_one(i) for i in iterable]
-
-    @property
-    def forward(self):
-        return self._forward
-
-    @property
-    def reverse(self):
-        return self._reverse
+from datarec.data.utils import IncrementalEncoder
 
 
 @annotate_datarec_output
@@ -264,8 +220,8 @@ def _read_sequence_tabular_inline_full(
     if encode_ids:
         user_enc = IncrementalEncoder(offset=0)
         item_enc = IncrementalEncoder(offset=0)
-        data[user_col] = user_enc.encode_many(data[user_col].tolist())
-        data["items"] = item_enc.encode_many(data["items"].tolist())
+        data[user_col] = user_enc.encode_chunk(data[user_col])
+        data["items"] = item_enc.encode_chunk(data["items"])
         user_encoder = user_enc.forward
         item_encoder = item_enc.forward
 
@@ -319,8 +275,8 @@ def _process_chunk(df_chunk,
     df_chunk = df_chunk.reset_index(drop=True)
 
     if encode_ids:
-        encoded_users.append(np.fromiter((user_enc.encode_one(u) for u in df_chunk[user_col]), dtype=np.int64))
-        encoded_items.append(np.fromiter((item_enc.encode_one(i) for i in df_chunk["items"]), dtype=np.int64))
+        encoded_users.append(user_enc.encode_chunk(df_chunk[user_col]))
+        encoded_items.append(item_enc.encode_chunk(df_chunk["items"]))
     else:
         encoded_users.append(df_chunk[user_col].to_numpy())
         encoded_items.append(df_chunk["items"].to_numpy())
@@ -408,8 +364,8 @@ def read_sequence_tabular_wide(
     if encode_ids:
         u_enc = IncrementalEncoder(offset=0)
         i_enc = IncrementalEncoder(offset=0)
-        df_long[user_col] = u_enc.encode_many(df_long[user_col].tolist())
-        df_long[item_col] = i_enc.encode_many(df_long[item_col].tolist())
+        df_long[user_col] = u_enc.encode_chunk(df_long[user_col])
+        df_long[item_col] = i_enc.encode_chunk(df_long[item_col])
         user_encoder = u_enc.forward
         item_encoder = i_enc.forward
 
@@ -512,8 +468,8 @@ def read_sequence_tabular_implicit(
     if encode_ids:
         u_enc = IncrementalEncoder(offset=0)
         i_enc = IncrementalEncoder(offset=0)
-        df_long[user_col] = u_enc.encode_many(df_long[user_col].tolist())
-        df_long[item_col] = i_enc.encode_many(df_long[item_col].tolist())
+        df_long[user_col] = u_enc.encode_chunk(df_long[user_col])
+        df_long[item_col] = i_enc.encode_chunk(df_long[item_col])
         user_encoder = u_enc.forward
         item_encoder = i_enc.forward
 
@@ -1,4 +1,4 @@
-from .tabular import read_transactions_tabular
+from .tabular import read_transactions_tabular, profile_transactions_tabular
 from .json import read_transactions_json
 from .jsonl import read_transactions_jsonl
 from .blocks import read_transactions_blocks
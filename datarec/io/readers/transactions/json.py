@@ -3,7 +3,7 @@ import numpy as np
 import os
 from typing import Optional, cast
 from datarec.io.rawdata import RawData
-from datarec.io.readers.transactions.tabular import IncrementalEncoder  # reuse lightweight encoder
+from datarec.data.utils import IncrementalEncoder
 from datarec.io.readers._decorators import annotate_datarec_output
 from datarec import DataRec
 
@@ -73,8 +73,8 @@ def read_transactions_json_base(
     if encode_ids:
         u_enc = IncrementalEncoder(offset=0)
         i_enc = IncrementalEncoder(offset=0)
-        data[user_col] = u_enc.encode_many(data[user_col].tolist())
-        data[item_col] = i_enc.encode_many(data[item_col].tolist())
+        data[user_col] = u_enc.encode_chunk(data[user_col])
+        data[item_col] = i_enc.encode_chunk(data[item_col])
         user_encoder = u_enc.forward
         item_encoder = i_enc.forward
 
@@ -117,8 +117,8 @@ def _read_transactions_json_stream(
         chunk = chunk[cols].dropna()
 
         if encode_ids:
-            parts["user"].append(pd.Series([u_enc.encode_one(u) for u in chunk[user_col]]).to_numpy())
-            parts["item"].append(pd.Series([i_enc.encode_one(i) for i in chunk[item_col]]).to_numpy())
+            parts["user"].append(u_enc.encode_chunk(chunk[user_col]))
+            parts["item"].append(i_enc.encode_chunk(chunk[item_col]))
         else:
             parts["user"].append(chunk[user_col].to_numpy())
             parts["item"].append(chunk[item_col].to_numpy())
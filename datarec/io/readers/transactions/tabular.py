@@ -5,30 +5,8 @@ from typing import Optional, List, Union, cast
 from datarec.io.rawdata import RawData
 from datarec.io.readers._decorators import annotate_datarec_output
 from datarec import DataRec
-
-
-class IncrementalEncoder:
-    """Streaming-friendly encoder for public->int ids."""
-
-    def __init__(self, offset: int = 0):
-        self.offset = offset
-        self._forward = {}
-        self._reverse = []
-
-    def encode_one(self, key):
-        if key in self._forward:
-            return self._forward[key]
-        idx = self.offset + len(self._forward)
-        self._forward[key] = idx
-        self._reverse.append(key)
-        return idx
-
-    def encode_many(self, iterable):
-        return [self.encode_one(k) for k in iterable]
-
-    @property
-    def forward(self):
-        return self._forward
+from datarec.data.utils import IncrementalEncoder
+from datarec.data.approximate import StreamingCharacteristics
 
 
 @annotate_datarec_output
@@ -54,6 +32,7 @@ def read_transactions_tabular(
     stream: bool = False,
     encode_ids: bool = False,
     chunksize: int = 100_000,
+    out_of_core: Optional[str] = None,
     dataset_name: str = "Unknown Dataset",
     version_name: str = "Unknown Version",
 ) -> DataRec:
@@ -82,6 +61,9 @@ def read_transactions_tabular(
         stream: If True, read in chunks to reduce memory.
         encode_ids: If True, encode user/item to int ids using IncrementalEncoder.
         chunksize: Rows per chunk when streaming.
+        out_of_core: If set, the file is streamed in chunks into a memory-mapped snapshot at this
+              directory and a `MappedDataRec` is returned instead of a DataRec, so files larger
+              than memory can be read. User and item IDs are always encoded on disk.
         dataset_name: Name to assign to the resulting DataRec dataset.
         version_name: Version identifier to assign to the resulting DataRec dataset.
 
@@ -109,6 +91,22 @@ def read_transactions_tabular(
     if cols is not None:
         read_kwargs["names"] = cols
 
+    if out_of_core is not None:
+        from datarec.data.mapped import MappedDataRec
+        # Wrapped by @annotate_datarec_output, which records the read step in its pipeline.
+        return cast(DataRec, MappedDataRec.read_tabular(
+            filepath,
+            out_of_core,
+            user_col=user_col,
+            item_col=item_col,
+            rating_col=rating_col,
+            timestamp_col=timestamp_col,
+            chunksize=chunksize,
+            dataset_name=dataset_name,
+            version_name=version_name,
+            **read_kwargs,
+        ))
+
     if stream:
         rawdata = _read_transactions_tabular_stream(
             filepath=filepath,
@@ -187,8 +185,8 @@ def read_transactions_tabular(
     if encode_ids:
         u_enc = IncrementalEncoder(offset=0)
         i_enc = IncrementalEncoder(offset=0)
-        data[user_col_name] = u_enc.encode_many(data[user_col_name].tolist())
-        data[item_col_name] = i_enc.encode_many(data[item_col_name].tolist())
+        data[user_col_name] = u_enc.encode_chunk(data[user_col_name])
+        data[item_col_name] = i_enc.encode_chunk(data[item_col_name])
         user_encoder = u_enc.forward
         item_encoder = i_enc.forward
 
@@ -240,8 +238,8 @@ def _read_transactions_tabular_stream(
                 chunk = chunk[cols_to_keep].dropna()
 
                 if encode_ids:
-                    encoded_cols["user"].append(np.fromiter((u_enc.encode_one(u) for u in chunk[user_col_name]), dtype=np.int64))
-                    encoded_cols["item"].append(np.fromiter((i_enc.encode_one(i) for i in chunk[item_col_name]), dtype=np.int64))
+                    encoded_cols["user"].append(u_enc.encode_chunk(chunk[user_col_name]))
+                    encoded_cols["item"].append(i_enc.encode_chunk(chunk[item_col_name]))
                 else:
                     encoded_cols["user"].append(chunk[user_col_name].to_numpy())
                     encoded_cols["item"].append(chunk[item_col_name].to_numpy())
@@ -276,6 +274,65 @@ def _read_transactions_tabular_stream(
     raise last_exc
 
 
+def profile_transactions_tabular(
+    filepath: str,
+    *,
+    sep: str = "\t",
+    user_col: Union[str, int],
+    item_col: Union[str, int],
+    header: Union[int, List[int], str, None] = None,
+    skiprows: Union[int, List[int]] = 0,
+    cols: Optional[List[str]] = None,
+    engine: Optional[str] = 'c',
+    encoding: Optional[str] = None,
+    chunksize: int = 1_000_000,
+    precision: int = 14,
+    sample_size: int = 1_000_000,
+) -> StreamingCharacteristics:
+    """
+    Estimates the characteristics of a tabular data file in one streaming pass, without loading it.
+
+    Only the user and item columns are parsed. See `StreamingCharacteristics` for the
+    estimators and their error bounds.
+
+    Args:
+        filepath: Path to the tabular data file.
+        sep: Delimiter to use (default: tab).
+        user_col: Column name or index for the user field (Required).
+        item_col: Column name or index for the item field (Required).
+        header: Row number(s) to use as the column names.
+        skiprows: Line numbers to skip at the start of the file.
+        cols: Explicit column names if the file has no header.
+        engine: Pandas CSV engine.
+        encoding: Text encoding for the input file.
+        chunksize: Rows per chunk.
+        precision: Precision of the HyperLogLog counters of distinct users and items.
+        sample_size: Maximum number of users (and items) whose degree is kept for the Gini coefficients.
+
+    Returns:
+        StreamingCharacteristics: The estimates, see `compute` and `error_bounds`.
+
+    Example:
+        >>> stats = profile_transactions_tabular('ratings.tsv', user_col=0, item_col=1)
+        >>> stats.compute(['n_users', 'n_items', 'density'])
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File not found: {filepath}")
+
+    read_kwargs = dict(sep=sep, skiprows=skiprows, engine=engine, encoding=encoding)
+    read_kwargs = {key: value for key, value in read_kwargs.items() if value is not None}
+    # None is a valid header (no header row), so it is passed as is
+    read_kwargs["header"] = header
+    if cols is not None:
+        read_kwargs["names"] = cols
+
+    stats = StreamingCharacteristics(precision=precision, sample_size=sample_size)
+    for chunk in pd.read_csv(filepath, chunksize=chunksize, **read_kwargs):
+        user_col_name, item_col_name, _, _ = _resolve_columns(chunk, user_col, item_col, None, None)
+        stats.update_chunk(chunk, user_col_name, item_col_name)
+    return stats
+
+
 def _resolve_columns(data: pd.DataFrame,
                      user_col: Union[str, int],
                      item_col: Union[str, int],
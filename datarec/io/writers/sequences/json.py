@@ -114,7 +114,7 @@ def write_sequences_json(
     payload: Dict[str, List[Dict[str, Any]]] = {}
 
     # Preserve order of appearance
-    for uid, g in df.groupby(raw.user, sort=False):
+    for uid, g in df.groupby(raw.user, sort=False, observed=True):
         # Build event dicts in a vectorized-ish way
         g2 = g.rename(columns={raw.item: item_col})
 
@@ -193,7 +193,7 @@ def write_sequences_json_items(
     payload: Dict[str, List[Any]] = {}
 
     # Preserve order of appearance
-    for uid, g in df.groupby(raw.user, sort=False):
+    for uid, g in df.groupby(raw.user, sort=False, observed=True):
         items = [_json_safe(v) for v in g[raw.item].tolist()]
         payload[str(_json_safe(uid))] = items
 
@@ -290,7 +290,7 @@ def write_sequences_json_array(
 
     payload: List[Dict[str, Any]] = []
 
-    for uid, g in df.groupby(raw.user, sort=False):
+    for uid, g in df.groupby(raw.user, sort=False, observed=True):
         g2 = g.rename(columns={raw.item: item_col})
 
         keep_cols = [item_col]
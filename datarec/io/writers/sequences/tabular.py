@@ -104,7 +104,7 @@ def write_sequence_tabular_inline(
     for mc in available_meta:
         agg[mc] = "first"
 
-    grouped = df.groupby(raw.user, sort=False, dropna=False).agg(agg).reset_index()
+    grouped = df.groupby(raw.user, sort=False, dropna=False, observed=True).agg(agg).reset_index()
 
     # Serialize sequence
     grouped[sequence_col] = grouped[raw.item].apply(
@@ -192,7 +192,7 @@ def write_sequence_tabular_wide(
 
     # Preserve order of appearance
     grouped = (
-        df.groupby(raw.user, sort=False)[raw.item]
+        df.groupby(raw.user, sort=False, observed=True)[raw.item]
         .apply(list)
         .reset_index()
     )
@@ -270,7 +270,7 @@ def write_sequence_tabular_implicit(
     df = raw.data[[raw.user, raw.item]].dropna(subset=[raw.user, raw.item])
 
     grouped = (
-        df.groupby(raw.user, sort=False)[raw.item]
+        df.groupby(raw.user, sort=False, observed=True)[raw.item]
         .apply(list)
         .reset_index(drop=True)
     )
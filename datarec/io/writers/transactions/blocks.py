@@ -114,7 +114,7 @@ def write_transactions_blocks(
         os.makedirs(out_dir, exist_ok=True)
 
     with open(filepath, "w", encoding="utf-8") as f:
-        for block_id, g in df.groupby(block_col, sort=False):
+        for block_id, g in df.groupby(block_col, sort=False, observed=True):
             f.write(f"{_stringify(block_id)}:\n")
             if event_layout == "id":
                 g2 = g[[other_col]]
@@ -35,9 +35,11 @@ def write_transactions_tabular(
     This writer accepts either:
     - RawData
     - DataRec (converted via `.to_rawdata()`)
+    - a split view (see `SplitIndex.view`), whose rows are streamed from the original
+      dataset block by block instead of being gathered at once
 
     Args:
-        data: RawData or DataRec instance.
+        data: RawData, DataRec or SplitView instance.
         filepath: Output path.
         sep: Column delimiter (e.g., '\\t', ',', ';').
         header: Whether to write column names.
@@ -57,7 +59,9 @@ def write_transactions_tabular(
     Returns:
         None
     """
-    raw = as_rawdata(data)
+    # split views stream their rows in blocks; the first block carries the column metadata
+    blocks = data.iter_rawdata() if hasattr(data, "iter_rawdata") else iter([as_rawdata(data)])
+    raw = next(blocks)
 
     # Transactional exports should always contain user + item (coherent across formats)
     if not include_user:
@@ -92,10 +96,6 @@ def write_transactions_tabular(
         if timestamp_col is not None:
             rename_map[raw.timestamp] = timestamp_col
 
-    df = raw.data[cols]
-    if rename_map:
-        df = df.rename(columns=rename_map)
-
     out_dir = os.path.dirname(os.path.abspath(filepath))
     if out_dir and not os.path.exists(out_dir):
         os.makedirs(out_dir, exist_ok=True)
@@ -104,7 +104,15 @@ def write_transactions_tabular(
     if engine is not None:
         to_csv_kwargs["engine"] = engine
 
-    df.to_csv(filepath, **to_csv_kwargs)
+    mode = "w"
+    while raw is not None:
+        df = raw.data[cols]
+        if rename_map:
+            df = df.rename(columns=rename_map)
+        df.to_csv(filepath, mode=mode, **to_csv_kwargs)
+        to_csv_kwargs["header"] = False
+        mode = "a"
+        raw = next(blocks, None)
 
     if verbose:
         print(f"Tabular dataset written to '{filepath}'")
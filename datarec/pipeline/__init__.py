@@ -1,2 +1,3 @@
 from datarec.pipeline.pipeline import Pipeline
-from datarec.pipeline.pipeline_step import PipelineStep
\ No newline at end of file
+from datarec.pipeline.pipeline_step import PipelineStep
+from datarec.pipeline.memory import MemoryTracker, MemoryBudgetExceeded
@@ -0,0 +1,178 @@
+import re
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+
+_UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+
+# trackers entered with `with`, innermost last
+_active_trackers: List["MemoryTracker"] = []
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised by a `MemoryTracker` with `on_exceed='raise'` when a step exceeds the memory budget."""
+
+
+def parse_bytes(size: Union[int, float, str]) -> int:
+    """
+    Converts a memory size to a number of bytes.
+
+    Args:
+        size (Union[int, float, str]): A number of bytes or a string such as '512MB' or '4 GB'
+            (binary multiples).
+
+    Returns:
+        (int): The number of bytes.
+
+    Raises:
+        ValueError: If the string cannot be parsed.
+    """
+    if isinstance(size, (int, float)):
+        return int(size)
+    match = re.fullmatch(r'\s*([0-9]*\.?[0-9]+)\s*([KMGT]?B?)\s*', str(size).upper())
+    if match is None:
+        raise ValueError(f'Invalid memory size: {size!r}.')
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def active_tracker() -> Optional["MemoryTracker"]:
+    """
+    Returns the innermost `MemoryTracker` currently entered with a `with` statement, if any.
+    """
+    return _active_trackers[-1] if _active_trackers else None
+
+
+class MemoryTracker:
+    """
+    Opt-in tracker of the memory allocated by pipeline steps and processors.
+
+    Memory is measured with `tracemalloc`, which also accounts for NumPy and pandas buffers.
+    Only allocations made while tracing are counted, so the budget refers to the memory
+    allocated since the tracker was entered.
+
+    While the tracker is entered with a `with` statement, every `Processor.run` call is
+    recorded as a step, and so is every block of row-wise processors fused by a
+    `ProcessingChain`, named after its processors; `Pipeline.apply(memory_tracker=...)` also
+    records each pipeline step, consecutive process steps as one.
+    Before a step runs, its requirement is estimated as the memory currently traced plus the
+    size of a shallow copy of its input, and the budget is checked against the estimate.
+    The measured peak is checked again after the step.
+
+    Example:
+        >>> with MemoryTracker(budget='4GB', on_exceed='raise') as tracker:
+        ...     result = UserKCore(core=5).run(datarec)
+        >>> tracker.report()
+    """
+
+    def __init__(self, budget: Union[int, str, None] = None, on_exceed: str = 'warn', verbose: bool = False):
+        """
+        Initializes the MemoryTracker object.
+
+        Args:
+            budget (Union[int, str, None]): The memory budget in bytes, or a string such as '4GB'.
+                If None, memory is only recorded.
+            on_exceed (str): 'warn' to emit a `RuntimeWarning` when the budget is exceeded,
+                'raise' to raise `MemoryBudgetExceeded`.
+            verbose (bool): If True, prints the peak memory of each step.
+
+        Raises:
+            ValueError: If `on_exceed` is not 'warn' or 'raise'.
+        """
+        if on_exceed not in ('warn', 'raise'):
+            raise ValueError("on_exceed must be either 'warn' or 'raise'.")
+
+        self.budget = parse_bytes(budget) if budget is not None else None
+        self.on_exceed = on_exceed
+        self.verbose = verbose
+        self.records: List[Dict[str, Any]] = []
+
+        self._started_tracing = False
+        # peak of the steps being tracked, outermost first
+        self._peaks: List[int] = []
+
+    def __enter__(self) -> "MemoryTracker":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _active_trackers.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _active_trackers.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def peak(self) -> int:
+        """
+        The highest peak recorded across all the steps, in bytes.
+        """
+        return max((record['peak_bytes'] for record in self.records), default=0)
+
+    @contextmanager
+    def track(self, step: str, data: Any = None) -> Iterator[None]:
+        """
+        Records the memory allocated while the body of the `with` statement runs.
+
+        Args:
+            step (str): The name of the step.
+            data (Any): The input of the step. If it provides `memory_usage` (e.g., a `DataRec`),
+                its size is used to check the budget before the step runs.
+
+        Raises:
+            MemoryBudgetExceeded: If `on_exceed='raise'` and the budget is (or would be) exceeded.
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError('MemoryTracker.track must be used inside the tracker context.')
+
+        input_bytes = 0
+        if callable(getattr(data, 'memory_usage', None)):
+            # a copy duplicates the column buffers, not the Python objects they point to
+            input_bytes = int(data.memory_usage(deep=False).sum())
+
+        start, peak = tracemalloc.get_traced_memory()
+        if self.budget is not None and start + input_bytes > self.budget:
+            self._exceeded(f"Step '{step}' would need about {start + input_bytes} bytes, "
+                           f"above the budget of {self.budget} bytes.")
+
+        # nested steps reset the peak, so the enclosing one keeps the peak reached so far
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        tracemalloc.reset_peak()
+        self._peaks.append(start)
+
+        try:
+            yield
+        finally:
+            end, peak = tracemalloc.get_traced_memory()
+            peak = max(self._peaks.pop(), peak)
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+
+            self.records.append({'step': step, 'input_bytes': input_bytes, 'start_bytes': start,
+                                 'peak_bytes': peak, 'end_bytes': end})
+            if self.verbose:
+                print(f"Step '{step}': peak {peak} bytes")
+
+        if self.budget is not None and peak > self.budget:
+            self._exceeded(f"Step '{step}' reached {peak} bytes, above the budget of {self.budget} bytes.")
+
+    def report(self) -> pd.DataFrame:
+        """
+        Returns the recorded steps.
+
+        Returns:
+            (pd.DataFrame): One row per step, in completion order, with the input size and the
+                traced memory at the start, at the peak and at the end of the step, in bytes.
+        """
+        return pd.DataFrame(self.records, columns=['step', 'input_bytes', 'start_bytes', 'peak_bytes', 'end_bytes'])
+
+    def _exceeded(self, message: str) -> None:
+        if self.on_exceed == 'raise':
+            raise MemoryBudgetExceeded(message)
+        warnings.warn(message, RuntimeWarning, stacklevel=3)
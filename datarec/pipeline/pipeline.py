@@ -1,9 +1,12 @@
 import yaml
 import importlib
+import warnings
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, Any, List, Optional, TYPE_CHECKING
 
 from datarec.pipeline.pipeline_step import PipelineStep
+from datarec.pipeline.memory import MemoryTracker
 from datarec.io.rawdata import RawData
 
 # Pipeline usage overview:
@@ -11,7 +14,8 @@ from datarec.io.rawdata import RawData
 # - load: only for registry datasets (operation: registry_dataset).
 # - read: file-based readers from datarec.io.readers (operation: read_*).
 # - process: transformations from datarec.processing (operation: class name).
-# - split: splitters from datarec.splitters (operation: class name).
+# - split: splitters from datarec.splitters (operation: class name). A 'split_path' param
+#   points to a split saved with SplitIndex.save, loaded instead of running the splitter.
 # - export: framework exporters (operation: Elliot, RecBole, etc.).
 # - write: writers from datarec.io.writers (operation: write_*).
 # - input_folder is used by read steps with filename; output_folder by export/write steps.
@@ -85,16 +89,26 @@ class Pipeline:
         pipeline.steps = [step.copy() for step in self.steps]
         return pipeline
 
-    def apply(self, input_folder: Optional[str] = None, output_folder: Optional[str] = None) -> Any:
+    def apply(self, input_folder: Optional[str] = None, output_folder: Optional[str] = None,
+              memory_tracker: Optional[MemoryTracker] = None) -> Any:
         """Execute the pipeline.
 
         Args:
             input_folder (Optional[str]): Base folder for file-based read steps.
             output_folder (Optional[str]): Base folder for export/write steps.
+            memory_tracker (Optional[MemoryTracker]): If provided, records the peak memory of
+                every step and enforces its budget (see `MemoryTracker`).
 
         Returns:
             Any: The final DataRec or split dict, depending on pipeline steps.
         """
+        if memory_tracker is None:
+            return self._apply_steps(input_folder, output_folder, None)
+        with memory_tracker:
+            return self._apply_steps(input_folder, output_folder, memory_tracker)
+
+    def _apply_steps(self, input_folder: Optional[str], output_folder: Optional[str],
+                     tracker: Optional[MemoryTracker]) -> Any:
         frameworks = {
             'Elliot': 'to_elliot',
             'ClayRS': 'to_clayrs',
@@ -107,6 +121,8 @@ class Pipeline:
             'Recommenders': 'to_recommenders'
         }
         split_required = {'Elliot', 'ReChorus'}
+        # exporters that stream split views from the dataset instead of materialized splits
+        split_streaming = {'Elliot'}
 
         if not self.steps:
             raise ValueError("Pipeline is empty. Add at least a load step.")
@@ -115,29 +131,55 @@ class Pipeline:
 
         print(f"\n\n --- Reproducing Pipeline --- \n\n")
 
+        def track(label, data):
+            return tracker.track(label, data) if tracker is not None else nullcontext()
+
+        # consecutive process steps are collected and run as a single fused ProcessingChain
+        processors = []
+        result = None
         for step in self.steps:
             print(f"\n--- Step: {step.name} -> {step.operation} ---\n")
             func = self.get_transformation_class(step.name, step.operation)
             if not func:
                 raise ValueError(f"Unknown operation: {step.operation}")
 
-            if step.name == 'load':
-                result = self._apply_load(step, func, input_folder)
+            if step.name == 'process':
+                processors.append(self._build_processor(step, func))
+                continue
+            if processors:
+                with track(self._process_label(processors), result):
+                    result = self._apply_processors(processors, result)
+                processors = []
 
-            elif step.name == 'read':
-                result = self._apply_read(step, func, input_folder)
+            with track(f'{step.name} -> {step.operation}', result):
+                if step.name == 'load':
+                    result = self._apply_load(step, func, input_folder)
 
-            elif step.name == 'export':
-                if step.operation not in frameworks:
-                    raise ValueError(f"Export step requires a framework operation. Unknown: {step.operation}")
-                self._apply_export(step, func, result, output_folder, frameworks, split_required)
-                return
+                elif step.name == 'read':
+                    result = self._apply_read(step, func, input_folder)
 
-            elif step.name == 'write':
-                self._apply_write(step, func, result, output_folder)
-                return
-            else:
-                result = self._apply_transform(step, func, result)
+                elif step.name == 'export':
+                    if step.operation not in frameworks:
+                        raise ValueError(f"Export step requires a framework operation. Unknown: {step.operation}")
+                    self._apply_export(step, func, result, output_folder, frameworks, split_required,
+                                       split_streaming)
+                    return
+
+                elif step.name == 'write':
+                    self._apply_write(step, func, result, output_folder)
+                    return
+
+                elif step.name == 'split':
+                    result = self._apply_split(step, func, result)
+                else:
+                    result = self._apply_transform(step, func, result)
+
+        if processors:
+            with track(self._process_label(processors), result):
+                result = self._apply_processors(processors, result)
+
+        if _is_split_index(result):
+            result = result.to_dict()
 
         print(f"\n\n --- Finished Pipeline --- \n\n")
         return result
@@ -173,11 +215,54 @@ class Pipeline:
             return loaded
         raise ValueError(f"Reader '{step.operation}' did not return a DataRec/RawData.")
 
+    def _build_processor(self, step: PipelineStep, func):
+        print(f"Pipeline step {step.name}.")
+        print(f"Applying {func}.")
+        return func(**step.params)
+
+    @staticmethod
+    def _process_label(processors: list) -> str:
+        """
+        Names the tracked step of a run of consecutive process steps after their processors.
+        """
+        return 'process -> ' + ', '.join(processor.__class__.__name__ for processor in processors)
+
+    def _apply_processors(self, processors: list, result):
+        from datarec.processing.chain import ProcessingChain
+        return ProcessingChain(processors).run(result)
+
     def _apply_transform(self, step: PipelineStep, func, result):
         print(f"Pipeline step {step.name}.")
         print(f"Applying {func}.")
         return func(**step.params).run(result)
 
+    def _apply_split(self, step: PipelineStep, func, result):
+        print(f"Pipeline step {step.name}.")
+        params = dict(step.params)
+        split_path = params.pop("split_path", None)
+        if split_path is not None:
+            # a split saved with SplitIndex.save replaces the splitter if it matches the dataset
+            from datarec.splitters.split_index import SplitIndex
+            try:
+                split_index = SplitIndex.load(split_path, result)
+            except (FileNotFoundError, ValueError) as exc:
+                warnings.warn(f"Saved split not used, running {step.operation} again: {exc}")
+            else:
+                saved = split_index.step_info or {'operation': None, 'params': {}}
+                saved_params = {k: v for k, v in saved['params'].items() if k != 'split_path'}
+                if saved['operation'] == step.operation and saved_params == params:
+                    print(f"Loading split from {split_path}.")
+                    return split_index
+                warnings.warn(f"The split saved in '{split_path}' was not made by {step.operation} with "
+                              f"params {params}, running {step.operation} again.")
+        print(f"Applying {func}.")
+        splitter = func(**params)
+        try:
+            # the splits are gathered only if a later step needs them (see SplitIndex)
+            return splitter.split_index(result)
+        except NotImplementedError:
+            return splitter.run(result)
+
     def _apply_export(
         self,
         step: PipelineStep,
@@ -186,6 +271,7 @@ class Pipeline:
         output_folder: Optional[str],
         frameworks: Dict[str, str],
         split_required: set,
+        split_streaming: set = frozenset(),
     ) -> None:
         print(f"Pipeline step {step.name}.")
         print(f"Exporting dataset for {step.operation}.")
@@ -206,6 +292,8 @@ class Pipeline:
             params["output_path"] = str(Path(output_folder) / filename)
         exporter = func(**params)
         function_name = frameworks[step.operation]
+        if _is_split_index(result):
+            result = _split_views(result) if step.operation in split_streaming else result.to_dict()
         if isinstance(result, dict):
             if step.operation in split_required:
                 train = result.get('train')
@@ -252,6 +340,8 @@ class Pipeline:
             if not filename:
                 raise ValueError("Write step requires 'filename' in params.")
             base_path = Path(output_folder) / filename
+        if _is_split_index(result):
+            result = _split_views(result)
         if isinstance(result, dict):
             split_param = params.pop("split", None)
             if split_param:
@@ -345,6 +435,33 @@ def _load_registry_dataset(dataset_name: str, version: str = "latest", **kwargs)
     return RegisteredDataset(dataset_name=dataset_name, version=version, **kwargs)
 
 
+def _is_split_index(result: Any) -> bool:
+    """
+    Check whether a step result is a SplitIndex.
+
+    Args:
+        result (Any): The result of a pipeline step.
+
+    Returns:
+        bool: True if the result is a SplitIndex.
+    """
+    from datarec.splitters.split_index import SplitIndex
+    return isinstance(result, SplitIndex)
+
+
+def _split_views(split_index) -> Dict[str, Any]:
+    """
+    Views of the non-empty splits of a SplitIndex, streamed by writers instead of being materialized.
+
+    Args:
+        split_index (SplitIndex): The result of a split step.
+
+    Returns:
+        Dict[str, SplitView]: The views keyed by split name.
+    """
+    return {name: split_index.view(name) for name in split_index}
+
+
 def _with_split_suffix(path: Path, split_name: str) -> Path:
     """
     Insert the split name before the file suffix.
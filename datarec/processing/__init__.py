@@ -1,5 +1,8 @@
 from .binarizer import Binarize
+from .chain import ProcessingChain
 from .cold import ColdFilter
 from .kcore import KCore, ItemKCore, UserKCore, IterativeKCore, NRoundsKCore, UserItemIterativeKCore, UserItemNRoundsKCore
-from .rating import FilterByRatingThreshold, FilterByUserMeanRating, FilterOutDuplicatedInteractions
+from .rating import (FilterByRatingThreshold, FilterByRelativeRating, FilterByUserMeanRating, FilterByUserMedianRating,
+                     FilterByItemMeanRating, FilterByUserTopKRating, FilterByUserPercentileRating,
+                     FilterOutDuplicatedInteractions)
 from .temporal import FilterByTime
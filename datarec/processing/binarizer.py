@@ -1,7 +1,10 @@
 from typing import Optional
 
+import numpy as np
+import pandas as pd
 from datarec import DataRec
 from datarec.processing.processor import Processor
+from datarec.processing.utils import filter_by_mask
 
 
 class Binarize(Processor):
@@ -15,7 +18,12 @@ class Binarize(Processor):
     `keep`/`drop_rating_col` are not provided, it behaves as keep='positive' and drop_rating_col=True.
     If `keep` or `drop_rating_col` are provided, they take precedence over `implicit`.
     """
-    
+
+    row_wise = True
+    rewrites_rows = True
+    reads = ('rating',)
+    local_to = ('user', 'item')
+
     def __init__(self, threshold: float, implicit: bool = False,
                  over_threshold: float = 1, under_threshold: float = 0,
                  keep: Optional[str] = None, drop_rating_col: Optional[bool] = None):
@@ -71,15 +79,44 @@ class Binarize(Processor):
             (DataRec): A new DataRec object with the processed dataset.
         """
 
-        dataset = datarec.data.copy()
-        column = datarec.rating_col
+        dataset = filter_by_mask(datarec.data, self.row_mask(datarec))
+        dataset = self.transform_rows(dataset, datarec)
 
-        positive = dataset[column] >= self._threshold
+        result = self.output(datarec, dataset,
+                             step_info={'operation': self.__class__.__name__, 'params': self.params})
+
+        return result
+
+    def row_mask(self, datarec: DataRec) -> np.ndarray:
+        """
+        Marks the interactions kept according to `keep`.
+
+        Args:
+            datarec (DataRec): The input dataset wrapped in a DataRec object.
+
+        Returns:
+            (np.ndarray): A boolean mask marking the interactions to keep.
+        """
+        positive = (datarec.data[datarec.rating_col] >= self._threshold).to_numpy()
 
         if self._keep == 'positive':
-            dataset = dataset[positive].copy()
+            return positive
         elif self._keep == 'negative':
-            dataset = dataset[~positive].copy()
+            return ~positive
+        return np.ones(len(positive), dtype=bool)
+
+    def transform_rows(self, dataset: pd.DataFrame, datarec: DataRec) -> pd.DataFrame:
+        """
+        Drops or binarizes the rating column of the kept interactions, in place.
+
+        Args:
+            dataset (pd.DataFrame): The interactions kept by `row_mask`.
+            datarec (DataRec): The input dataset wrapped in a DataRec object.
+
+        Returns:
+            (pd.DataFrame): The processed interactions.
+        """
+        column = datarec.rating_col
 
         if self._drop_rating_col:
             dataset.drop(columns=[column], inplace=True)
@@ -88,10 +125,7 @@ class Binarize(Processor):
             dataset[column] = self._over_threshold
             dataset.loc[~positive, column] = self._under_threshold
 
-        result = self.output(datarec, dataset,
-                             step_info={'operation': self.__class__.__name__, 'params': self.params})
-
-        return result
+        return dataset
 
     @property
     def binary_threshold(self) -> float:
@@ -0,0 +1,116 @@
+from contextlib import nullcontext
+from typing import List
+import numpy as np
+from datarec import DataRec
+from datarec.pipeline.memory import active_tracker
+from datarec.processing.processor import Processor
+from datarec.processing.utils import filter_by_mask
+
+
+class ProcessingChain:
+    """
+    Applies a sequence of processors, fusing consecutive row-wise processors into a single mask.
+
+    Row-wise processors (e.g., `FilterByRatingThreshold`, `FilterByTime`, `Binarize`) are not
+    applied one by one: their masks are combined and the filtered dataset is materialized only
+    once, when a group-dependent processor (e.g., `UserKCore`) is reached, when a processor
+    rewrites the rows, or at the end of the chain. The result is the same as running the
+    processors in sequence, and every processor is still recorded as its own pipeline step.
+
+    With an active `MemoryTracker`, a block of fused processors is recorded as one step named
+    after its processors (e.g., 'FilterByRatingThreshold + Binarize'), since they run together;
+    the other processors are recorded by `Processor.run`.
+    """
+
+    def __init__(self, steps: list):
+        """
+        Initializes the ProcessingChain object.
+
+        Args:
+            steps (list): The processors to be applied, in order.
+
+        Raises:
+            TypeError: If a step does not provide a `run` method.
+        """
+        for step in steps:
+            if not callable(getattr(step, 'run', None)):
+                raise TypeError(f'Step {step!r} is not a processor.')
+
+        self.steps = list(steps)
+
+    def run(self, datarec: DataRec) -> DataRec:
+        """
+        Applies the processors of the chain to a DataRec object.
+
+        Args:
+            datarec (DataRec): The input dataset wrapped in a DataRec object.
+
+        Returns:
+            (DataRec): A new DataRec object with the processed dataset and one pipeline step
+                per processor.
+        """
+        for block in self._blocks():
+            if getattr(block[0], 'row_wise', False):
+                datarec = self._run_fused(datarec, block)
+            else:
+                datarec = block[0].run(datarec)
+        return datarec
+
+    def _blocks(self) -> List[List[Processor]]:
+        """
+        Groups the processors into blocks of fused row-wise processors and single other processors.
+
+        A block of row-wise processors ends after a processor that rewrites the rows.
+        """
+        blocks, pending = [], []
+        for step in self.steps:
+            if getattr(step, 'row_wise', False):
+                pending.append(step)
+                if step.rewrites_rows:
+                    blocks.append(pending)
+                    pending = []
+            else:
+                if pending:
+                    blocks.append(pending)
+                    pending = []
+                blocks.append([step])
+        if pending:
+            blocks.append(pending)
+        return blocks
+
+    def _run_fused(self, datarec: DataRec, steps: List[Processor]) -> DataRec:
+        """
+        Applies a block of row-wise processors with a single combined mask.
+        """
+        tracker = active_tracker()
+        name = ' + '.join(step.__class__.__name__ for step in steps)
+        with tracker.track(name, datarec) if tracker is not None else nullcontext():
+            mask = steps[0].row_mask(datarec)
+            for step in steps[1:]:
+                mask = mask & step.row_mask(datarec)
+            return self._materialize(datarec, mask, steps)
+
+    @staticmethod
+    def _materialize(datarec: DataRec, mask: np.ndarray, steps: List[Processor]) -> DataRec:
+        """
+        Builds the DataRec resulting from a block of fused row-wise processors.
+
+        Args:
+            datarec (DataRec): The DataRec object the block is applied to.
+            mask (np.ndarray): The combined mask of the block.
+            steps (list): The processors of the block. Only the last one may rewrite rows.
+
+        Returns:
+            (DataRec): A new DataRec object with the processed dataset and updated pipeline.
+        """
+        result = filter_by_mask(datarec.data, mask)
+        if steps[-1].rewrites_rows:
+            result = steps[-1].transform_rows(result, datarec)
+
+        first, rest = steps[0], steps[1:]
+        new_datarec = Processor.output(datarec, result,
+                                       {'operation': first.__class__.__name__, 'params': first.params})
+        for step in rest:
+            new_datarec.pipeline.add_step(name='process', operation=step.__class__.__name__, params=step.params)
+
+        return new_datarec
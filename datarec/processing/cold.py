@@ -1,5 +1,6 @@
 from datarec import DataRec, RawData
 from datarec.processing.processor import Processor
+from datarec.processing.utils import group_size_mask, filter_by_mask
 
 
 class ColdFilter(Processor):
@@ -8,6 +9,8 @@ class ColdFilter(Processor):
     in the original DataRec dataset.
     """
 
+    reads = ('user', 'item')
+
     def __init__(self, interactions: int, mode: str = "user"):
         """
         Initializes the ColdFilter object.
@@ -31,6 +34,13 @@ class ColdFilter(Processor):
         self.interactions = interactions
         self.mode = mode
 
+    @property
+    def local_to(self) -> tuple:
+        """
+        The entity whose interactions determine the outcome, i.e. the filtering mode.
+        """
+        return (self.mode,)
+
     def run(self, datarec: DataRec) -> DataRec:
         """
         Filters the dataset to keep only cold users or cold items with at most `self.interactions` interactions.
@@ -42,10 +52,10 @@ class ColdFilter(Processor):
             (DataRec): A new DataRec object containing only the filtered users or items.
         """
 
-        dataset = datarec.data.copy()
+        dataset = datarec.data
         group_col = datarec.user_col if self.mode == "user" else datarec.item_col
-        groups = dataset.groupby(group_col)
-        result = groups.filter(lambda x: len(x) <= self.interactions).reset_index(drop=True)
+        mask = group_size_mask(dataset, group_col, max_size=self.interactions)
+        result = filter_by_mask(dataset, mask).reset_index(drop=True)
 
         return self.output(datarec, result, {'operation': self.__class__.__name__, 'params': self.params})
 
@@ -1,7 +1,116 @@
-from typing import Union
+from typing import Optional, Union
+import numpy as np
 import pandas as pd
 from datarec import DataRec
 from datarec.processing.processor import Processor
+from datarec.processing.utils import group_size_mask, filter_by_mask
+
+
+def _csr_rows(indptr: np.ndarray, order: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """
+    Gathers the row positions of a set of nodes from a CSR adjacency.
+
+    Args:
+        indptr (np.ndarray): Offsets of each node inside `order`.
+        order (np.ndarray): Row positions sorted by node code.
+        nodes (np.ndarray): Codes of the nodes whose rows are requested.
+
+    Returns:
+        (np.ndarray): The concatenated row positions of the requested nodes.
+    """
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=order.dtype)
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return order[shifts + np.arange(total)]
+
+
+def kcore_mask(dataset: pd.DataFrame, cores: list, rounds: Optional[int] = None) -> np.ndarray:
+    """
+    Computes the rows surviving a k-core filter over several columns by degree peeling.
+
+    Every column is factorized once and turned into a CSR adjacency (row positions grouped
+    by node). Nodes whose degree falls below their core are then peeled in sweeps that follow
+    the column order of `cores`, and only the nodes whose degree changed are re-examined.
+    Each row is removed at most once, so the whole job costs O(interactions).
+
+    The sweeps reproduce the semantics of applying `KCore` to each column in turn: with
+    `rounds=None` they run until a full sweep removes nothing, otherwise exactly `rounds`
+    sweeps are performed. Rows with a missing value in any column are dropped, as
+    `groupby` does.
+
+    Args:
+        dataset (pd.DataFrame): The dataset to be filtered.
+        cores (list): A list of `(column, core)` pairs, in the order they are applied.
+        rounds (int, optional): The number of sweeps. If None, peels until convergence.
+
+    Returns:
+        (np.ndarray): A boolean mask marking the rows to keep.
+
+    Raises:
+        ValueError: If a column is not in the dataset.
+    """
+
+    for column, _ in cores:
+        if column not in dataset.columns:
+            raise ValueError(f'Column "{column}" not in the dataset.')
+
+    n_rows = len(dataset)
+    alive = np.ones(n_rows, dtype=bool)
+
+    codes, degrees, indptrs, orders, node_alive, missing, pending = [], [], [], [], [], [], []
+    for column, _ in cores:
+        col_codes, uniques = pd.factorize(dataset[column], use_na_sentinel=False)
+        n_nodes = len(uniques)
+        degree = np.bincount(col_codes, minlength=n_nodes)
+        codes.append(col_codes)
+        degrees.append(degree)
+        indptrs.append(np.concatenate(([0], np.cumsum(degree))))
+        orders.append(np.argsort(col_codes, kind='stable'))
+        node_alive.append(np.ones(n_nodes, dtype=bool))
+        missing.append(np.asarray(pd.isna(uniques), dtype=bool))
+        pending.append(np.arange(n_nodes))
+
+    empty = np.empty(0, dtype=np.intp)
+    done = 0
+    while rounds is None or done < rounds:
+        removed = 0
+        for c, (_, core) in enumerate(cores):
+            candidates = pending[c]
+            pending[c] = empty
+            if candidates.size == 0:
+                continue
+
+            degree = degrees[c]
+            candidates = candidates[node_alive[c][candidates]
+                                    & ((degree[candidates] < core) | missing[c][candidates])]
+            if candidates.size == 0:
+                continue
+
+            node_alive[c][candidates] = False
+            degree[candidates] = 0
+
+            rows = _csr_rows(indptrs[c], orders[c], candidates)
+            rows = rows[alive[rows]]
+            if rows.size == 0:
+                continue
+            alive[rows] = False
+            removed += rows.size
+
+            for d in range(len(cores)):
+                if d == c:
+                    continue
+                touched, counts = np.unique(codes[d][rows], return_counts=True)
+                degrees[d][touched] -= counts
+                pending[d] = np.union1d(pending[d], touched)
+
+        done += 1
+        if removed == 0:
+            break
+
+    return alive
 
 
 class KCore:
@@ -44,13 +153,8 @@ class KCore:
         
         """
 
-        if self._column not in dataset.columns:
-            raise ValueError(f'Column "{self._column}" not in the dataset.')
-
-        dataset = dataset.copy()
-        groups = dataset.groupby([self._column])
-        dataset = groups.filter(lambda x: len(x) >= self._core)
-        return dataset
+        mask = group_size_mask(dataset, self._column, min_size=self._core)
+        return filter_by_mask(dataset, mask)
 
 
 class UserKCore(Processor):
@@ -59,6 +163,10 @@ class UserKCore(Processor):
     
     This class applies a KCore filter on the user column of the dataset.
     """
+
+    reads = ('user', 'item')
+    local_to = ('user',)
+
     def __init__(self, core: int):
         """
         Initializes the UserKCore object.
@@ -101,6 +209,10 @@ class ItemKCore(Processor):
 
     This class applies a KCore filter on the item column of the dataset.
     """
+
+    reads = ('user', 'item')
+    local_to = ('item',)
+
     def __init__(self, core: int):
         """
         Initializes the ItemKCore object.
@@ -176,20 +288,8 @@ class IterativeKCore:
             (pd.DataFrame): The filtered dataset after all iterations.
         """
 
-        data = dataset.copy()
-
-        filters = {c: KCore(column=c, core=k) for c, k in self._cores}
-        checks = [False for _ in self._columns]
-        prev_len = len(data)
-
-        while not all(checks):
-            checks = []
-            for c, f in filters.items():
-                data = f.run(data)
-                checks.append((prev_len - len(data)) == 0)
-                prev_len = len(data)
-
-        return data
+        mask = kcore_mask(dataset, self._cores)
+        return filter_by_mask(dataset, mask)
 
 
 class UserItemIterativeKCore(Processor):
@@ -199,6 +299,9 @@ class UserItemIterativeKCore(Processor):
 
     This class applies the IterativeKCore filter to both the user and item columns of the dataset.
     """
+
+    reads = ('user', 'item')
+
     def __init__(self, user_core: int = None, item_core: int = None,
                  cores: Union[int, list, None] = None):
         """
@@ -303,19 +406,8 @@ class NRoundsKCore:
             (pd.DataFrame): The dataset after filtering over the specified number of rounds.
         """
 
-        data = dataset.copy()
-
-        filters = {c: KCore(column=c, core=k) for c, k in self._cores}
-        checks = [False for _ in self._columns]
-        prev_len = len(data)
-
-        for _ in range(self._rounds) or all(checks):
-            checks = []
-            for c, f in filters.items():
-                data = f.run(data)
-                checks.append((prev_len - len(data)) == 0)
-                prev_len = len(data)
-        return data
+        mask = kcore_mask(dataset, self._cores, rounds=self._rounds)
+        return filter_by_mask(dataset, mask)
 
 
 class UserItemNRoundsKCore(Processor):
@@ -325,7 +417,9 @@ class UserItemNRoundsKCore(Processor):
 
     This class applies the NRoundsKCore filter to both the user and item columns of the dataset.
     """
-    
+
+    reads = ('user', 'item')
+
     def __init__(self, rounds: int, user_core: int = None, item_core: int = None,
                  cores: Union[int, list, None] = None):
         """
@@ -1,8 +1,25 @@
 import inspect
+from functools import wraps
 
+import numpy as np
 import pandas as pd
 from datarec import DataRec
 from datarec.io import RawData
+from datarec.pipeline.memory import active_tracker
+
+
+def _tracked_run(run):
+    """
+    Wraps a `run` method so that it is recorded by the active `MemoryTracker`, if any.
+    """
+    @wraps(run)
+    def wrapper(self, datarec, *args, **kwargs):
+        tracker = active_tracker()
+        if tracker is None:
+            return run(self, datarec, *args, **kwargs)
+        with tracker.track(self.__class__.__name__, datarec):
+            return run(self, datarec, *args, **kwargs)
+    return wrapper
 
 
 class Processor:
@@ -12,14 +29,66 @@ class Processor:
 
     This class provides functionality to build a new `DataRec` from 
     transformation results while updating the processing pipeline accordingly.
+
+    Processors whose outcome for a row does not depend on the other rows can set
+    `row_wise = True` and implement `row_mask` (and `transform_rows` together with
+    `rewrites_rows = True` if they also rewrite values or columns). This allows a
+    `ProcessingChain` to fuse them into a single mask.
+
+    Processors can also declare in `reads` which standard columns ('user', 'item', 'rating',
+    'timestamp') they read, so that a `LazyDataRec` can drop the other ones early. None means
+    that any column may be read. Processors whose outcome for the interactions of a user (item)
+    only depends on the interactions of that user (item) list 'user' ('item') in `local_to`, so
+    that they can run on the shards of a `PartitionedDataRec`.
+
+    The `run` method of every subclass is recorded by the active `MemoryTracker`, if any.
     """
-    
+
+    row_wise = False
+    rewrites_rows = False
+    reads = None
+    local_to = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'run' in cls.__dict__:
+            cls.run = _tracked_run(cls.run)
+
+    def row_mask(self, datarec: DataRec) -> np.ndarray:
+        """
+        Computes the rows kept by a row-wise processor.
+
+        Args:
+            datarec (DataRec): The `DataRec` object the processor is applied to.
+
+        Returns:
+            (np.ndarray): A boolean mask aligned with the rows of `datarec.data`.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} is not a row-wise processor.')
+
+    def transform_rows(self, dataset: pd.DataFrame, datarec: DataRec) -> pd.DataFrame:
+        """
+        Rewrites the rows kept by a row-wise processor. By default rows are left unchanged.
+
+        Args:
+            dataset (pd.DataFrame): The rows kept by `row_mask`. The frame is owned by the caller
+                and can be modified in place.
+            datarec (DataRec): The `DataRec` object the processor is applied to.
+
+        Returns:
+            (pd.DataFrame): The rewritten rows.
+        """
+        return dataset
+
     @staticmethod
     def output(datarec: DataRec, result: pd.DataFrame, step_info: dict) -> DataRec:
         """
         Create a new `DataRec` object from a transformation result and update 
         the processing pipeline with a new step.
 
+        The result is wrapped without being copied, and the encoders are shared with the
+        original `DataRec` until one of them is rebuilt or reset.
+
         Args:
             datarec (DataRec): The original `DataRec` object from which the 
                 transformation is derived.
@@ -38,10 +107,12 @@ class Processor:
                     user=datarec.user_col,
                     item=datarec.item_col,
                     rating=datarec.rating_col if datarec.rating_col in result.columns else None,
-                    timestamp=datarec.timestamp_col),
+                    timestamp=datarec.timestamp_col if datarec.timestamp_col in result.columns else None),
             dataset_name=datarec.dataset_name,
             version_name=datarec.version_name,
         )
         new_datarec.pipeline = pipeline
+        new_datarec.user_id_encoder = datarec.user_id_encoder.copy()
+        new_datarec.item_id_encoder = datarec.item_id_encoder.copy()
 
         return new_datarec
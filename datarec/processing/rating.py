@@ -1,5 +1,11 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
 from datarec import DataRec
 from datarec.processing.processor import Processor
+from datarec.processing.utils import (GROUP_STATISTICS, group_relative_mask, filter_by_mask, pair_keys,
+                                     group_extreme_mask)
 
 
 class FilterByRatingThreshold(Processor):
@@ -7,6 +13,10 @@ class FilterByRatingThreshold(Processor):
     Filters the dataset by removing interactions with a rating below a given threshold.
     """
 
+    row_wise = True
+    reads = ('rating',)
+    local_to = ('user', 'item')
+
     def __init__(self, rating_threshold: float):
         """
         Initializes the FilterByRatingThreshold object.
@@ -37,23 +47,84 @@ class FilterByRatingThreshold(Processor):
             (DataRec): A new DataRec object with the processed dataset.
         """
 
-        dataset = datarec.data
-        filtered_data = dataset[dataset[datarec.rating_col] >= self.rating_threshold]
+        filtered_data = filter_by_mask(datarec.data, self.row_mask(datarec))
 
         return self.output(datarec, filtered_data, {'operation': self.__class__.__name__, 'params': self.params})
 
 
-class FilterByUserMeanRating(Processor):
-    """
-    Filters the dataset by removing interactions with a rating below the user's average rating.
+    def row_mask(self, datarec: DataRec) -> np.ndarray:
+        """
+        Marks the interactions with a rating greater than or equal to the threshold.
 
-    This filter calculates the average rating given by each user and removes
-    interactions where the rating is below that average.
+        Args:
+            datarec (DataRec): The input dataset wrapped in a DataRec object.
+
+        Returns:
+            (np.ndarray): A boolean mask marking the interactions to keep.
+        """
+        return (datarec.data[datarec.rating_col] >= self.rating_threshold).to_numpy()
+
+
+class FilterByRelativeRating(Processor):
+    """
+    Filters the dataset by comparing each rating with the ratings of the same user or item.
+
+    All the supported criteria share a single vectorized grouped-statistics pass:
+        - 'mean': removes interactions with a rating below the group's average rating.
+        - 'median': removes interactions with a rating below the group's median rating.
+        - 'percentile': removes interactions with a rating below the given percentile of the group.
+        - 'top_k': keeps only the `k` highest rated interactions of each group (ties are broken
+          by the order of the interactions in the dataset).
     """
 
+    MODES = ['user', 'item']
+    STATISTICS = GROUP_STATISTICS
+
+    def __init__(self, on: str = 'user', statistic: str = 'mean',
+                 percentile: Optional[float] = None, k: Optional[int] = None):
+        """
+        Initializes the FilterByRelativeRating object.
+
+        Args:
+            on (str): Grouping mode, either "user" or "item".
+            statistic (str): The criterion used to compare ratings within a group.
+                Must be one of ['mean', 'median', 'percentile', 'top_k'].
+            percentile (float, optional): The percentile (0-100) required by the 'percentile' statistic.
+            k (int, optional): The number of interactions kept per group by the 'top_k' statistic.
+
+        Raises:
+            ValueError: If `on` or `statistic` are not among the supported options.
+            ValueError: If `percentile` is missing or outside [0, 100] for the 'percentile' statistic.
+            ValueError: If `k` is missing or not a positive integer for the 'top_k' statistic.
+        """
+        if on not in self.MODES:
+            raise ValueError(f"Invalid mode '{on}'. Choose from {self.MODES}.")
+        if statistic not in self.STATISTICS:
+            raise ValueError(f"Invalid statistic '{statistic}'. Choose from {self.STATISTICS}.")
+        if statistic == 'percentile':
+            if not isinstance(percentile, (int, float)) or not 0 <= percentile <= 100:
+                raise ValueError("percentile must be a number between 0 and 100.")
+        if statistic == 'top_k':
+            if not isinstance(k, int) or k < 1:
+                raise ValueError("k must be a positive integer.")
+
+        self.params = {k: v for k, v in locals().items() if k != 'self'}
+
+        self.on = on
+        self.statistic = statistic
+        self.percentile = percentile
+        self.k = k
+
+    @property
+    def local_to(self) -> tuple:
+        """
+        The entity whose ratings are compared, i.e. the grouping mode.
+        """
+        return (self.on,)
+
     def run(self, datarec: DataRec) -> DataRec:
         """
-        Filters interactions with a rating below the user's mean rating.
+        Filters interactions according to the rating statistic of their user or item.
 
         Args:
             datarec (DataRec): The input dataset wrapped in a DataRec object.
@@ -63,23 +134,110 @@ class FilterByUserMeanRating(Processor):
         """
 
         dataset = datarec.data
-        user_means = dataset.groupby(datarec.user_col)[datarec.rating_col].mean()
+        group_col = datarec.user_col if self.on == 'user' else datarec.item_col
+        mask = group_relative_mask(dataset, group_col, datarec.rating_col, statistic=self.statistic,
+                                   percentile=self.percentile, k=self.k)
+        filtered_data = filter_by_mask(dataset, mask)
 
-        filtered_data = dataset[
-            dataset.apply(lambda row: row[datarec.rating_col] >= user_means[row[datarec.user_col]], axis=1)
-        ]
+        return self.output(datarec, filtered_data, {'operation': self.__class__.__name__, 'params': self.params})
 
-        return self.output(datarec, filtered_data, {'operation': self.__class__.__name__, 'params': ''})
+
+class FilterByUserMeanRating(FilterByRelativeRating):
+    """
+    Filters the dataset by removing interactions with a rating below the user's average rating.
+
+    This filter calculates the average rating given by each user and removes
+    interactions where the rating is below that average.
+    """
+
+    def __init__(self):
+        """
+        Initializes the FilterByUserMeanRating object.
+        """
+        super().__init__(on='user', statistic='mean')
+        self.params = {}
+
+
+class FilterByUserMedianRating(FilterByRelativeRating):
+    """
+    Filters the dataset by removing interactions with a rating below the user's median rating.
+    """
+
+    def __init__(self):
+        """
+        Initializes the FilterByUserMedianRating object.
+        """
+        super().__init__(on='user', statistic='median')
+        self.params = {}
+
+
+class FilterByItemMeanRating(FilterByRelativeRating):
+    """
+    Filters the dataset by removing interactions with a rating below the item's average rating.
+    """
+
+    def __init__(self):
+        """
+        Initializes the FilterByItemMeanRating object.
+        """
+        super().__init__(on='item', statistic='mean')
+        self.params = {}
+
+
+class FilterByUserTopKRating(FilterByRelativeRating):
+    """
+    Filters the dataset by keeping only the `k` highest rated interactions of each user.
+    """
+
+    def __init__(self, k: int):
+        """
+        Initializes the FilterByUserTopKRating object.
+
+        Args:
+            k (int): The number of interactions kept per user.
+
+        Raises:
+            ValueError: If `k` is not a positive integer.
+        """
+        super().__init__(on='user', statistic='top_k', k=k)
+        self.params = {'k': k}
+
+
+class FilterByUserPercentileRating(FilterByRelativeRating):
+    """
+    Filters the dataset by removing interactions with a rating below a percentile of the user's ratings.
+    """
+
+    def __init__(self, percentile: float):
+        """
+        Initializes the FilterByUserPercentileRating object.
+
+        Args:
+            percentile (float): The percentile (0-100) of the user's ratings an interaction must reach.
+
+        Raises:
+            ValueError: If `percentile` is not a number between 0 and 100.
+        """
+        super().__init__(on='user', statistic='percentile', percentile=percentile)
+        self.params = {'percentile': percentile}
 
 
 class FilterOutDuplicatedInteractions(Processor):
     """
     Filters a dataset by removing duplicated (user, item) interactions based on a specified strategy.
+
+    Each (user, item) pair is packed into a single int64 key, and the interaction to keep is
+    resolved per key without sorting or shuffling the whole dataset:
+        - 'first', 'last': the first or last occurrence in the dataset.
+        - 'earliest', 'latest': the occurrence with the lowest or highest timestamp. Ties are
+          resolved by keeping the first ('earliest') or last ('latest') occurrence.
+        - 'random': the occurrence ranked first in a seeded shuffle of the dataset, the same one
+          kept by shuffling with `DataFrame.sample(frac=1, random_state=seed)`.
     """
 
     STRATEGIES = ['first', 'last', 'earliest', 'latest', 'random']
 
-    def __init__(self, keep='first', random_seed=42):
+    def __init__(self, keep='first', random_seed=42, sort=True):
         """
         Initializes the FilterOutDuplicatedInteractions object.
         
@@ -87,6 +245,8 @@ class FilterOutDuplicatedInteractions(Processor):
             keep (str): Strategy to determine which interaction to keep when duplicates are found.
                 Must be one of ['first', 'last', 'earliest', 'latest', 'random'].
             random_seed (int): Random seed used for reproducibility when using the 'random' strategy.
+            sort (bool): Whether to sort the result by (user, item). If False, the original
+                order of the interactions is preserved.
 
         Raises:
             ValueError: If the provided strategy (`keep`) is not among the supported options.
@@ -99,6 +259,7 @@ class FilterOutDuplicatedInteractions(Processor):
 
         self.keep = keep
         self.random_seed = random_seed
+        self.sort = sort
 
     def run(self, datarec: DataRec, verbose=True) -> DataRec:
         """
@@ -121,29 +282,39 @@ class FilterOutDuplicatedInteractions(Processor):
             print(f'Filtering DataRec: {datarec.dataset_name}')
 
         dataset = datarec.data
-        subset = [datarec.user_col, datarec.item_col]
-
-        # Random strategy
-        if self.keep == 'random':
-            dataset = dataset.sample(frac=1, random_state=self.random_seed).drop_duplicates(subset=subset, keep='first')
+        keys = pair_keys(dataset, datarec.user_col, datarec.item_col)
+        positions = np.arange(len(dataset), dtype=np.int64)
 
         # Ordering-based strategies
-        elif self.keep in ['first', 'last']:
-            dataset = dataset.drop_duplicates(subset=subset, keep=self.keep)
+        if self.keep in ['first', 'last']:
+            mask = ~pd.Series(keys).duplicated(keep=self.keep).to_numpy()
+
+        # Random strategy
+        elif self.keep == 'random':
+            # the rank of every row in the shuffle of `DataFrame.sample(frac=1, random_state=seed)`,
+            # so the same rows are kept as when the dataset was shuffled and deduplicated
+            shuffled = np.random.RandomState(self.random_seed).permutation(len(dataset))
+            random_keys = np.empty(len(dataset), dtype=np.int64)
+            random_keys[shuffled] = positions
+            mask = group_extreme_mask(keys, random_keys, how='min')
 
         # Temporal strategies
         elif self.keep in ['earliest', 'latest']:
             if datarec.timestamp_col is None:
                 raise ValueError(f"Date column is required for '{self.keep}' strategy.")
-            dataset = dataset.sort_values(by=datarec.timestamp_col, ascending=True)
+            # timestamps are ranked on their unique values only; missing ones are never preferred
+            ranks, uniques = pd.factorize(dataset[datarec.timestamp_col], sort=True)
+            ranks = ranks.astype(np.int64)
             if self.keep == 'earliest':
-                dataset = dataset.drop_duplicates(subset=subset, keep='first')
+                ranks[ranks < 0] = len(uniques)
+                mask = group_extreme_mask(keys, ranks * len(dataset) + positions, how='min')
             else:
-                dataset = dataset.drop_duplicates(subset=subset, keep='last')
+                mask = group_extreme_mask(keys, ranks * len(dataset) + positions, how='max')
         else:
             raise ValueError(f"Invalid strategy '{self.keep}'. Choose from {self.STRATEGIES}.")
 
-        dataset = dataset.sort_values(by=[datarec.user_col, datarec.item_col], ascending=True)
+        dataset = filter_by_mask(dataset, mask)
+        if self.sort:
+            dataset = dataset.sort_values(by=[datarec.user_col, datarec.item_col], ascending=True)
 
         return self.output(datarec, dataset, {'operation': self.__class__.__name__, 'params': self.params})
-
@@ -1,5 +1,7 @@
+import numpy as np
 from datarec import DataRec
 from datarec.processing.processor import Processor
+from datarec.processing.utils import filter_by_mask
 
 
 class FilterByTime(Processor):
@@ -10,6 +12,10 @@ class FilterByTime(Processor):
     records before or after the specified time.
     """
 
+    row_wise = True
+    reads = ('timestamp',)
+    local_to = ('user', 'item')
+
     def __init__(self, time_threshold: float = 0, drop: str = 'after'):
         """  
         Initializes the FilterByTime object.
@@ -50,14 +56,29 @@ class FilterByTime(Processor):
             TypeError: If the DataRec does not contain temporal information.
         """
 
+        data = filter_by_mask(datarec.data, self.row_mask(datarec))
+
+        return self.output(datarec, data, {'operation': self.__class__.__name__, 'params': self.params})
+
+    def row_mask(self, datarec: DataRec) -> np.ndarray:
+        """
+        Marks the interactions kept by the time threshold and drop condition.
+
+        Args:
+            datarec (DataRec): The input dataset wrapped in a DataRec object.
+
+        Returns:
+            (np.ndarray): A boolean mask marking the interactions to keep.
+
+        Raises:
+            TypeError: If the DataRec does not contain temporal information.
+        """
+
         if datarec.timestamp_col is None:
             raise TypeError('This DataRec does not contain temporal information')
 
-        dataset = datarec.data
+        timestamps = datarec.data[datarec.timestamp_col]
 
         if self.drop == 'before':
-            data = dataset[dataset[datarec.timestamp_col] < self.time_threshold]
-        else:
-            data = dataset[dataset[datarec.timestamp_col] >= self.time_threshold]
-
-        return self.output(datarec, data, {'operation': self.__class__.__name__, 'params': self.params})
+            return (timestamps < self.time_threshold).to_numpy()
+        return (timestamps >= self.time_threshold).to_numpy()
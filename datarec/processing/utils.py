@@ -0,0 +1,183 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+def group_sizes(dataset: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Computes, for each row, the size of the group it belongs to.
+
+    The column is factorized once and the group sizes are counted with `np.bincount`
+    over the resulting codes, so no Python call is made per group. Rows with a missing
+    value in `column` get a size of 0, mirroring `groupby`, which drops them.
+
+    Args:
+        dataset (pd.DataFrame): The dataset to be inspected.
+        column (str): The column name used to group the data (e.g., user or item).
+
+    Returns:
+        (np.ndarray): An integer array with the group size of every row.
+
+    Raises:
+        ValueError: If `column` is not in the dataset.
+    """
+
+    if column not in dataset.columns:
+        raise ValueError(f'Column "{column}" not in the dataset.')
+
+    codes, uniques = pd.factorize(dataset[column])
+    valid = codes >= 0
+    counts = np.bincount(codes[valid], minlength=len(uniques))
+    sizes = np.zeros(len(codes), dtype=np.int64)
+    sizes[valid] = counts[codes[valid]]
+    return sizes
+
+
+def group_size_mask(dataset: pd.DataFrame, column: str,
+                    min_size: Optional[int] = None, max_size: Optional[int] = None) -> np.ndarray:
+    """
+    Builds a boolean mask keeping the rows whose group size lies within the given bounds.
+
+    This is the vectorized equivalent of
+    `dataset.groupby(column).filter(lambda x: min_size <= len(x) <= max_size)`.
+    Rows with a missing value in `column` are never kept.
+
+    Args:
+        dataset (pd.DataFrame): The dataset to be filtered.
+        column (str): The column name used to group the data (e.g., user or item).
+        min_size (int, optional): The minimum group size to be kept. If None, no lower bound is applied.
+        max_size (int, optional): The maximum group size to be kept. If None, no upper bound is applied.
+
+    Returns:
+        (np.ndarray): A boolean mask marking the rows to keep.
+
+    Raises:
+        ValueError: If `column` is not in the dataset.
+    """
+
+    sizes = group_sizes(dataset, column)
+    mask = sizes > 0
+    if min_size is not None:
+        mask &= sizes >= min_size
+    if max_size is not None:
+        mask &= sizes <= max_size
+    return mask
+
+
+def filter_by_mask(dataset: pd.DataFrame, mask: np.ndarray) -> pd.DataFrame:
+    """
+    Applies a boolean row mask to a dataset.
+
+    The dataset is never copied upfront: the selected rows are taken into a new frame sized to
+    the output, so the input is left untouched and memory grows with the output only. The
+    result is independent from the input and can be modified in place.
+
+    Args:
+        dataset (pd.DataFrame): The dataset to be filtered.
+        mask (np.ndarray): A boolean mask aligned with the rows of `dataset`.
+
+    Returns:
+        (pd.DataFrame): A new dataframe holding the selected rows, with the original index.
+    """
+    return dataset.take(np.flatnonzero(mask))
+
+
+GROUP_STATISTICS = ['mean', 'median', 'percentile', 'top_k']
+
+
+def group_relative_mask(dataset: pd.DataFrame, group_col: str, value_col: str, statistic: str = 'mean',
+                        percentile: Optional[float] = None, k: Optional[int] = None) -> np.ndarray:
+    """
+    Builds a boolean mask keeping the rows whose value is high relative to the rest of their group.
+
+    The dataset is grouped once and the per-row reference is obtained with a vectorized
+    `groupby` transformation:
+        - 'mean', 'median': keeps rows whose value is at least the group mean/median.
+        - 'percentile': keeps rows whose value is at least the given percentile of the group.
+        - 'top_k': keeps the `k` highest values of each group. Ties are broken by row order.
+    Rows with a missing group key or value are never kept.
+
+    Args:
+        dataset (pd.DataFrame): The dataset to be filtered.
+        group_col (str): The column name used to group the data (e.g., user or item).
+        value_col (str): The column holding the compared values (e.g., rating).
+        statistic (str): One of 'mean', 'median', 'percentile' or 'top_k'.
+        percentile (float, optional): The percentile (0-100) used by the 'percentile' statistic.
+        k (int, optional): The number of rows kept per group by the 'top_k' statistic.
+
+    Returns:
+        (np.ndarray): A boolean mask marking the rows to keep.
+
+    Raises:
+        ValueError: If a column is not in the dataset or `statistic` is not supported.
+    """
+
+    for column in (group_col, value_col):
+        if column not in dataset.columns:
+            raise ValueError(f'Column "{column}" not in the dataset.')
+
+    values = dataset[value_col]
+    grouped = dataset.groupby(group_col, sort=False, observed=True)[value_col]
+
+    if statistic in ('mean', 'median'):
+        mask = values >= grouped.transform(statistic)
+    elif statistic == 'percentile':
+        mask = values >= grouped.transform('quantile', percentile / 100)
+    elif statistic == 'top_k':
+        mask = grouped.rank(method='first', ascending=False) <= k
+    else:
+        raise ValueError(f"Invalid statistic '{statistic}'. Choose from {GROUP_STATISTICS}.")
+
+    return mask.to_numpy(dtype=bool, na_value=False)
+
+
+def pair_keys(dataset: pd.DataFrame, first_col: str, second_col: str) -> np.ndarray:
+    """
+    Packs the (first, second) value pairs of two columns into a single int64 key per row.
+
+    Both columns are factorized with a hash table and their codes are combined as
+    `first_code * n_second + second_code`, so equal pairs always share the same key.
+    Missing values are treated as a regular value, as `drop_duplicates` does.
+
+    Args:
+        dataset (pd.DataFrame): The dataset to be inspected.
+        first_col (str): The first column of the pair (e.g., user).
+        second_col (str): The second column of the pair (e.g., item).
+
+    Returns:
+        (np.ndarray): An int64 array with the pair key of every row.
+
+    Raises:
+        ValueError: If a column is not in the dataset.
+    """
+
+    for column in (first_col, second_col):
+        if column not in dataset.columns:
+            raise ValueError(f'Column "{column}" not in the dataset.')
+
+    first_codes, _ = pd.factorize(dataset[first_col], use_na_sentinel=False)
+    second_codes, second_uniques = pd.factorize(dataset[second_col], use_na_sentinel=False)
+    return first_codes.astype(np.int64) * max(len(second_uniques), 1) + second_codes
+
+
+def group_extreme_mask(keys: np.ndarray, score: np.ndarray, how: str = 'min') -> np.ndarray:
+    """
+    Builds a boolean mask keeping, for every group, the row with the lowest or highest score.
+
+    Scores are expected to be unique across rows (e.g., they embed the row position), so
+    exactly one row per group is kept. The extreme is found with a grouped `transform`,
+    without sorting the dataset.
+
+    Args:
+        keys (np.ndarray): The group key of every row.
+        score (np.ndarray): The score of every row.
+        how (str): 'min' to keep the lowest score, 'max' to keep the highest.
+
+    Returns:
+        (np.ndarray): A boolean mask marking the rows to keep.
+    """
+    if how not in ('min', 'max'):
+        raise ValueError("how must be either 'min' or 'max'.")
+    score = pd.Series(score)
+    best = score.groupby(keys, sort=False).transform(how)
+    return (score == best).to_numpy()
@@ -5,7 +5,6 @@ from datetime import datetime, timezone
 from pathlib import Path
 from datarec.data.resource import load_dataset_config
 from datarec.data.datarec_builder import RegisteredDataset
-from datarec.data.characteristics import CHARACTERISTICS
 from datarec.io.paths import (
     REGISTRY_DATASETS_FOLDER,
     REGISTRY_METRICS_FOLDER,
@@ -54,20 +53,15 @@ def compute_dataset_characteristics(dataset_name: str,
     dset.prepare(use_cache=use_cache)
     dr = dset.load(use_cache=use_cache, to_cache=use_cache, only_required=True)
 
-    characteristics = {}
-    for name, func in CHARACTERISTICS.items():
-        try:
-            value = func(dr)
-            # Make YAML-friendly: unwrap numpy scalars if possible
-            if hasattr(value, "item"):
-                try:
-                    value = value.item()
-                except Exception:
-                    pass
-            characteristics[name] = value
-        except Exception as exc:
-            characteristics[name] = None
-            characteristics[f"{name}_error"] = str(exc)
+    # all the characteristics share one computation of the degree vectors
+    characteristics = dr.compute_characteristics(errors='store')
+    for name, value in characteristics.items():
+        # Make YAML-friendly: unwrap numpy scalars if possible
+        if hasattr(value, "item"):
+            try:
+                characteristics[name] = value.item()
+            except Exception:
+                pass
 
     payload = {
         "dataset": dataset_name,
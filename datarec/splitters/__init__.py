@@ -1,6 +1,7 @@
+from datarec.splitters.split_index import SplitIndex, SplitView
 from datarec.splitters.uniform.hold_out import RandomHoldOut
 from datarec.splitters.uniform.temporal.hold_out import TemporalHoldOut
 from datarec.splitters.uniform.temporal.threshold import TemporalThresholdSplit
 from datarec.splitters.user_stratified.hold_out import UserStratifiedHoldOut
 from datarec.splitters.user_stratified.leave_out import LeaveOneOut, LeaveNOut, LeaveRatioOut
-from datarec.splitters.user_stratified.temporal.leave_out import LeaveNLast, LeaveOneLast, LeaveRatioLast
\ No newline at end of file
+from datarec.splitters.user_stratified.temporal.leave_out import LeaveNLast, LeaveOneLast, LeaveRatioLast
@@ -0,0 +1,384 @@
+import os
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from datarec.data.dataset import DataRec
+from datarec.io.rawdata import RawData
+from datarec.splitters.utils import TRAIN, TEST, VALIDATION, UNASSIGNED
+
+# name of every split and its code in the assignment vector, in output order
+SPLITS = {'train': TRAIN, 'test': TEST, 'val': VALIDATION}
+
+SPLIT_INDEX_VERSION = 1
+META_FILE = 'meta.yml'
+ASSIGNMENT_FILE = 'assignment.npy'
+ORDER_FILE = 'order.npy'
+# code of the unassigned rows in bit-packed assignments, which take 2 bits per row
+PACKED_UNASSIGNED = 3
+
+
+def pack_assignment(assignment: np.ndarray) -> np.ndarray:
+    """
+    Packs an assignment vector into 2 bits per row, four rows per byte.
+
+    Args:
+        assignment (np.ndarray): `TRAIN`, `TEST`, `VALIDATION` or `UNASSIGNED` for every row.
+
+    Returns:
+        (np.ndarray): The packed uint8 array, of `ceil(len(assignment) / 4)` bytes.
+    """
+    codes = np.where(assignment == UNASSIGNED, PACKED_UNASSIGNED, assignment).astype(np.uint8)
+    codes = np.pad(codes, (0, -len(codes) % 4)).reshape(-1, 4)
+    return codes[:, 0] | (codes[:, 1] << 2) | (codes[:, 2] << 4) | (codes[:, 3] << 6)
+
+
+def unpack_assignment(packed: np.ndarray, n: int) -> np.ndarray:
+    """
+    Unpacks an assignment vector packed by `pack_assignment`.
+
+    Args:
+        packed (np.ndarray): The packed uint8 array.
+        n (int): The number of rows.
+
+    Returns:
+        (np.ndarray): The uint8 assignment of every row.
+    """
+    codes = ((packed[:, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3).reshape(-1)[:n]
+    codes[codes == PACKED_UNASSIGNED] = UNASSIGNED
+    return codes
+
+
+def split_datarec(datarec: DataRec, data: pd.DataFrame, pipeline) -> DataRec:
+    """
+    Wraps the rows of a split in a `DataRec` sharing the columns and the encoders of the original one.
+
+    Args:
+        datarec (DataRec): The original dataset.
+        data (pd.DataFrame): The rows of the split. They are wrapped without being copied.
+        pipeline (Pipeline): The pipeline of the split, copied into the new `DataRec`.
+
+    Returns:
+        (DataRec): The split dataset.
+    """
+    split = DataRec(RawData(data,
+                            user=datarec.user_col,
+                            item=datarec.item_col,
+                            rating=datarec.rating_col,
+                            timestamp=datarec.timestamp_col),
+                    dataset_name=datarec.dataset_name,)
+    split.pipeline = pipeline.copy()
+    split.user_id_encoder = datarec.user_id_encoder.copy()
+    split.item_id_encoder = datarec.item_id_encoder.copy()
+    return split
+
+
+class SplitView:
+    """
+    A split of a `SplitIndex` whose rows have not been gathered.
+
+    Writers accept a view wherever they accept a `DataRec`: `to_rawdata` gathers the rows of the
+    split only, and `iter_rawdata` streams them from the original dataset block by block.
+    """
+
+    def __init__(self, split_index: "SplitIndex", name: str):
+        """
+        Initializes the SplitView object.
+
+        Args:
+            split_index (SplitIndex): The split index the view belongs to.
+            name (str): The name of the split, 'train', 'test' or 'val'.
+        """
+        self.split_index = split_index
+        self.name = name
+        self.pipeline = split_index.pipeline.copy()
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        The positions of the rows of the split in the original dataset, in split order.
+        """
+        return self.split_index.positions(self.name)
+
+    def __len__(self):
+        return self.split_index.sizes[self.name]
+
+    def __repr__(self):
+        return f'SplitView({self.name!r}, rows={len(self)})'
+
+    def _rawdata(self, positions: np.ndarray, start: int = 0) -> RawData:
+        """
+        Gathers the rows at the given positions of the original dataset in a RawData object.
+        """
+        datarec = self.split_index.datarec
+        data = datarec.data.take(positions)
+        if self.split_index.ignore_index:
+            data.index = pd.RangeIndex(start, start + len(data))
+        return RawData(data, user=datarec.user_col, item=datarec.item_col, rating=datarec.rating_col,
+                       timestamp=datarec.timestamp_col)
+
+    def to_rawdata(self) -> RawData:
+        """
+        Gathers the rows of the split in a RawData object.
+
+        Returns:
+            (RawData): The rows of the split.
+        """
+        return self._rawdata(self.positions)
+
+    def iter_rawdata(self, chunksize: int = 1_000_000) -> Iterator[RawData]:
+        """
+        Streams the rows of the split from the original dataset in blocks of consecutive rows.
+
+        Args:
+            chunksize (int): The maximum number of rows of a block.
+
+        Returns:
+            (Iterator[RawData]): The blocks, at least one even if the split is empty.
+        """
+        positions = self.positions
+        for start in range(0, max(len(positions), 1), chunksize):
+            yield self._rawdata(positions[start:start + chunksize], start=start)
+
+    def to_datarec(self) -> DataRec:
+        """
+        Materializes the split, as `split_index[name]` does.
+
+        Returns:
+            (DataRec): The split dataset.
+        """
+        return self.split_index[self.name]
+
+
+class SplitIndex(Mapping):
+    """
+    The result of a splitter as the split assigned to every row of the original dataset.
+
+    The assignment takes one byte per interaction (`TRAIN`, `TEST`, `VALIDATION`, or `UNASSIGNED`
+    for the rows in no split), so a split costs a fraction of the memory of the three `DataRec`
+    objects returned by `Splitter.run`. The index behaves as the dictionary returned by `run`:
+    the keys are the names of the non-empty splits and each split is gathered into a `DataRec`
+    only when it is first accessed. `view` returns a split that writers and exporters can stream
+    from the original dataset without materializing it.
+
+    Example:
+        >>> splits = LeaveOneOut(test=True, validation=False).split_index(datarec)
+        >>> splits.sizes
+        {'train': 90, 'test': 10, 'val': 0}
+        >>> write_transactions_tabular(splits.view('test'), 'test.tsv')
+        >>> train = splits['train']
+    """
+
+    def __init__(self, datarec: DataRec, assignment: np.ndarray, order: Union[np.ndarray, str, None] = None,
+                 ignore_index: bool = False, step_info: Optional[Dict[str, Dict]] = None):
+        """
+        Initializes the SplitIndex object.
+
+        Args:
+            datarec (DataRec): The original dataset. It is not copied.
+            assignment (np.ndarray): The split of every row of the dataset.
+            order (Union[np.ndarray, str, None]): The row positions in the order the splits list them.
+                If 'user', the rows are grouped by user as in `DataRec.user_index`; if None, they
+                keep the order of the dataset.
+            ignore_index (bool): Whether the splits are indexed from 0 instead of keeping the index
+                of the dataset.
+            step_info (Optional[Dict[str, Dict]]): The 'operation' and 'params' of the splitter,
+                recorded as the split step of the pipeline of every split.
+
+        Raises:
+            ValueError: If the assignment does not have one entry per row of the dataset.
+            ValueError: If `order` is a string other than 'user'.
+        """
+        assignment = np.asarray(assignment, dtype=np.uint8)
+        if len(assignment) != len(datarec):
+            raise ValueError(f'The assignment has {len(assignment)} entries but the dataset has '
+                             f'{len(datarec)} rows.')
+        if isinstance(order, str) and order != 'user':
+            raise ValueError(f"Invalid order '{order}'. Use 'user', None or an array of row positions.")
+
+        self.datarec = datarec
+        self.assignment = assignment
+        self.order = order
+        self.ignore_index = ignore_index
+        self.step_info = step_info
+        self.sizes = {name: int(count) for name, count
+                      in zip(SPLITS, np.bincount(assignment, minlength=256)[list(SPLITS.values())])}
+
+        self.pipeline = datarec.pipeline.copy()
+        if step_info is not None:
+            self.pipeline.add_step(name='split', operation=step_info['operation'], params=step_info['params'])
+        self._splits: Dict[str, DataRec] = {}
+
+    def positions(self, name: str) -> np.ndarray:
+        """
+        Returns the positions of the rows of a split in the original dataset, in split order.
+
+        Args:
+            name (str): The name of the split, 'train', 'test' or 'val'.
+
+        Returns:
+            (np.ndarray): The row positions.
+
+        Raises:
+            KeyError: If `name` is not a split name.
+        """
+        if name not in SPLITS:
+            raise KeyError(name)
+        code = SPLITS[name]
+        if self.order is None:
+            return np.flatnonzero(self.assignment == code)
+        order = self.datarec.user_index.positions if isinstance(self.order, str) else self.order
+        return order[self.assignment[order] == code]
+
+    def view(self, name: str) -> SplitView:
+        """
+        Returns a split without gathering its rows.
+
+        Args:
+            name (str): The name of the split, 'train', 'test' or 'val'.
+
+        Returns:
+            (SplitView): The view of the split.
+
+        Raises:
+            KeyError: If `name` is not a split name.
+        """
+        if name not in SPLITS:
+            raise KeyError(name)
+        return SplitView(self, name)
+
+    def __getitem__(self, name: str) -> DataRec:
+        """
+        Returns a split as a `DataRec`, gathering its rows on the first access.
+
+        Raises:
+            KeyError: If `name` is not the name of a non-empty split.
+        """
+        if not self.sizes.get(name):
+            raise KeyError(name)
+        if name not in self._splits:
+            data = self.datarec.data.take(self.positions(name))
+            if self.ignore_index:
+                data.index = pd.RangeIndex(len(data))
+            self._splits[name] = split_datarec(self.datarec, data, self.pipeline)
+        return self._splits[name]
+
+    def __contains__(self, name):
+        return bool(self.sizes.get(name))
+
+    def __iter__(self):
+        return (name for name, size in self.sizes.items() if size)
+
+    def __len__(self):
+        return sum(1 for size in self.sizes.values() if size)
+
+    def __repr__(self):
+        return f'SplitIndex(sizes={self.sizes})'
+
+    def to_dict(self) -> Dict[str, DataRec]:
+        """
+        Materializes all the non-empty splits, as returned by `Splitter.run`.
+
+        Returns:
+            (Dict[str, DataRec]): The split datasets under the keys 'train', 'test' and 'val'.
+        """
+        return {name: self[name] for name in self}
+
+    def save(self, dirpath: str, packed: bool = False) -> None:
+        """
+        Saves the split as its assignment vector plus the fingerprint of the original dataset.
+
+        The directory holds `assignment.npy` (one byte per interaction, or 2 bits if `packed`),
+        `order.npy` only when the splits list the rows in an order that cannot be derived from the
+        dataset (e.g., shuffled by `RandomHoldOut`), and `meta.yml` with the fingerprint of the
+        dataset (see `DataRec.fingerprint`), the split sizes and the splitter. `load` gathers the
+        splits again without running the splitter.
+
+        The split step of the pipeline records the directory as its `split_path` parameter, so the
+        pipeline YAML of the splits references the saved split and `Pipeline.apply` loads it instead
+        of running the splitter again.
+
+        Args:
+            dirpath (str): The path of the directory, created if missing.
+            packed (bool): Whether to pack the assignment into 2 bits per interaction.
+        """
+        os.makedirs(dirpath, exist_ok=True)
+        n = len(self.assignment)
+        np.save(os.path.join(dirpath, ASSIGNMENT_FILE), pack_assignment(self.assignment) if packed else self.assignment)
+
+        if self.order is None:
+            order = 'dataset'
+        elif isinstance(self.order, str):
+            order = self.order
+        else:
+            order = 'stored'
+            np.save(os.path.join(dirpath, ORDER_FILE),
+                    self.order.astype(np.uint32 if n < 2 ** 32 else np.int64, copy=False))
+
+        step_info = self.step_info or {'operation': None, 'params': {}}
+        params = {k: v for k, v in step_info['params'].items() if k != 'split_path'}
+        meta = {
+            'version': SPLIT_INDEX_VERSION,
+            'rows': n,
+            'fingerprint': self.datarec.fingerprint(),
+            'packed': packed,
+            'order': order,
+            'ignore_index': self.ignore_index,
+            'sizes': self.sizes,
+            'operation': step_info['operation'],
+            'params': params,
+        }
+        # the metadata is written last, so an interrupted save is not loaded
+        with open(os.path.join(dirpath, META_FILE), 'w') as f:
+            yaml.safe_dump(meta, f, sort_keys=False)
+
+        self.step_info = {'operation': step_info['operation'], 'params': {**params, 'split_path': str(dirpath)}}
+        for pipeline in [self.pipeline] + [split.pipeline for split in self._splits.values()]:
+            if pipeline.steps and pipeline.steps[-1].name == 'split':
+                pipeline.steps[-1].params = self.step_info['params']
+
+    @classmethod
+    def load(cls, dirpath: str, datarec: DataRec, verify: bool = True) -> "SplitIndex":
+        """
+        Loads a split saved by `save` over the dataset it was computed on.
+
+        Args:
+            dirpath (str): The path of the saved split.
+            datarec (DataRec): The original dataset, e.g., read again or loaded from a snapshot.
+            verify (bool): Whether to check the fingerprint of the dataset. If False, only the
+                number of rows is checked.
+
+        Returns:
+            (SplitIndex): The saved split over `datarec`.
+
+        Raises:
+            FileNotFoundError: If `dirpath` does not contain a saved split.
+            ValueError: If the split was saved by an unsupported version or for a different dataset.
+        """
+        meta_path = os.path.join(dirpath, META_FILE)
+        if not os.path.isfile(meta_path):
+            raise FileNotFoundError(f"No saved split found in '{dirpath}'.")
+        with open(meta_path) as f:
+            meta = yaml.safe_load(f)
+
+        if meta.get('version') != SPLIT_INDEX_VERSION:
+            raise ValueError(f"Unsupported split version {meta.get('version')} in '{dirpath}'.")
+        if meta['rows'] != len(datarec):
+            raise ValueError(f"The split in '{dirpath}' has {meta['rows']} rows but the dataset has {len(datarec)}.")
+        if verify and meta['fingerprint'] != datarec.fingerprint():
+            raise ValueError(f"The split in '{dirpath}' was computed on a different dataset (fingerprint mismatch).")
+
+        assignment = np.load(os.path.join(dirpath, ASSIGNMENT_FILE))
+        if meta['packed']:
+            assignment = unpack_assignment(assignment, meta['rows'])
+        order = {'dataset': None, 'user': 'user'}.get(meta['order'])
+        if meta['order'] == 'stored':
+            order = np.load(os.path.join(dirpath, ORDER_FILE)).astype(np.intp, copy=False)
+
+        step_info = None
+        if meta['operation'] is not None:
+            step_info = {'operation': meta['operation'], 'params': {**meta['params'], 'split_path': str(dirpath)}}
+        return cls(datarec, assignment, order=order, ignore_index=meta['ignore_index'], step_info=step_info)
@@ -1,7 +1,7 @@
 import pandas as pd
 from typing import Dict
 from datarec import DataRec
-from datarec.io import RawData
+from datarec.splitters.split_index import SplitIndex, split_datarec
 
 
 class Splitter:
@@ -10,14 +10,25 @@ class Splitter:
 
     This class provides a common interface for splitting datasets into training,
     validation, and test sets. Subclasses should implement specific splitting strategies.
+
+    Splitters that split the interactions of every user independently set `local_to = ('user',)`,
+    so that they can run on the shards of a `PartitionedDataRec`.
+
+    Splitters implement `split_index`, which assigns every row to a split without gathering the
+    splits; `run` materializes them as `DataRec` objects.
     """
 
+    local_to = ()
+
     @staticmethod
     def output(datarec: DataRec, train: pd.DataFrame, test: pd.DataFrame, validation: pd.DataFrame,
                step_info: Dict[str, Dict]) -> Dict[str, DataRec]:
         """
         Creates a dictionary of `DataRec` objects for train, test, and validation splits.
 
+        The splits are wrapped without being copied and share the encoders of the original
+        `DataRec`.
+
         Args:
             datarec (DataRec): The original dataset wrapped in a `DataRec` object.
             train (pd.DataFrame): The training split of the dataset.
@@ -38,13 +49,34 @@ class Splitter:
         result = dict()
         for k, d in zip(['train', 'test', 'val'], [train, test, validation]):
             if len(d) > 0:
-                new_datarec = DataRec(RawData(d,
-                                              user=datarec.user_col,
-                                              item=datarec.item_col,
-                                              rating=datarec.rating_col,
-                                              timestamp=datarec.timestamp_col),
-                                      dataset_name=datarec.dataset_name,)
-                new_datarec.pipeline = pipeline.copy()
-                result[k] = new_datarec
+                result[k] = split_datarec(datarec, d, pipeline)
 
         return result
+
+    def split_index(self, datarec: DataRec) -> SplitIndex:
+        """
+        Assigns every interaction of the dataset to the train, test or validation split, without
+        materializing the splits.
+
+        Args:
+            datarec (DataRec): The dataset to be split.
+
+        Returns:
+            (SplitIndex): The split of every interaction of `datarec`.
+
+        Raises:
+            NotImplementedError: If the splitter does not support split indexes.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not support split indexes.')
+
+    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+        """
+        Splits the dataset into train, test and validation sets.
+
+        Args:
+            datarec (DataRec): The dataset to be split.
+
+        Returns:
+            (Dict[str, DataRec]): The non-empty splits under the keys 'train', 'test' and 'val'.
+        """
+        return self.split_index(datarec).to_dict()
@@ -1,8 +1,9 @@
-import pandas as pd
-from typing import Dict
+import numpy as np
 from sklearn.model_selection import train_test_split as split
 from datarec import DataRec
 from datarec.splitters.splitter import Splitter
+from datarec.splitters.split_index import SplitIndex
+from datarec.splitters.utils import TRAIN, TEST, VALIDATION
 
 
 class RandomHoldOut(Splitter):
@@ -82,22 +83,26 @@ class RandomHoldOut(Splitter):
             raise ValueError('ratio must be between 0 and 1')
         self._val_ratio = value
 
-    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+    def split_index(self, datarec: DataRec) -> SplitIndex:
         """
         Splits the dataset into training, validation, and test sets according to the specified ratios, 
         with the val_ratio being applied to the dataset after the test set has been partitioned.
 
+        The row positions are shuffled and split instead of the rows, which gives the same splits,
+        in the same order, as splitting the dataset itself.
+
         Args:
             datarec (DataRec): The dataset to be split.
 
         Returns:
-            (Dict[str, DataRec]): A dictionary with the following keys:
+            (SplitIndex): The split of every interaction, read as a dictionary with the keys:
                 - "train": The training dataset (`DataRec`).
                 - "test": The test dataset (`DataRec`), if `test_ratio` > 0.
                 - "val": The validation dataset (`DataRec`), if `val_ratio` > 0.
         """
 
-        train, val, test = datarec.data, pd.DataFrame(), pd.DataFrame()
+        train = np.arange(len(datarec))
+        test, val = train[:0], train[:0]
 
         if self.test_ratio:
             train, test = split(train, test_size=self._test_ratio, random_state=self.seed)
@@ -105,6 +110,8 @@ class RandomHoldOut(Splitter):
         if self.val_ratio:
             train, val = split(train, test_size=self._val_ratio, random_state=self.seed)
 
-        return self.output(datarec=datarec, train=train, test=test, validation=val,
-                           step_info={'operation': self.__class__.__name__, 'params': self.params})
+        assignment = np.empty(len(datarec), dtype=np.uint8)
+        assignment[train], assignment[test], assignment[val] = TRAIN, TEST, VALIDATION
 
+        return SplitIndex(datarec, assignment, order=np.concatenate([train, test, val]),
+                          step_info={'operation': self.__class__.__name__, 'params': self.params})
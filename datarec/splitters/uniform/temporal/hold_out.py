@@ -1,7 +1,7 @@
-from typing import Dict
 from datarec import DataRec
 from datarec.splitters.splitter import Splitter
-from datarec.splitters.utils import temporal_holdout
+from datarec.splitters.split_index import SplitIndex
+from datarec.splitters.utils import temporal_holdout_assignment
 
 
 class TemporalHoldOut(Splitter):
@@ -77,7 +77,7 @@ class TemporalHoldOut(Splitter):
             raise ValueError('ratio must be between 0 and 1')
         self._val_ratio = value
 
-    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+    def split_index(self, datarec: DataRec) -> SplitIndex:
         """
         Splits the dataset using a temporal hold-out strategy.
 
@@ -89,7 +89,7 @@ class TemporalHoldOut(Splitter):
             datarec (DataRec): A DataRec object containing the dataset and a timestamp column.
 
         Returns:
-            (Dict[str, DataRec]): A dictionary with three keys:
+            (SplitIndex): The split of every interaction, read as a dictionary with the keys:
                 - `'train'`: A DataRec object containing the training set.
                 - `'val'`: A DataRec object containing the validation set (if `val_ratio` > 0).
                 - `'test'`: A DataRec object containing the test set (if `test_ratio` > 0).
@@ -101,10 +101,9 @@ class TemporalHoldOut(Splitter):
         if datarec.timestamp_col is None:
             raise TypeError('This DataRec does not contain temporal information')
 
-        train, test, val = temporal_holdout(dataframe=datarec.data,
-                                            test_ratio=self.test_ratio, val_ratio=self.val_ratio,
-                                            temporal_col=datarec.timestamp_col)
+        assignment, order = temporal_holdout_assignment(datarec.data[datarec.timestamp_col],
+                                                        test_ratio=self.test_ratio, val_ratio=self.val_ratio)
 
-        return self.output(datarec, train, test, val,
-                           step_info={'operation': self.__class__.__name__, 'params': self.params})
+        return SplitIndex(datarec, assignment, order=order,
+                          step_info={'operation': self.__class__.__name__, 'params': self.params})
 
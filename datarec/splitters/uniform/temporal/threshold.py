@@ -1,6 +1,8 @@
-from typing import Dict
+import numpy as np
 from datarec import DataRec
 from datarec.splitters.splitter import Splitter
+from datarec.splitters.split_index import SplitIndex
+from datarec.splitters.utils import TRAIN, TEST, VALIDATION, UNASSIGNED
 
 
 class TemporalThresholdSplit(Splitter):
@@ -33,15 +35,17 @@ class TemporalThresholdSplit(Splitter):
         self.val_threshold = val_threshold
         self.test_threshold = test_threshold
 
-    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+    def split_index(self, datarec: DataRec) -> SplitIndex:
         """
         Splits the dataset into training, validation, and test sets based on two thresholds.
 
+        Interactions without a timestamp are left out of all the splits.
+
         Args:
             datarec (DataRec): A DataRec object containing the dataset with a timestamp column.
 
         Returns:
-            Dict[str, DataRec]: A dictionary with:
+            (SplitIndex): The split of every interaction, read as a dictionary with:
                 - `'train'`: Training set (timestamps < `val_threshold`).
                 - `'val'`: Validation set (timestamps between `val_threshold` and `test_threshold`).
                 - `'test'`: Test set (timestamps >= `test_threshold`).
@@ -53,14 +57,12 @@ class TemporalThresholdSplit(Splitter):
         if datarec.timestamp_col is None:
             raise TypeError('This DataRec does not contain temporal information')
 
-        dataset = datarec.data
-
-        train = dataset[dataset[datarec.timestamp_col] < self.val_threshold]
-
-        val = dataset[(dataset[datarec.timestamp_col] >= self.val_threshold) &
-                      (dataset[datarec.timestamp_col] < self.test_threshold)]
+        timestamps = datarec.data[datarec.timestamp_col]
 
-        test = dataset[dataset[datarec.timestamp_col] >= self.test_threshold]
+        assignment = np.full(len(timestamps), UNASSIGNED, dtype=np.uint8)
+        assignment[(timestamps < self.val_threshold).to_numpy()] = TRAIN
+        assignment[((timestamps >= self.val_threshold) & (timestamps < self.test_threshold)).to_numpy()] = VALIDATION
+        assignment[(timestamps >= self.test_threshold).to_numpy()] = TEST
 
-        return self.output(datarec, train, test, val,
-                           step_info={'operation': self.__class__.__name__, 'params': self.params})
+        return SplitIndex(datarec, assignment,
+                          step_info={'operation': self.__class__.__name__, 'params': self.params})
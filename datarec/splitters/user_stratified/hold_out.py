@@ -1,10 +1,10 @@
-import pandas as pd
+import numpy as np
 import warnings
-from math import ceil
 from typing import Dict
-from sklearn.model_selection import train_test_split as split
 from datarec import DataRec
 from datarec.splitters.splitter import Splitter
+from datarec.splitters.split_index import SplitIndex
+from datarec.splitters.utils import assign_by_rank, random_ranks
 
 
 class UserStratifiedHoldOut(Splitter):
@@ -16,6 +16,8 @@ class UserStratifiedHoldOut(Splitter):
 
     """
 
+    local_to = ('user',)
+
     def __init__(self, test_ratio: float = 0, val_ratio: float = 0, seed: int = 42):
         """Initializes the UserStratifiedHoldOut splitter.
         
@@ -79,66 +81,75 @@ class UserStratifiedHoldOut(Splitter):
         self._val_ratio = value
 
     @staticmethod
-    def _can_split(n_samples: int, ratio: float) -> bool:
+    def _can_split(n_samples, ratio: float):
         """
         Returns whether a ratio-based split can leave at least one row
         in both train and held-out partitions.
-        """
-        if ratio <= 0 or n_samples <= 1:
-            return False
 
-        held_out = ceil(n_samples * ratio)
-        return 0 < held_out < n_samples
+        Args:
+            n_samples (int | np.ndarray): The number of rows of a user, or of every user.
+            ratio (float): The held-out ratio.
 
-    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+        Returns:
+            (bool | np.ndarray): Whether each user can be split.
+        """
+        n_samples = np.asarray(n_samples)
+        held_out = np.ceil(n_samples * ratio)
+        can_split = (ratio > 0) & (n_samples > 1) & (0 < held_out) & (held_out < n_samples)
+        return can_split if can_split.ndim else bool(can_split)
+
+    def split_index(self, datarec: DataRec) -> SplitIndex:
         """
         Splits the dataset into train, validation, and test sets using a user-stratified holdout approach.
 
         Each user's interactions are split independently according to `test_ratio` and `val_ratio`, ensuring
-        that the distribution is preserved per user. The function returns a dictionary containing the three
+        that the distribution is preserved per user. A user holds out `ceil(n * test_ratio)` of its `n`
+        interactions for the test set and `ceil(r * val_ratio)` of the `r` remaining ones for the validation
+        set, unless `_can_split` rules it out. The interactions of all the users are ranked in a seeded
+        random order at once and the held-out ones are the first ranked, so the split takes a single sort
+        and is reproducible for a given seed. The function returns a dictionary containing the three
         resulting subsets.
 
         Args:
             datarec (DataRec): The dataset to be split.
 
         Returns:
-            (Dict[str, DataRec]): A dictionary with the following keys:
+            (SplitIndex): The split of every interaction, read as a dictionary with the keys:
                 - "train": DataRec containing the training set.
                 - "test": DataRec containing the test set, if `test_ratio` > 0.
                 - "val": DataRec containing the validation set, if `val_ratio` > 0.
         """
+        return self._split_index(datarec, stacklevel=3)
+
+    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+        """
+        Splits the dataset into train, test and validation sets, as `split_index` materialized.
+
+        Args:
+            datarec (DataRec): The dataset to be split.
+
+        Returns:
+            (Dict[str, DataRec]): The non-empty splits under the keys 'train', 'test' and 'val'.
+        """
+        return self._split_index(datarec, stacklevel=3).to_dict()
+
+    def _split_index(self, datarec: DataRec, stacklevel: int) -> SplitIndex:
+        """
+        Computes the split index, warning about the skipped users `stacklevel` frames up.
+        """
+        index = datarec.user_index
+        totals = index.degrees.astype(np.int64)
+
+        test_split = self._can_split(totals, self.test_ratio)
+        test_n = np.where(test_split, np.ceil(totals * self.test_ratio), 0).astype(np.int64)
+        remaining = totals - test_n
+        val_split = self._can_split(remaining, self.val_ratio)
+        val_n = np.where(val_split, np.ceil(remaining * self.val_ratio), 0).astype(np.int64)
+        skipped_test_users = int((~test_split).sum()) if self.test_ratio else 0
+        skipped_val_users = int((~val_split).sum()) if self.val_ratio else 0
 
-        data = datarec.data
-        user_col = datarec.user_col
-        train_parts, test_parts, val_parts = [], [], []
-        skipped_test_users = 0
-        skipped_val_users = 0
-
-        for _, user_data in data.groupby(user_col, sort=False):
-
-            u_train, u_val, u_test = user_data, pd.DataFrame(), pd.DataFrame()
-
-            if self.test_ratio:
-                if self._can_split(len(u_train), self.test_ratio):
-                    u_train, u_test = split(u_train, test_size=self._test_ratio, random_state=self.seed)
-                else:
-                    skipped_test_users += 1
-            if self.val_ratio:
-                if self._can_split(len(u_train), self.val_ratio):
-                    u_train, u_val = split(u_train, test_size=self._val_ratio, random_state=self.seed)
-                else:
-                    skipped_val_users += 1
-
-            train_parts.append(u_train)
-            if not u_test.empty:
-                test_parts.append(u_test)
-            if not u_val.empty:
-                val_parts.append(u_val)
-
-        empty_split = pd.DataFrame(columns=data.columns)
-        train = pd.concat(train_parts, axis=0, ignore_index=True) if train_parts else empty_split.copy()
-        test = pd.concat(test_parts, axis=0, ignore_index=True) if test_parts else empty_split.copy()
-        val = pd.concat(val_parts, axis=0, ignore_index=True) if val_parts else empty_split.copy()
+        ranks = random_ranks(index, self.seed)
+        assignment = assign_by_rank(ranks, index.codes, test_n, val_n)
 
         skipped = []
         if skipped_test_users:
@@ -151,8 +162,8 @@ class UserStratifiedHoldOut(Splitter):
                 + " and ".join(skipped)
                 + " because those users had too few interactions.",
                 UserWarning,
-                stacklevel=2,
+                stacklevel=stacklevel,
             )
 
-        return self.output(datarec=datarec, train=train, test=test, validation=val,
-                           step_info={'operation': self.__class__.__name__, 'params': self.params})
+        return SplitIndex(datarec, assignment, order='user', ignore_index=True,
+                          step_info={'operation': self.__class__.__name__, 'params': self.params})
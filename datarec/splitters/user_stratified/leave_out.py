@@ -1,8 +1,8 @@
-import pandas as pd
-from typing import Dict
+import numpy as np
 from datarec import DataRec
-from datarec.splitters.utils import random_sample
+from datarec.splitters.utils import assign_by_rank, random_ranks
 from datarec.splitters.splitter import Splitter
+from datarec.splitters.split_index import SplitIndex
 
 
 class LeaveNOut(Splitter):
@@ -14,6 +14,8 @@ class LeaveNOut(Splitter):
     are kept in the training set.
     """
 
+    local_to = ('user',)
+
     def __init__(self, test_n: int = 0, validation_n: int = 0, seed: int = 42):
         """Initializes the LeaveNOut splitter.
         
@@ -79,44 +81,42 @@ class LeaveNOut(Splitter):
             raise TypeError("validation_n must be an integer.")
         self._validation_n = value
 
-    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+    def split_index(self, datarec: DataRec) -> SplitIndex:
         """
         Splits the dataset into train, validation, and test sets using a Leave-N-Out approach.
 
         For each user, `test_n` interactions are randomly assigned to the test set, and `validation_n`
         interactions are assigned to the validation set. The remaining interactions are used for training.
+        The interactions of all the users are ranked in a seeded random order at once, so the split
+        takes a single sort and is reproducible for a given seed; the ranks of a user depend only
+        on its own interactions. The splits list the interactions
+        grouped by user, in order of first appearance.
 
         Args:
             datarec (DataRec): The dataset to be split.
 
         Returns:
-            (Dict[str, DataRec]): A dictionary with the following keys:
+            (SplitIndex): The split of every interaction, read as a dictionary with the keys:
                 - "train": DataRec containing the training set.
                 - "test": DataRec containing the test set, if `test_n` > 0.
                 - "validation": DataRec containing the validation set, if `val_n` > 0.
-        """
-
-        train, test, val = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-        data = datarec.data
-        for u in datarec.users:
 
-            u_train, u_val, u_test = data[data.iloc[:, 0] == u], pd.DataFrame(), pd.DataFrame()
-
-            if self.test_n:
-                u_train, sample = random_sample(dataframe=u_train, n_samples=self.test_n, seed=self.seed)
-                u_test = pd.concat([u_test, sample], axis=0, ignore_index=True)
-
-            if self.validation_n:
-                u_train, sample = random_sample(dataframe=u_train, n_samples=self.validation_n, seed=self.seed)
-                u_val = pd.concat([u_val, sample], axis=0, ignore_index=True)
+        Raises:
+            ValueError: If a user has less than `test_n + validation_n` interactions.
+        """
 
-            train = pd.concat([train, u_train], axis=0, ignore_index=True)
-            test = pd.concat([test, u_test], axis=0, ignore_index=True)
-            val = pd.concat([val, u_val], axis=0, ignore_index=True)
+        index = datarec.user_index
+        short = int((index.degrees < self.test_n + self.validation_n).sum())
+        if short:
+            raise ValueError(f'{short} users have less than {self.test_n + self.validation_n} interactions: '
+                             f'number of samples greater than the number of samples of the user.')
 
-        return self.output(datarec, train, test, val,
-                           step_info={'operation': self.__class__.__name__, 'params': self.params})
+        # a seeded random rank per row within its user: the first test_n rows go to the test set,
+        # the next validation_n ones to the validation set
+        ranks = random_ranks(index, self.seed)
+        assignment = assign_by_rank(ranks, index.codes, self.test_n, self.validation_n)
+        return SplitIndex(datarec, assignment, order='user', ignore_index=True,
+                          step_info={'operation': self.__class__.__name__, 'params': self.params})
 
 
 class LeaveOneOut(LeaveNOut):
@@ -166,6 +166,8 @@ class LeaveRatioOut(Splitter):
     ensuring that the splits are proportional to the user's total number of interactions.
     """
 
+    local_to = ('user',)
+
     def __init__(self, test_ratio: float = 0, val_ratio: float = 0, seed: int = 42):
         """Initializes the LeaveRatioOut splitter.
         
@@ -191,18 +193,19 @@ class LeaveRatioOut(Splitter):
         self.val_ratio = val_ratio
         self.seed = seed
 
-    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+    def split_index(self, datarec: DataRec) -> SplitIndex:
         """
          Splits the dataset into train, test, and validation sets based on the specified ratios.
 
          The interactions of each user are sampled proportionally to create the test and validation sets.
-         The remaining interactions are used as the training set.
+         The remaining interactions are used as the training set. As in `LeaveNOut`, the interactions
+         are ranked in a seeded random order within each user with a single sort.
 
          Args:
              datarec (DataRec): The dataset containing interactions and user-item relationships.
 
          Returns:
-             (Dict[str, DataRec]): A dictionary containing the following keys:
+             (SplitIndex): The split of every interaction, read as a dictionary with the keys:
                  - `"train"` (`DataRec`): The training dataset.
                  - `"test"` (`DataRec`): The test dataset, if `test_ratio` > 0.
                  - `"val"` (`DataRec`): The validation dataset, if `val_ratio` > 0.
@@ -211,30 +214,13 @@ class LeaveRatioOut(Splitter):
              ValueError: If an empty dataset is encountered after sampling.
          """
 
-        train, test, val = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-        data = datarec.data
-        for u in datarec.users:
-            u_train, u_val, u_test = data[data.iloc[:, 0] == u], pd.DataFrame(), pd.DataFrame()
-
-            user_total = len(u_train)
-
-            test_n_samples = round(self.test_ratio * user_total)
-            val_n_samples = round(self.val_ratio * user_total)
-
-            if test_n_samples > 0:
-                u_train, sample = random_sample(dataframe=u_train, n_samples=min(test_n_samples, len(u_train)),
-                                                seed=self.seed)
-                u_test = pd.concat([u_test, sample], axis=0, ignore_index=True)
-
-            if val_n_samples > 0:
-                u_train, sample = random_sample(dataframe=u_train, n_samples=min(val_n_samples, len(u_train)),
-                                                seed=self.seed)
-                u_val = pd.concat([u_val, sample], axis=0, ignore_index=True)
-
-            train = pd.concat([train, u_train], axis=0, ignore_index=True)
-            test = pd.concat([test, u_test], axis=0, ignore_index=True)
-            val = pd.concat([val, u_val], axis=0, ignore_index=True)
+        index = datarec.user_index
+        totals = index.degrees
+        # the counts are rounded as Python's round does (half to even)
+        test_n = np.minimum(np.rint(self.test_ratio * totals), totals).astype(np.int64)
+        val_n = np.minimum(np.rint(self.val_ratio * totals), totals - test_n).astype(np.int64)
 
-        return self.output(datarec, train, test, val,
-                           step_info={'operation': self.__class__.__name__, 'params': self.params})
+        ranks = random_ranks(index, self.seed)
+        assignment = assign_by_rank(ranks, index.codes, test_n, val_n)
+        return SplitIndex(datarec, assignment, order='user', ignore_index=True,
+                          step_info={'operation': self.__class__.__name__, 'params': self.params})
@@ -1,8 +1,8 @@
-import pandas as pd
-from typing import Dict
+import numpy as np
 from datarec import DataRec
-from datarec.splitters.utils import max_by_col
+from datarec.splitters.utils import assign_by_rank, held_out_by_rank, latest_ranks
 from datarec.splitters.splitter import Splitter
+from datarec.splitters.split_index import SplitIndex
 
 
 class LeaveNLast(Splitter):
@@ -12,6 +12,9 @@ class LeaveNLast(Splitter):
     This splitter selects the last `test_n` interactions for the test set and the last `validation_n`
     interactions for the validation set while keeping the remaining interactions in the training set.
     """
+
+    local_to = ('user',)
+
     def __init__(self, test_n: int = 0, validation_n: int = 0, seed: int = 42):
         """Initializes the LeaveNLast splitter.
 
@@ -73,49 +76,45 @@ class LeaveNLast(Splitter):
             raise TypeError("validation_n must be and integer.")
         self._validation_n = value
 
-    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+    def split_index(self, datarec: DataRec) -> SplitIndex:
         """
         Splits the dataset into train, test, and validation sets based on the last `n` interactions.
 
+        The interactions of all the users are ranked from the most recent with a single sort by
+        (user, timestamp, seeded tie-break key); ties between timestamps are broken at random,
+        reproducibly for a given seed. The splits list the interactions grouped by user, in order
+        of first appearance: the training interactions of a user in dataset order, the test and
+        validation ones from the most recent.
+
         Args:
             datarec (DataRec): The dataset containing the interactions and timestamp column.
 
         Returns:
-            (Dict[str, DataRec]): A dictionary with the following keys:
+            (SplitIndex): The split of every interaction, read as a dictionary with the keys:
                 - "train": The training dataset (`DataRec`).
                 - "test": The test dataset (`DataRec`), if `test_n` > 0.
                 - "val": The validation dataset (`DataRec`), if `val_n` > 0.
 
         Raises:
             TypeError: If the dataset does not contain a timestamp column.
+            ValueError: If a user has less than `test_n + validation_n` interactions with a timestamp.
         """
 
         if datarec.timestamp_col is None:
             raise TypeError('This DataRec does not contain temporal information')
 
-        train, test, val = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-        data = datarec.data
-        for u in datarec.users:
-
-            u_train, u_val, u_test = data[data.iloc[:, 0] == u], pd.DataFrame(), pd.DataFrame()
-
-            if self.test_n:
-                for _ in range(self.test_n):
-                    u_train, sample = max_by_col(u_train, datarec.timestamp_col, seed=self.seed)
-                    u_test = pd.concat([u_test, sample], axis=0, ignore_index=True)
-
-            if self.validation_n:
-                for _ in range(self.validation_n):
-                    u_train, sample = max_by_col(u_train, datarec.timestamp_col, seed=self.seed)
-                    u_val = pd.concat([u_val, sample], axis=0, ignore_index=True)
-
-            train = pd.concat([train, u_train], axis=0, ignore_index=True)
-            test = pd.concat([test, u_test], axis=0, ignore_index=True)
-            val = pd.concat([val, u_val], axis=0, ignore_index=True)
+        index = datarec.user_index
+        timestamps = datarec.data[datarec.timestamp_col]
+        dated = np.bincount(index.codes[(index.codes >= 0) & timestamps.notna().to_numpy()], minlength=len(index))
+        short = int((dated < self.test_n + self.validation_n).sum())
+        if short:
+            raise ValueError(f'{short} users have less than {self.test_n + self.validation_n} dated interactions.')
 
-        return self.output(datarec, train, test, val,
-                           step_info={'operation': self.__class__.__name__, 'params': self.params})
+        # the test set takes the test_n most recent interactions of each user, the validation set the next ones
+        ranks = latest_ranks(index, timestamps, self.seed)
+        assignment = assign_by_rank(ranks, index.codes, self.test_n, self.validation_n)
+        return SplitIndex(datarec, assignment, order=held_out_by_rank(index, assignment, ranks), ignore_index=True,
+                          step_info={'operation': self.__class__.__name__, 'params': self.params})
 
 
 class LeaveOneLast(LeaveNLast):
@@ -165,6 +164,8 @@ class LeaveRatioLast(Splitter):
 
     """
 
+    local_to = ('user',)
+
     def __init__(self, test_ratio: float = 0, val_ratio: float = 0, seed: int = 42):
         """
         Args:
@@ -189,19 +190,21 @@ class LeaveRatioLast(Splitter):
         self.val_ratio = val_ratio
         self.seed = seed
 
-    def run(self, datarec: DataRec) -> Dict[str, DataRec]:
+    def split_index(self, datarec: DataRec) -> SplitIndex:
         """
         Splits the dataset into train, test, and validation sets by selecting the last interactions
         (in chronological order) for each user.
 
         The most recent interactions are removed first for the test set, then for the validation set,
-        leaving the remaining interactions for training.
+        leaving the remaining interactions for training. As in `LeaveNLast`, the interactions are
+        ranked with a single sort, ties between timestamps are broken at random and the test and
+        validation interactions of a user are listed from the most recent.
 
         Args:
             datarec (DataRec): The dataset containing interactions with a timestamp column.
 
         Returns:
-            (Dict[str, DataRec]): A dictionary containing the following keys:
+            (SplitIndex): The split of every interaction, read as a dictionary with the keys:
                 - `"train"` (`DataRec`): The training dataset.
                 - `"test"` (`DataRec`): The test dataset, if `test_ratio` > 0.
                 - `"val"` (`DataRec`): The validation dataset, if `val_ratio` > 0.
@@ -213,31 +216,14 @@ class LeaveRatioLast(Splitter):
         if datarec.timestamp_col is None:
             raise TypeError('This DataRec does not contain temporal information')
 
-        train, test, val = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-        data = datarec.data
-        for u in datarec.users:
-            u_train, u_val, u_test = data[data.iloc[:, 0] == u], pd.DataFrame(), pd.DataFrame()
-
-            user_total = len(u_train)
-
-            test_n_samples = round(self.test_ratio * user_total)
-            val_n_samples = round(self.val_ratio * user_total)
-
-            if test_n_samples > 0:
-                for _ in range(min(test_n_samples, len(u_train))):
-                    u_train, sample = max_by_col(u_train, datarec.timestamp_col, seed=self.seed)
-                    u_test = pd.concat([u_test, sample], axis=0, ignore_index=True)
-
-            if val_n_samples > 0:
-                for _ in range(min(val_n_samples, len(u_train))):
-                    u_train, sample = max_by_col(u_train, datarec.timestamp_col, seed=self.seed)
-                    u_val = pd.concat([u_val, sample], axis=0, ignore_index=True)
-
-            train = pd.concat([train, u_train], axis=0, ignore_index=True)
-            test = pd.concat([test, u_test], axis=0, ignore_index=True)
-            val = pd.concat([val, u_val], axis=0, ignore_index=True)
+        index = datarec.user_index
+        totals = index.degrees
+        # the counts are rounded as Python's round does (half to even)
+        test_n = np.minimum(np.rint(self.test_ratio * totals), totals).astype(np.int64)
+        val_n = np.minimum(np.rint(self.val_ratio * totals), totals - test_n).astype(np.int64)
 
-        return self.output(datarec, train, test, val,
-                           step_info={'operation': self.__class__.__name__, 'params': self.params})
+        ranks = latest_ranks(index, datarec.data[datarec.timestamp_col], self.seed)
+        assignment = assign_by_rank(ranks, index.codes, test_n, val_n)
+        return SplitIndex(datarec, assignment, order=held_out_by_rank(index, assignment, ranks), ignore_index=True,
+                          step_info={'operation': self.__class__.__name__, 'params': self.params})
 
@@ -1,5 +1,163 @@
+import numpy as np
 import pandas as pd
 from typing import Tuple
+from datarec.data.approximate import hash_ids
+from datarec.data.index import InteractionIndex
+
+# split of a row in the assignment vectors of the splitters (see `SplitIndex`)
+TRAIN, TEST, VALIDATION = 0, 1, 2
+# rows in no split, e.g., without a user or a timestamp
+UNASSIGNED = 255
+
+
+def _ranks_in_order(codes: np.ndarray, order: np.ndarray, ascending: bool = True) -> np.ndarray:
+    """
+    Ranks the rows of every group given the row positions sorted by group and then by rank.
+    """
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    sizes = np.diff(np.r_[starts, len(codes)])
+    ranks = np.empty(len(codes), dtype=np.int64)
+    if ascending:
+        ranks[order] = np.arange(len(codes)) - np.repeat(starts, sizes)
+    else:
+        ranks[order] = np.repeat(starts + sizes, sizes) - 1 - np.arange(len(codes))
+    ranks[codes < 0] = -1
+    return ranks
+
+
+def group_ranks(codes: np.ndarray, *keys: np.ndarray, ascending: bool = True) -> np.ndarray:
+    """
+    Ranks the rows of every group by one or more sort keys, with a single lexsort.
+
+    Args:
+        codes (np.ndarray): The group of every row, e.g., the user codes of an `InteractionIndex`.
+            Rows with a negative code belong to no group.
+        *keys (np.ndarray): The sort keys aligned with `codes`, the most significant first.
+            Ties left by all the keys are broken by row position.
+        ascending (bool): If False, the rank 0 is given to the largest row of each group.
+
+    Returns:
+        (np.ndarray): The 0-based rank of every row within its group, or -1 for rows in no group.
+    """
+    codes = np.asarray(codes)
+    order = np.lexsort(tuple(reversed(keys)) + (codes,))
+    return _ranks_in_order(codes, order, ascending=ascending)
+
+
+def random_keys(index: InteractionIndex, seed: int) -> np.ndarray:
+    """
+    Draws a random key for every row of an index, reproducible for a given seed.
+
+    The key of a row hashes its group, its position among the rows of the group and the seed,
+    so the keys of a group do not depend on the other groups: a user is split the same way in
+    the whole dataset and in a shard of a `PartitionedDataRec`.
+
+    Args:
+        index (InteractionIndex): The index of the rows by group (e.g., `DataRec.user_index`).
+        seed (int): Random seed for reproducibility.
+
+    Returns:
+        (np.ndarray): A uint64 key for every row.
+    """
+    occurrences = _ranks_in_order(index.codes, index.positions).astype(np.uint64)
+    salt = pd.util.hash_array(np.array([seed], dtype=np.uint64))
+    return pd.util.hash_array(hash_ids(index.keys)[index.codes] ^ pd.util.hash_array(occurrences ^ salt))
+
+
+def random_ranks(index: InteractionIndex, seed: int) -> np.ndarray:
+    """
+    Ranks the rows of every group of an index in a random order, reproducible for a given seed.
+
+    The rows are ordered by their `random_keys`. The group code and the key are packed into one
+    int64 key, so a single argsort orders all the rows.
+
+    Args:
+        index (InteractionIndex): The index of the rows by group (e.g., `DataRec.user_index`).
+        seed (int): Random seed for reproducibility.
+
+    Returns:
+        (np.ndarray): The 0-based rank of every row within its group, or -1 for rows in no group.
+    """
+    codes = index.codes
+    keys = random_keys(index, seed) >> np.uint64(32)
+    order = np.argsort((codes.astype(np.int64) << 32) | keys.astype(np.int64), kind='stable')
+    return _ranks_in_order(codes, order)
+
+
+def latest_ranks(index: InteractionIndex, timestamps, seed: int) -> np.ndarray:
+    """
+    Ranks the rows of every group of an index from the most recent one.
+
+    Rows with the same timestamp are ordered by their `random_keys`, so ties are broken at
+    random but reproducibly for a given seed. Rows with a missing timestamp are ranked last.
+
+    Args:
+        index (InteractionIndex): The index of the rows by group (e.g., `DataRec.user_index`).
+        timestamps (array-like): The timestamp of every row.
+        seed (int): Random seed for reproducibility.
+
+    Returns:
+        (np.ndarray): The 0-based rank of every row within its group, or -1 for rows in no group.
+    """
+    codes = index.codes
+    # timestamps of any type are replaced by their rank among the distinct ones (-1 if missing)
+    times = pd.factorize(timestamps, sort=True)[0].astype(np.int64)
+    keys = random_keys(index, seed)
+    span = int(times.max()) + 2 if len(times) else 1
+    if len(index) * span >= 2 ** 62:
+        return group_ranks(codes, times, keys, ascending=False)
+    # sorting by the tie-break key and then stably by (group, timestamp) packed into one int64
+    # is faster than a lexsort of the three keys
+    by_key = np.argsort(keys)
+    order = by_key[np.argsort((codes * span + times + 1)[by_key], kind='stable')]
+    return _ranks_in_order(codes, order, ascending=False)
+
+
+def assign_by_rank(ranks: np.ndarray, codes: np.ndarray, test_n, val_n) -> np.ndarray:
+    """
+    Assigns the rows ranked first in their group to the test set, the next ones to the validation
+    set and the remaining ones to the training set.
+
+    Args:
+        ranks (np.ndarray): The rank of every row within its group (see `group_ranks`).
+        codes (np.ndarray): The group of every row. Rows with a negative code belong to no group.
+        test_n (int | np.ndarray): The number of test rows, for all the groups or for each group.
+        val_n (int | np.ndarray): The number of validation rows, for all the groups or for each group.
+
+    Returns:
+        (np.ndarray): `TRAIN`, `TEST` or `VALIDATION` for every row, or `UNASSIGNED` for rows in no
+            group, as uint8.
+    """
+    assignment = np.full(len(ranks), UNASSIGNED, dtype=np.uint8)
+    valid = np.flatnonzero(np.asarray(codes) >= 0)
+    ranks, codes = ranks[valid], codes[valid]
+    test_limit = np.asarray(test_n)[codes] if np.ndim(test_n) else test_n
+    val_limit = test_limit + (np.asarray(val_n)[codes] if np.ndim(val_n) else val_n)
+    assignment[valid] = np.where(ranks < test_limit, TEST, np.where(ranks < val_limit, VALIDATION, TRAIN))
+    return assignment
+
+
+def held_out_by_rank(index: InteractionIndex, assignment: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """
+    Orders the rows grouped as in an index, the training rows of every group in dataset order and
+    the held-out ones by rank, i.e., the test and validation rows of a user from the most recent.
+
+    Only the held-out rows are sorted, so the cost is linear in the training rows.
+
+    Args:
+        index (InteractionIndex): The index of the rows by group (e.g., `DataRec.user_index`).
+        assignment (np.ndarray): The split of every row (see `assign_by_rank`).
+        ranks (np.ndarray): The rank of every row within its group.
+
+    Returns:
+        (np.ndarray): The row positions, to be used as the `order` of a `SplitIndex`.
+    """
+    positions = index.positions
+    train = assignment[positions] == TRAIN
+    held_out = positions[~train]
+    held_out = held_out[np.lexsort((ranks[held_out], index.codes[held_out]))]
+    return np.concatenate([positions[train], held_out])
 
 
 def random_sample(dataframe: pd.DataFrame, seed: int, n_samples: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -131,3 +289,44 @@ def temporal_holdout(dataframe: pd.DataFrame, test_ratio: float, val_ratio: floa
 
     return train, test, val
 
+
+
+def temporal_holdout_assignment(timestamps: pd.Series, test_ratio: float, val_ratio: float) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Assigns the rows of a dataset to the training, validation and test sets based on temporal ordering,
+    without gathering the sets.
+
+    The rows are ordered as `temporal_holdout` orders them, so both functions give the same sets.
+
+    Args:
+        timestamps (pd.Series): The timestamp of every row.
+        test_ratio (float): The proportion of the dataset to allocate to the test set. Must be between 0 and 1.
+        val_ratio (float): The proportion of the dataset to allocate to the validation set. Must be between 0 and 1.
+
+    Returns:
+        (Tuple[np.ndarray, np.ndarray]): The uint8 assignment of every row (`TRAIN`, `TEST` or `VALIDATION`)
+            and the row positions in temporal order.
+
+    Raises:
+        ValueError: If `test_ratio` or `val_ratio` are not in the range [0, 1].
+    """
+
+    if test_ratio < 0 or test_ratio > 1:
+        raise ValueError('test ratio must be between 0 and 1.')
+
+    if val_ratio < 0 or val_ratio > 1:
+        raise ValueError('val ratio must be between 0 and 1.')
+
+    total_samples = len(timestamps)
+    test_samples = round(total_samples * test_ratio)
+    val_samples = round((total_samples - test_samples) * val_ratio)
+    train_samples = total_samples - test_samples - val_samples
+
+    # sorting the values under a positional index gives the positions in the order of `sort_values`
+    order = pd.Series(timestamps.array, copy=False).sort_values().index.to_numpy()
+    assignment = np.empty(total_samples, dtype=np.uint8)
+    assignment[order[:train_samples]] = TRAIN
+    assignment[order[train_samples:train_samples + val_samples]] = VALIDATION
+    assignment[order[train_samples + val_samples:]] = TEST
+    return assignment, order
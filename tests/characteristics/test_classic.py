@@ -52,3 +52,36 @@ def test_characteristic_accessor(toy_datarec: DataRec):
     for name in dr.list_characteristics():
         value = getattr(dr.characteristics, name)()
         assert value is not None
+
+
+def test_compute_characteristics_batch(toy_datarec: DataRec):
+    dr = toy_datarec
+    results = dr.compute_characteristics()
+
+    assert set(results) == set(dr.list_characteristics())
+    for name, value in results.items():
+        assert value == pytest.approx(getattr(dr.characteristics, name)())
+
+    assert dr.compute_characteristics(names=['n_users', 'gini_item']) == {
+        'n_users': 3, 'gini_item': pytest.approx(dr.gini_item())}
+    with pytest.raises(ValueError):
+        dr.compute_characteristics(names=['unknown'])
+
+
+def test_compute_characteristics_store_errors():
+    # no valid item: shape divides by zero
+    dr = DataRec(RawData(pd.DataFrame({DATAREC_USER_COL: [1, 2], DATAREC_ITEM_COL: [None, None]}),
+                         user=DATAREC_USER_COL, item=DATAREC_ITEM_COL))
+    results = dr.compute_characteristics(names=['n_users', 'shape'], errors='store')
+
+    assert results['n_users'] == 2
+    assert results['shape'] is None
+    assert 'shape_error' in results
+
+
+def test_intermediates_are_shared(toy_datarec: DataRec):
+    dr = toy_datarec
+    assert dr.intermediate('item_degrees') is dr.intermediate('item_degrees')
+    assert sorted(dr.intermediate('item_degrees').tolist()) == [1, 1, 2]
+    with pytest.raises(ValueError):
+        dr.intermediate('unknown')
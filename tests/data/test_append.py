@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData
+from datarec.data.index import InteractionIndex
+from datarec.data.utils import Encoder
+
+
+@pytest.fixture
+def sample_datarec():
+    data = pd.DataFrame({
+        'user': ['u1', 'u1', 'u2', 'u3'],
+        'item': ['i1', 'i2', 'i1', 'i3'],
+        'rating': [5.0, 4.0, 3.0, 5.0],
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating'))
+
+
+@pytest.fixture
+def new_rows():
+    data = pd.DataFrame({
+        'u': ['u4', 'u1', 'u4'],
+        'i': ['i1', 'i4', 'i2'],
+        'r': [2.0, 1.0, 4.0],
+    })
+    return RawData(data, user='u', item='i', rating='r')
+
+
+def rebuilt(datarec: DataRec) -> DataRec:
+    return DataRec(RawData(datarec.data.copy(), user=datarec.user_col, item=datarec.item_col,
+                           rating=datarec.rating_col))
+
+
+def test_interaction_index_extend_matches_full_index():
+    index = InteractionIndex(np.array(['a', 'b', 'a']))
+    extended = index.extend(np.array(['c', 'a', None, 'c']))
+    full = InteractionIndex(np.array(['a', 'b', 'a', 'c', 'a', None, 'c'], dtype=object))
+
+    assert extended.keys.tolist() == full.keys.tolist()
+    np.testing.assert_array_equal(extended.codes, full.codes)
+    np.testing.assert_array_equal(extended.degrees, full.degrees)
+    np.testing.assert_array_equal(extended.rows('a'), [0, 2, 4])
+    assert index.n_rows == 3 and index.degrees.tolist() == [2, 1]
+
+
+def test_interaction_index_extend_twice_from_same_index():
+    index = InteractionIndex(np.array([1, 2]))
+    first = index.extend(np.array([3]))
+    second = index.extend(np.array([1]))
+
+    assert first.codes.tolist() == [0, 1, 2]
+    assert second.codes.tolist() == [0, 1, 0]
+    assert first.extend(np.array([2])).codes.tolist() == [0, 1, 2, 1]
+
+
+def test_encoder_extend_keeps_assigned_ids():
+    encoder = Encoder()
+    encoder.build_encoding(['a', 'b'], offset=1)
+    added = encoder.extend(['b', 'c', 'd', 'c'])
+
+    assert added.tolist() == ['c', 'd']
+    assert encoder.encoding == {'a': 1, 'b': 2, 'c': 3, 'd': 4}
+    assert encoder.decode([4]) == ['d']
+
+
+def test_append_matches_rebuilt_datarec(sample_datarec, new_rows):
+    sample_datarec.append(new_rows)
+
+    assert len(sample_datarec) == 7
+    assert sample_datarec.data.index.tolist() == list(range(7))
+    assert sample_datarec.data['user_id'].tolist() == ['u1', 'u1', 'u2', 'u3', 'u4', 'u1', 'u4']
+    assert sample_datarec.data['rating'].tolist()[-3:] == [2.0, 1.0, 4.0]
+    assert sample_datarec.compute_characteristics() == rebuilt(sample_datarec).compute_characteristics()
+
+
+def test_append_updates_cached_statistics(sample_datarec, new_rows):
+    assert sample_datarec.users == ['u1', 'u2', 'u3']
+    assert sample_datarec.user_degrees.tolist() == [2, 1, 1]
+
+    sample_datarec.append(new_rows)
+    # the cached index and unique ids were extended, not dropped
+    assert 'users_index' in sample_datarec._stats and 'users' in sample_datarec._stats
+    assert sample_datarec._chunks
+
+    assert sample_datarec.users == ['u1', 'u2', 'u3', 'u4']
+    assert sample_datarec.user_degrees.to_dict() == {'u1': 3, 'u2': 1, 'u3': 1, 'u4': 2}
+    assert sample_datarec.n_items == 4
+    np.testing.assert_array_equal(sample_datarec.user_index.rows('u1'), [0, 1, 5])
+    assert len(sample_datarec.data) == 7 and not sample_datarec._chunks
+
+
+def test_append_extends_encoders(sample_datarec, new_rows):
+    sample_datarec.build_encoding(on='all')
+    sample_datarec.encode()
+    sample_datarec.append(new_rows)
+
+    assert sample_datarec.user_id_encoder.encoding == {'u1': 0, 'u2': 1, 'u3': 2, 'u4': 3}
+    assert sample_datarec.item_id_encoder.encoding == {'i1': 0, 'i2': 1, 'i3': 2, 'i4': 3}
+    assert sample_datarec.data['user_id'].tolist() == [0, 0, 1, 2, 3, 0, 3]
+
+    sample_datarec.decode()
+    assert sample_datarec.data['item_id'].tolist()[-3:] == ['i1', 'i4', 'i2']
+
+
+def test_append_without_encoding_new_rows(sample_datarec, new_rows):
+    sample_datarec.build_encoding(on='users')
+    sample_datarec.append(new_rows, encode=False)
+
+    assert sample_datarec.user_id_encoder.encoding == {'u1': 0, 'u2': 1, 'u3': 2, 'u4': 3}
+    assert sample_datarec.data['user_id'].tolist()[-3:] == ['u4', 'u1', 'u4']
+    with pytest.raises(ValueError):
+        sample_datarec.append(new_rows, encode=True)
+
+
+def test_append_follows_the_encoding_state_of_the_data(sample_datarec, new_rows):
+    sample_datarec.build_encoding(on='all')
+    sample_datarec.append(new_rows)
+
+    # the encoders are built but the stored IDs are not encoded: the new rows are left as they are
+    assert sample_datarec.data['user_id'].tolist() == ['u1', 'u1', 'u2', 'u3', 'u4', 'u1', 'u4']
+    assert sample_datarec.user_id_encoder.encoding == {'u1': 0, 'u2': 1, 'u3': 2, 'u4': 3}
+
+    sample_datarec.encode()
+    sample_datarec.copy().decode()
+    sample_datarec.append(new_rows)
+    assert sample_datarec.data['user_id'].tolist()[-3:] == [3, 0, 3]
+
+    sample_datarec.decode()
+    sample_datarec.append(new_rows)
+    assert sample_datarec.data['item_id'].tolist()[-3:] == ['i1', 'i4', 'i2']
+
+
+def test_append_dataframe_and_missing_columns(sample_datarec):
+    sample_datarec.append(pd.DataFrame({'user_id': ['u5'], 'item_id': ['i5'], 'rating': [1.0]}))
+    assert sample_datarec.n_users == 4
+
+    with pytest.raises(ValueError, match='rating'):
+        sample_datarec.append(pd.DataFrame({'user_id': ['u5'], 'item_id': ['i5']}))
+    with pytest.raises(ValueError):
+        sample_datarec.append(RawData(pd.DataFrame({'u': ['u5'], 'i': ['i5']}), user='u', item='i'))
+
+
+def test_append_to_empty_datarec(new_rows):
+    datarec = DataRec()
+    datarec.append(new_rows)
+    assert len(datarec) == 3
+    assert datarec.n_users == 2
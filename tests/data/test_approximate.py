@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData
+from datarec.data.approximate import HyperLogLog, StreamingCharacteristics, approximate_characteristics, hash_ids
+from datarec.io.readers.transactions import profile_transactions_tabular
+
+
+@pytest.fixture
+def interactions():
+    rng = np.random.default_rng(0)
+    n = 200_000
+    return pd.DataFrame({
+        'user': rng.zipf(1.4, n) % 50_000,
+        'item': [f'i{i}' for i in rng.zipf(1.6, n) % 2_000],
+    })
+
+
+def chunks(data: pd.DataFrame, n: int) -> list:
+    size = -(-len(data) // n)
+    return [data.iloc[start:start + size] for start in range(0, len(data), size)]
+
+
+def exact_characteristics(data: pd.DataFrame) -> dict:
+    return DataRec(RawData(data, user='user', item='item')).compute_characteristics()
+
+
+def test_hyperloglog_estimate_within_error():
+    counter = HyperLogLog(precision=12)
+    values = np.arange(300_000)
+    for chunk in np.array_split(values, 7):
+        counter.update(hash_ids(chunk))
+    counter.update(hash_ids(values[:1000]))
+
+    assert abs(counter.estimate() - len(values)) < 4 * counter.relative_error * len(values)
+
+    other = HyperLogLog(precision=12)
+    other.update(hash_ids(np.arange(300_000, 310_000)))
+    counter.merge(other)
+    assert abs(counter.estimate() - 310_000) < 4 * counter.relative_error * 310_000
+
+
+def test_streaming_characteristics_exact_when_sample_holds_all(interactions):
+    stats = approximate_characteristics(chunks(interactions, 5), 'user', 'item')
+    expected = exact_characteristics(interactions)
+
+    result = stats.compute()
+    assert result.keys() == expected.keys()
+    for name, value in expected.items():
+        assert result[name] == pytest.approx(value)
+    assert set(stats.error_bounds().values()) == {0.0}
+
+
+def test_streaming_characteristics_sampled(interactions):
+    stats = StreamingCharacteristics(precision=14, sample_size=2_000)
+    for chunk in chunks(interactions, 4):
+        stats.update_chunk(chunk, 'user', 'item')
+    expected = exact_characteristics(interactions)
+
+    result = stats.compute(['n_users', 'n_items', 'density', 'gini_user', 'gini_item'])
+    bounds = stats.error_bounds(['n_users', 'n_items', 'density', 'gini_user', 'gini_item'])
+
+    assert bounds['n_items'] == 0.0 and result['n_items'] == expected['n_items']
+    assert result['gini_item'] == pytest.approx(expected['gini_item'])
+    for name in ('n_users', 'density', 'gini_user'):
+        assert bounds[name] > 0
+        assert abs(result[name] - expected[name]) < 5 * bounds[name]
+
+    with pytest.raises(ValueError):
+        stats.compute(['unknown'])
+
+
+def test_profile_transactions_tabular(interactions, tmp_path):
+    interactions.to_csv(tmp_path / 'data.tsv', sep='\t', index=False, header=False)
+    stats = profile_transactions_tabular(str(tmp_path / 'data.tsv'), user_col=0, item_col=1, chunksize=50_000)
+
+    expected = exact_characteristics(interactions)
+    assert stats.n_interactions == len(interactions)
+    assert stats.compute(['n_users'])['n_users'] == expected['n_users']
+    assert stats.compute(['gini_item'])['gini_item'] == pytest.approx(expected['gini_item'])
+
+
+def test_profile_transactions_tabular_missing_id_in_a_chunk(tmp_path):
+    data = pd.DataFrame({'user': np.arange(100) % 10, 'item': np.arange(100) % 7}).astype(object)
+    data.loc[10, 'user'] = None
+    data.to_csv(tmp_path / 'data.tsv', sep='\t', index=False, header=False)
+
+    whole = profile_transactions_tabular(str(tmp_path / 'data.tsv'), user_col=0, item_col=1)
+    chunked = profile_transactions_tabular(str(tmp_path / 'data.tsv'), user_col=0, item_col=1, chunksize=50)
+
+    assert whole.compute(['n_users'])['n_users'] == 10
+    assert chunked.compute(['n_users', 'n_items']) == whole.compute(['n_users', 'n_items'])
+    np.testing.assert_array_equal(hash_ids(np.array([5.0, 6.0])), hash_ids(np.array([5, 6])))
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData
+from datarec.processing import UserItemIterativeKCore, FilterByUserMeanRating
+from datarec.splitters import LeaveOneOut
+
+
+@pytest.fixture
+def sample_data():
+    return pd.DataFrame({
+        'user': ['u1', 'u1', 'u2', 'u3', 'u3', 'u3'],
+        'item': ['i1', 'i2', 'i1', 'i3', 'i1', 'i2'],
+        'rating': [5.0, 4.0, 3.0, 5.0, 2.0, 1.0],
+        'timestamp': pd.to_datetime([1, 2, 3, 4, 5, 6], unit='s'),
+    })
+
+
+def make_datarec(data):
+    return DataRec(RawData(data.copy(), user='user', item='item', rating='rating', timestamp='timestamp'))
+
+
+def test_compact_downcasts_columns(sample_data):
+    dr = make_datarec(sample_data)
+    report = dr.compact()
+
+    assert report['after'] < report['before']
+    assert isinstance(dr.data[dr.user_col].dtype, pd.CategoricalDtype)
+    assert isinstance(dr.data[dr.item_col].dtype, pd.CategoricalDtype)
+    assert dr.data[dr.rating_col].dtype == np.int8
+    assert dr.data[dr.timestamp_col].tolist() == [1, 2, 3, 4, 5, 6]
+    assert dr.data[dr.timestamp_col].dtype == np.int64
+
+
+def test_compact_integer_ids_and_fractional_ratings():
+    data = pd.DataFrame({'user': [1, 2, 2], 'item': [10, 10, 20], 'rating': [0.5, 1.0, 4.5]})
+    dr = DataRec(RawData(data, user='user', item='item', rating='rating'))
+    dr.compact()
+
+    assert dr.data[dr.user_col].dtype == np.int32
+    assert dr.data[dr.item_col].dtype == np.int32
+    assert dr.data[dr.rating_col].dtype == np.float32
+    assert dr.users == [1, 2]
+
+
+def test_compact_is_transparent(sample_data):
+    plain, compact = make_datarec(sample_data), make_datarec(sample_data)
+    compact.compact()
+
+    assert compact.n_users == plain.n_users
+    assert compact.sorted_items == plain.sorted_items
+
+    for processor in (UserItemIterativeKCore(cores=2), FilterByUserMeanRating()):
+        expected = processor.run(plain).data
+        result = processor.run(compact).data
+        assert result.index.tolist() == expected.index.tolist()
+
+    expected = LeaveOneOut(test=True, validation=False).run(plain)
+    result = LeaveOneOut(test=True, validation=False).run(compact)
+    assert sorted(result['test'].data.index) == sorted(expected['test'].data.index)
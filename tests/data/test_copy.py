@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData
+from datarec.processing import FilterByRatingThreshold
+from datarec.splitters import RandomHoldOut
+
+
+@pytest.fixture
+def sample_datarec():
+    data = pd.DataFrame({
+        'user': ['u1', 'u1', 'u2', 'u3', 'u3', 'u3'],
+        'item': ['i1', 'i2', 'i1', 'i3', 'i1', 'i2'],
+        'rating': [5.0, 4.0, 3.0, 5.0, 2.0, 1.0],
+    })
+    datarec = DataRec(RawData(data, user='user', item='item', rating='rating'), dataset_name='sample')
+    datarec.pipeline.add_step(name='load', operation='sample', params={})
+    return datarec
+
+
+def shares_column(first: DataRec, second: DataRec, column: str) -> bool:
+    return np.shares_memory(first.data[column].to_numpy(), second.data[column].to_numpy())
+
+
+def test_copy_keeps_metadata_and_shares_encoders(sample_datarec):
+    sample_datarec.build_encoding(on='all')
+    copied = sample_datarec.copy()
+
+    assert copied.dataset_name == 'sample'
+    assert [step.operation for step in copied.pipeline.steps] == ['sample']
+    assert copied.user_id_encoder.keys is sample_datarec.user_id_encoder.keys
+
+    copied.user_id_encoder.reset_encoding()
+    assert not copied.user_id_encoder.is_encoded()
+    assert sample_datarec.user_id_encoder.encoding == {'u1': 0, 'u2': 1, 'u3': 2}
+    with pytest.raises(ValueError):
+        sample_datarec.user_id_encoder.values[0] = 5
+
+
+def test_copy_is_deep_without_copy_on_write(sample_datarec):
+    with pd.option_context('mode.copy_on_write', False):
+        copied = sample_datarec.copy()
+        assert not shares_column(copied, sample_datarec, 'rating')
+
+        copied.data.loc[0, 'rating'] = 1.0
+        assert sample_datarec.data.loc[0, 'rating'] == 5.0
+
+        assert shares_column(sample_datarec.copy(deep=False), sample_datarec, 'rating')
+
+
+def test_copy_shares_buffers_with_copy_on_write(sample_datarec):
+    with pd.option_context('mode.copy_on_write', True):
+        copied = sample_datarec.copy()
+        assert shares_column(copied, sample_datarec, 'rating')
+
+        copied.data.loc[0, 'rating'] = 1.0
+        assert sample_datarec.data.loc[0, 'rating'] == 5.0
+        assert not shares_column(copied, sample_datarec, 'rating')
+
+
+def test_outputs_are_not_copied_and_share_encoders(sample_datarec):
+    sample_datarec.build_encoding(on='all')
+    sample_datarec.encode()
+
+    result = FilterByRatingThreshold(rating_threshold=0).run(sample_datarec)
+    assert result.user_id_encoder.keys is sample_datarec.user_id_encoder.keys
+    assert result.data['user_id'].tolist() == [0, 0, 1, 2, 2, 2]
+
+    splits = RandomHoldOut(test_ratio=0.5).run(sample_datarec)
+    for split in splits.values():
+        assert split.item_id_encoder.keys is sample_datarec.item_id_encoder.keys
+
+    data = sample_datarec.data
+    wrapped = DataRec(RawData(data, user='user_id', item='item_id', rating='rating'))
+    assert np.shares_memory(wrapped.data['rating'].to_numpy(), data['rating'].to_numpy())
+    wrapped.data['rating'] = 0.0
+    assert data['rating'].tolist() == [5.0, 4.0, 3.0, 5.0, 2.0, 1.0]
@@ -0,0 +1,140 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datarec import DataRec, RawData
+from datarec.data.utils import Encoder, IncrementalEncoder
+
+
+def test_encoder_build_encode_decode():
+    encoder = Encoder()
+    encoder.build_encoding(['u3', 'u1', 'u2'], offset=10)
+
+    assert encoder.is_encoded()
+    assert encoder.encoding == {'u3': 10, 'u1': 11, 'u2': 12}
+    assert encoder.encode(['u1', 'u1', 'u2']) == [11, 11, 12]
+    assert encoder.decode([12, 10]) == ['u2', 'u3']
+
+
+def test_encoder_array_variants():
+    encoder = Encoder()
+    encoder.build_encoding([5, 7, 9])
+
+    codes = encoder.encode_array(pd.Series([9, 5, 9]))
+    assert isinstance(codes, np.ndarray)
+    assert codes.tolist() == [2, 0, 2]
+    assert encoder.decode_array(codes).tolist() == [9, 5, 9]
+
+
+def test_encoder_non_contiguous_encoding():
+    encoder = Encoder()
+    encoder.apply_encoding({'a': 5, 'b': 3})
+
+    assert encoder.encode(['b', 'a']) == [3, 5]
+    assert encoder.decode([3, 5]) == ['b', 'a']
+
+    encoder.change_offset(0)
+    assert encoder.encoding == {'a': 2, 'b': 0}
+
+
+def test_encoder_unknown_ids():
+    encoder = Encoder()
+    encoder.build_encoding(['a', 'b'])
+
+    with pytest.raises(KeyError):
+        encoder.encode(['c'])
+    with pytest.raises(KeyError):
+        encoder.decode([2])
+
+
+def test_encoder_empty_and_reset():
+    encoder = Encoder()
+    with pytest.raises(ValueError):
+        encoder.encode(['a'])
+
+    encoder.build_encoding(['a'])
+    with pytest.raises(ValueError):
+        encoder.build_encoding(['b'])
+
+    encoder.reset_encoding()
+    assert not encoder.is_encoded()
+    assert encoder.encoding == {}
+
+
+def test_datarec_encode_decode_roundtrip():
+    data = pd.DataFrame({'user': ['x', 'y', 'x'], 'item': [30, 10, 20]})
+    datarec = DataRec(RawData(data.copy(), user='user', item='item'))
+
+    datarec.build_encoding(on='all')
+    datarec.encode()
+    assert datarec.data['user_id'].tolist() == [0, 1, 0]
+    assert datarec.data['item_id'].tolist() == [0, 1, 2]
+
+    datarec.decode()
+    assert datarec.data['user_id'].tolist() == ['x', 'y', 'x']
+    assert datarec.data['item_id'].tolist() == [30, 10, 20]
+
+
+def test_incremental_encoder_chunks():
+    encoder = IncrementalEncoder(offset=1)
+
+    assert encoder.encode_chunk(pd.Series(['b', 'a', 'b'])).tolist() == [1, 2, 1]
+    assert encoder.encode_chunk(np.array(['c', 'a'], dtype=object)).tolist() == [3, 2]
+    assert encoder.encode_one('d') == 4
+    assert encoder.forward == {'b': 1, 'a': 2, 'c': 3, 'd': 4}
+    assert encoder.decode_chunk([4, 1]).tolist() == ['d', 'b']
+    assert encoder.decode_one(3) == 'c'
+    with pytest.raises(KeyError):
+        encoder.decode_one(0)
+
+
+def test_incremental_encoder_matches_first_appearance_order():
+    rng = np.random.default_rng(0)
+    encoder = IncrementalEncoder()
+    expected = {}
+    for _ in range(50):
+        chunk = rng.integers(0, 2000, rng.integers(0, 300))
+        codes = encoder.encode_chunk(pd.Series(chunk))
+        assert codes.tolist() == [expected.setdefault(int(k), len(expected)) for k in chunk]
+    assert encoder.forward == expected
+
+
+def test_incremental_encoder_dtype():
+    encoder = IncrementalEncoder(dtype=np.int8)
+    assert encoder.encode_chunk([5, 6, 5]).dtype == np.int8
+    with pytest.raises(OverflowError):
+        encoder.encode_chunk(list(range(200)))
+
+
+def test_incremental_encoder_save_load(tmp_path):
+    encoder = IncrementalEncoder(offset=5)
+    encoder.encode_chunk(['x', 'y', 'z'])
+    path = tmp_path / 'vocabulary.npz'
+    encoder.save(path)
+
+    loaded = IncrementalEncoder.load(path)
+    assert loaded.forward == encoder.forward
+    assert loaded.encode_chunk(['z', 'w']).tolist() == [7, 8]
+
+
+def test_encoder_arrays_pack_string_keys():
+    keys = ['a' * 1000] + [f'u{i}' for i in range(999)] + ['ü']
+    encoder = Encoder()
+    encoder.build_encoding(keys, offset=3)
+    arrays = encoder.to_arrays()
+
+    # one long ID does not widen the others
+    assert sum(array.nbytes for array in arrays.values()) < 30_000
+    assert Encoder.from_arrays(**arrays).encoding == encoder.encoding
+    # fixed-width unicode keys, as saved by previous versions, are still read
+    legacy = Encoder.from_arrays(np.array(keys), arrays['values'])
+    assert legacy.encoding == encoder.encoding
+
+
+def test_incremental_encoder_save_load_long_keys(tmp_path):
+    encoder = IncrementalEncoder()
+    encoder.encode_chunk(['x' * 10_000] + [str(i) for i in range(1000)])
+    path = tmp_path / 'vocabulary.npz'
+    encoder.save(path)
+
+    assert path.stat().st_size < 40_000
+    assert IncrementalEncoder.load(path).forward == encoder.forward
@@ -0,0 +1,78 @@
+import statistics
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData
+from datarec.data.utils import quartile_bins, quartile_cuts, quartiles, popularity
+
+
+def reference_frequency(values) -> dict:
+    fr = dict(Counter(values))
+    return dict(sorted(fr.items(), key=lambda item: item[1], reverse=True))
+
+
+def reference_quartiles(count: dict) -> dict:
+    q1, q2, q3 = statistics.quantiles(count.values())
+    return {k: 0 if f <= q1 else 1 if f <= q2 else 2 if f <= q3 else 3 for k, f in count.items()}
+
+
+@pytest.fixture
+def sample_datarec():
+    rng = np.random.default_rng(0)
+    n = 2000
+    data = pd.DataFrame({
+        'user': rng.zipf(1.5, n) % 150,
+        'item': [f'i{i}' for i in rng.zipf(1.3, n) % 300],
+    })
+    return DataRec(RawData(data, user='user', item='item'))
+
+
+@pytest.mark.parametrize('size', [2, 3, 4, 5, 7, 50, 101])
+def test_quartile_cuts_match_statistics(size):
+    rng = np.random.default_rng(size)
+    values = rng.integers(0, 10, size)
+    assert np.allclose(quartile_cuts(values), statistics.quantiles(values.tolist()))
+    with pytest.raises(ValueError):
+        quartile_cuts(values[:1])
+
+
+def test_quartile_bins_put_cut_points_in_lower_bin():
+    values = np.array([1, 2, 3, 4, 5, 6, 7])
+    assert quartile_bins(values).tolist() == [0, 0, 1, 1, 2, 2, 3]
+
+
+def test_dict_adapters_match_reference(sample_datarec):
+    for on, column in (('users', 'user_id'), ('items', 'item_id')):
+        expected = reference_frequency(sample_datarec.data[column])
+        frequency = getattr(sample_datarec, f'{on}_frequency')()
+        assert list(frequency.items()) == list(expected.items())
+
+        expected_quartiles = reference_quartiles(expected)
+        assert list(getattr(sample_datarec, f'{on}_quartiles')().items()) == list(expected_quartiles.items())
+        assert quartiles(expected) == expected_quartiles
+
+        expected_popularity = {'most popular': [], 'popular': [], 'common': [], 'long tail': []}
+        names = {3: 'most popular', 2: 'popular', 1: 'common', 0: 'long tail'}
+        for key, quartile in expected_quartiles.items():
+            expected_popularity[names[quartile]].append(key)
+        assert getattr(sample_datarec, f'{on}_popularity')() == expected_popularity
+        assert popularity(expected_quartiles) == expected_popularity
+
+    relative = sample_datarec.users_relative_frequency()
+    assert sum(relative.values()) == pytest.approx(1.0)
+
+
+def test_array_variants(sample_datarec):
+    codes, counts = sample_datarec.frequency_arrays('items')
+    assert np.all(np.diff(counts) <= 0)
+    assert sample_datarec.item_index.keys[codes[0]] == next(iter(sample_datarec.items_frequency()))
+
+    buckets = sample_datarec.popularity_arrays('items')
+    assert sum(len(bucket) for bucket in buckets.values()) == sample_datarec.n_items
+    _, bins = sample_datarec.quartile_arrays('items')
+    assert (bins[np.isin(codes, buckets['long tail'])] == 0).all()
+
+    with pytest.raises(ValueError):
+        sample_datarec.frequency_arrays('ratings')
@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datarec import DataRec, RawData
+from datarec.data.index import InteractionIndex
+
+
+@pytest.fixture
+def sample_datarec():
+    data = pd.DataFrame({
+        'user': ['u2', 'u1', 'u2', 'u3', 'u1', 'u2'],
+        'item': [10, 20, 30, 10, 10, 40],
+        'rating': [5, 4, 3, 5, 2, 1],
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating'))
+
+
+def test_interaction_index_csr_layout():
+    index = InteractionIndex(pd.Series(['b', 'a', 'b', np.nan, 'c', 'a']))
+
+    assert index.keys.tolist() == ['b', 'a', 'c']
+    assert index.degrees.tolist() == [2, 2, 1]
+    assert index.rows('a').tolist() == [1, 5]
+    assert index.rows_many(['c', 'b']).tolist() == [4, 0, 2]
+    assert 'c' in index and 'z' not in index
+    with pytest.raises(KeyError):
+        index.rows('z')
+    with pytest.raises(KeyError):
+        index.rows_many(['a', 'z'])
+
+
+def test_get_user_interactions_matches_mask(sample_datarec):
+    for user in sample_datarec.users:
+        expected = sample_datarec.data[sample_datarec.data[sample_datarec.user_col] == user]
+        pd.testing.assert_frame_equal(sample_datarec.get_user_interactions(user), expected)
+    for item in sample_datarec.items:
+        expected = sample_datarec.data[sample_datarec.data[sample_datarec.item_col] == item]
+        pd.testing.assert_frame_equal(sample_datarec.get_item_interactions(item), expected)
+
+    with pytest.raises(ValueError):
+        sample_datarec.get_user_interactions('u9')
+    with pytest.raises(ValueError):
+        sample_datarec.get_item_interactions(99)
+
+
+def test_get_users_interactions_batched(sample_datarec):
+    result = sample_datarec.get_users_interactions(['u3', 'u1'])
+    assert result.index.tolist() == [3, 1, 4]
+
+    result = sample_datarec.get_items_interactions([40, 10])
+    assert result.index.tolist() == [5, 0, 3, 4]
+
+    with pytest.raises(ValueError):
+        sample_datarec.get_users_interactions(['u1', 'u9'])
+
+
+def test_index_invalidated_on_encoding(sample_datarec):
+    assert sample_datarec.user_index.keys.tolist() == ['u2', 'u1', 'u3']
+
+    sample_datarec.build_encoding(on='users')
+    sample_datarec.encode(users=True, items=False)
+    assert sample_datarec.user_index.keys.tolist() == [0, 1, 2]
+    assert sample_datarec.get_user_interactions(1).index.tolist() == [1, 4]
+
+    sample_datarec.decode(users=True, items=False)
+    assert sample_datarec.get_user_interactions('u1').index.tolist() == [1, 4]
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData, LazyDataRec
+from datarec.processing import Binarize, FilterByRatingThreshold, FilterByTime, UserKCore
+from datarec.splitters import RandomHoldOut
+
+
+@pytest.fixture
+def sample_datarec():
+    rng = np.random.default_rng(0)
+    n = 400
+    data = pd.DataFrame({
+        'user': rng.integers(0, 30, n),
+        'item': [f'i{i}' for i in rng.integers(0, 20, n)],
+        'rating': rng.integers(1, 6, n).astype(float),
+        'timestamp': rng.integers(0, 100, n),
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating', timestamp='timestamp'))
+
+
+def test_lazy_matches_eager(sample_datarec):
+    lazy = (sample_datarec.lazy()
+            .process(FilterByRatingThreshold(rating_threshold=2))
+            .select(['user_id', 'item_id', 'rating', 'timestamp'])
+            .process(FilterByTime(time_threshold=20, drop='before'))
+            .process(UserKCore(core=5)))
+    assert isinstance(lazy, LazyDataRec)
+
+    result = lazy.collect()
+
+    eager = FilterByRatingThreshold(rating_threshold=2).run(sample_datarec)
+    eager.data = RawData(eager.data[['user_id', 'item_id', 'rating', 'timestamp']],
+                         user='user_id', item='item_id', rating='rating', timestamp='timestamp')
+    eager = UserKCore(core=5).run(FilterByTime(time_threshold=20, drop='before').run(eager))
+
+    pd.testing.assert_frame_equal(result.data, eager.data)
+    assert [step.operation for step in result.pipeline.steps] == \
+        ['FilterByRatingThreshold', 'FilterByTime', 'UserKCore']
+    assert len(sample_datarec.data) == 400
+
+
+def test_lazy_explain_fuses_filters_and_drops_columns(sample_datarec):
+    lazy = (sample_datarec.lazy()
+            .process(FilterByRatingThreshold(rating_threshold=2))
+            .process(FilterByTime(time_threshold=20, drop='before'))
+            .process(UserKCore(core=5))
+            .select(['user_id', 'item_id']))
+
+    logical = lazy.explain(optimized=False)
+    assert logical.count('\n') == 5
+
+    plan = lazy.explain()
+    assert 'FilterByRatingThreshold(rating_threshold=2) & FilterByTime' in plan
+    assert 'Take [user_id, item_id] (drops [rating, timestamp])' in plan
+    assert 'Stage 2: Process UserKCore(core=5)' in plan
+    assert '(2 materializations)' in plan
+
+    result = lazy.collect()
+    assert list(result.data.columns) == ['user_id', 'item_id']
+
+
+def test_lazy_encode_and_binarize(sample_datarec):
+    result = (sample_datarec.lazy()
+              .process(FilterByRatingThreshold(rating_threshold=2))
+              .encode()
+              .process(Binarize(threshold=4, drop_rating_col=True))
+              .collect())
+
+    eager = FilterByRatingThreshold(rating_threshold=2).run(sample_datarec)
+    eager.build_encoding(on='all')
+    eager.encode()
+    eager = Binarize(threshold=4, drop_rating_col=True).run(eager)
+
+    pd.testing.assert_frame_equal(result.data, eager.data)
+    assert 'rating' not in result.data.columns
+
+
+def test_lazy_split(sample_datarec):
+    splits = (sample_datarec.lazy()
+              .process(FilterByRatingThreshold(rating_threshold=2))
+              .split(RandomHoldOut(test_ratio=0.2, seed=3))
+              .collect())
+    eager = RandomHoldOut(test_ratio=0.2, seed=3).run(FilterByRatingThreshold(rating_threshold=2).run(sample_datarec))
+
+    assert set(splits) == set(eager)
+    for name in splits:
+        pd.testing.assert_frame_equal(splits[name].data, eager[name].data)
+
+    with pytest.raises(ValueError):
+        sample_datarec.lazy().split(RandomHoldOut(test_ratio=0.2)).select(['user_id', 'item_id'])
+
+
+def test_lazy_select_requires_ids(sample_datarec):
+    with pytest.raises(ValueError):
+        sample_datarec.lazy().select(['user_id', 'rating'])
+    with pytest.raises(ValueError):
+        sample_datarec.lazy().select(['user_id', 'item_id', 'missing'])
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData, MappedDataRec
+from datarec.io.readers.transactions.tabular import read_transactions_tabular
+from datarec.splitters import RandomHoldOut
+from datarec.processing import (UserKCore, UserItemIterativeKCore, UserItemNRoundsKCore, FilterByRatingThreshold,
+                                FilterByUserMeanRating)
+
+
+@pytest.fixture
+def sample_datarec():
+    rng = np.random.default_rng(0)
+    n = 500
+    data = pd.DataFrame({
+        'user': [f'u{i}' for i in rng.integers(0, 40, n)],
+        'item': rng.integers(0, 30, n),
+        'rating': rng.integers(1, 6, n).astype(float),
+        'timestamp': rng.integers(0, 100, n),
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating', timestamp='timestamp'))
+
+
+@pytest.fixture
+def mapped(sample_datarec, tmp_path):
+    return MappedDataRec.from_datarec(sample_datarec, str(tmp_path / 'base'), chunksize=64)
+
+
+def test_mapped_roundtrip_and_degrees(sample_datarec, mapped):
+    assert len(mapped) == len(sample_datarec)
+    assert mapped.n_users == sample_datarec.n_users
+    assert mapped.n_items == sample_datarec.n_items
+    pd.testing.assert_frame_equal(mapped.to_datarec().data, sample_datarec.data)
+
+    chunks = list(mapped.iter_chunks(chunksize=100))
+    assert len(chunks) == 5
+    pd.testing.assert_frame_equal(pd.concat(chunks), sample_datarec.data)
+
+
+def test_mapped_keeps_the_encoders(sample_datarec, tmp_path):
+    sample_datarec.build_encoding(on='all')
+    built = MappedDataRec.from_datarec(sample_datarec, str(tmp_path / 'built'), chunksize=64)
+    # the encoders are built but not applied, also in the snapshots derived from the mapped data
+    for datarec in (built.to_datarec(), built.process(UserKCore(core=5), str(tmp_path / 'kcore')).to_datarec()):
+        assert datarec.user_id_encoder.encoding == sample_datarec.user_id_encoder.encoding
+        assert not datarec.user_id_encoder.applied and not datarec.item_id_encoder.applied
+
+    sample_datarec.encode()
+    loaded = MappedDataRec.from_datarec(sample_datarec, str(tmp_path / 'encoded'), chunksize=64).to_datarec()
+    assert loaded.user_id_encoder.applied and loaded.item_id_encoder.applied
+    pd.testing.assert_frame_equal(loaded.data, sample_datarec.data)
+    loaded.decode()
+    sample_datarec.decode()
+    pd.testing.assert_frame_equal(loaded.data, sample_datarec.data)
+
+
+@pytest.mark.parametrize('processor', [UserKCore(core=15), UserItemIterativeKCore(user_core=12, item_core=17),
+                                       UserItemNRoundsKCore(rounds=1, user_core=12, item_core=17),
+                                       FilterByRatingThreshold(rating_threshold=3)])
+def test_mapped_process_matches_in_memory(processor, sample_datarec, mapped, tmp_path):
+    expected = processor.run(sample_datarec)
+    result = mapped.process(processor, str(tmp_path / 'processed'))
+
+    assert result.pipeline.steps[-1].operation == processor.__class__.__name__
+    pd.testing.assert_frame_equal(result.to_datarec().data, expected.data.reset_index(drop=True))
+
+
+def test_mapped_process_unsupported(mapped, tmp_path):
+    with pytest.raises(NotImplementedError):
+        mapped.process(FilterByUserMeanRating(), str(tmp_path / 'processed'))
+
+
+def test_mapped_splits(sample_datarec, mapped, tmp_path):
+    splits = mapped.random_hold_out(test_ratio=0.2, val_ratio=0.1, seed=1, dirpath=str(tmp_path / 'random'))
+    assert {k: len(v) for k, v in splits.items()} == {'train': 360, 'test': 100, 'val': 40}
+    rows = pd.concat([split.to_datarec().data for split in splits.values()])
+    assert len(rows.drop_duplicates()) == len(sample_datarec.data.drop_duplicates())
+
+    splits = mapped.temporal_threshold_split(val_threshold=50, test_threshold=80, dirpath=str(tmp_path / 'temporal'))
+    timestamps = sample_datarec.data['timestamp']
+    assert len(splits['train']) == (timestamps < 50).sum()
+    assert len(splits['test']) == (timestamps >= 80).sum()
+    assert splits['val'].to_datarec().data['timestamp'].between(50, 79).all()
+
+
+def test_mapped_random_hold_out_matches_random_hold_out(sample_datarec, mapped, tmp_path):
+    splits = mapped.random_hold_out(test_ratio=0.2, val_ratio=0.1, seed=1, dirpath=str(tmp_path / 'random'))
+    expected = RandomHoldOut(test_ratio=0.2, val_ratio=0.1, seed=1).run(sample_datarec)
+
+    assert splits['test'].pipeline.steps[-1].operation == 'RandomHoldOut'
+    for name, split in expected.items():
+        pd.testing.assert_frame_equal(splits[name].to_datarec().data, split.data.sort_index().reset_index(drop=True))
+
+
+def test_mapped_temporal_threshold_split_invalid_thresholds(mapped, tmp_path):
+    with pytest.raises(ValueError):
+        mapped.temporal_threshold_split(val_threshold=80, test_threshold=50, dirpath=str(tmp_path / 'temporal'))
+
+
+def test_read_transactions_tabular_out_of_core(sample_datarec, tmp_path):
+    sample_datarec.data.to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+    mapped = read_transactions_tabular(str(tmp_path / 'data.tsv'), sep='\t', header=0, user_col='user_id',
+                                       item_col='item_id', rating_col='rating', chunksize=100,
+                                       out_of_core=str(tmp_path / 'mapped'))
+
+    assert isinstance(mapped, MappedDataRec)
+    assert mapped.pipeline.steps[0].operation == 'read_transactions_tabular'
+    result = mapped.to_datarec().data
+    assert result['user_id'].tolist() == sample_datarec.data['user_id'].tolist()
+    assert result['rating'].tolist() == sample_datarec.data['rating'].tolist()
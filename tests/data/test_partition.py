@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData, PartitionedDataRec
+from datarec.processing import ItemKCore, UserKCore, FilterByUserMeanRating
+from datarec.splitters import LeaveOneOut, RandomHoldOut
+
+
+@pytest.fixture
+def sample_datarec():
+    rng = np.random.default_rng(0)
+    n = 600
+    data = pd.DataFrame({
+        'user': [f'u{u}' for u in rng.integers(0, 40, n)],
+        'item': rng.integers(0, 50, n),
+        'rating': rng.integers(1, 6, n).astype(float),
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating'))
+
+
+def count_rows(datarec: DataRec) -> int:
+    return len(datarec)
+
+
+def sorted_rows(data: pd.DataFrame) -> pd.DataFrame:
+    return data.sort_values(list(data.columns)).reset_index(drop=True)
+
+
+def test_partition_keeps_users_together(sample_datarec):
+    partitioned = sample_datarec.partition(4)
+    assert isinstance(partitioned, PartitionedDataRec)
+    assert len(partitioned) == 4
+    assert sum(len(shard) for shard in partitioned) == len(sample_datarec)
+
+    owners = {}
+    for number, shard in enumerate(partitioned):
+        for user in shard.users:
+            assert owners.setdefault(user, number) == number
+
+    pd.testing.assert_frame_equal(partitioned.collect().data.sort_index(), sample_datarec.data)
+    with pytest.raises(ValueError):
+        sample_datarec.partition(0)
+
+
+def test_map_partitions_matches_single_process(sample_datarec):
+    partitioned = sample_datarec.partition(3)
+
+    for processor in (UserKCore(core=15), FilterByUserMeanRating()):
+        expected = processor.run(sample_datarec)
+        result = partitioned.map_partitions(processor, workers=2)
+        pd.testing.assert_frame_equal(result.data.sort_index(), expected.data)
+        assert result.pipeline.steps[-1].operation == processor.__class__.__name__
+
+    splits = partitioned.map_partitions(LeaveOneOut(test=True, validation=False), workers=1)
+    expected = LeaveOneOut(test=True, validation=False).run(sample_datarec)
+    for name in ('train', 'test'):
+        pd.testing.assert_frame_equal(sorted_rows(splits[name].data), sorted_rows(expected[name].data))
+
+    assert partitioned.map_partitions(count_rows, workers=2) == [len(shard) for shard in partitioned]
+
+
+def test_map_partitions_rejects_non_local_operations(sample_datarec):
+    with pytest.raises(ValueError):
+        sample_datarec.partition(2).map_partitions(ItemKCore(core=2))
+    with pytest.raises(ValueError):
+        sample_datarec.partition(2).map_partitions(RandomHoldOut(test_ratio=0.2))
+    result = sample_datarec.partition(2, by='item').map_partitions(ItemKCore(core=10), workers=1)
+    pd.testing.assert_frame_equal(result.data.sort_index(), ItemKCore(core=10).run(sample_datarec).data)
+
+
+def test_map_partitions_with_more_shards_than_users():
+    data = pd.DataFrame({
+        'user': ['a', 'a', 'b', 'b', 'c', 'c', 'c'],
+        'item': [1, 2, 1, 3, 2, 3, 4],
+        'timestamp': [0, 1, 2, 3, 4, 5, 6],
+    })
+    datarec = DataRec(RawData(data, user='user', item='item', timestamp='timestamp'))
+    partitioned = datarec.partition(16)
+    assert all(shard.user_col == 'user_id' for shard in partitioned)
+
+    splits = partitioned.map_partitions(LeaveOneOut(test=True, validation=False), workers=1)
+    expected = LeaveOneOut(test=True, validation=False).run(datarec)
+    for name in ('train', 'test'):
+        assert splits[name].data.index.equals(pd.RangeIndex(len(expected[name])))
+        pd.testing.assert_frame_equal(sorted_rows(splits[name].data), sorted_rows(expected[name].data))
+    pd.testing.assert_frame_equal(partitioned.map_partitions(UserKCore(core=3), workers=1).data,
+                                  UserKCore(core=3).run(datarec).data)
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData, from_snapshot
+from datarec.data.snapshot import is_snapshot
+from datarec.processing import UserKCore
+
+
+@pytest.fixture
+def sample_datarec():
+    data = pd.DataFrame({
+        'user': ['u1', 'u1', 'u2', 'u3', 'u3', 'u3'],
+        'item': ['i1', 'i2', 'i1', 'i3', 'i1', 'i2'],
+        'rating': [5.0, 4.0, 3.0, 5.0, 2.0, 1.0],
+        'timestamp': [1, 2, 3, 4, 5, 6],
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating', timestamp='timestamp'),
+                   dataset_name='sample', version_name='v1')
+
+
+def assert_same(loaded, expected):
+    pd.testing.assert_frame_equal(loaded.data, expected.data)
+    assert loaded.dataset_name == expected.dataset_name
+    assert loaded.version_name == expected.version_name
+    assert loaded.user_col == expected.user_col
+    assert loaded.timestamp_col == expected.timestamp_col
+    assert str(loaded.pipeline) == str(expected.pipeline)
+
+
+def test_snapshot_roundtrip(sample_datarec, tmp_path):
+    datarec = UserKCore(core=2).run(sample_datarec)
+    datarec.to_snapshot(str(tmp_path / 'snap'))
+
+    assert is_snapshot(str(tmp_path / 'snap'))
+    loaded = from_snapshot(dirpath=str(tmp_path / 'snap'))
+    assert_same(loaded, datarec)
+    assert loaded.n_users == 2
+
+
+def test_snapshot_roundtrip_compact_and_encoded(sample_datarec, tmp_path):
+    sample_datarec.compact()
+    sample_datarec.to_snapshot(str(tmp_path / 'compact'))
+    assert_same(from_snapshot(dirpath=str(tmp_path / 'compact'), mmap_mode=None), sample_datarec)
+
+    sample_datarec.build_encoding(on='users')
+    sample_datarec.build_encoding(on='items')
+    sample_datarec.encode()
+    sample_datarec.to_snapshot(str(tmp_path / 'encoded'))
+    loaded = from_snapshot(dirpath=str(tmp_path / 'encoded'))
+
+    assert_same(loaded, sample_datarec)
+    assert loaded.user_id_encoder.encoding == sample_datarec.user_id_encoder.encoding
+    assert loaded.user_id_encoder.applied and loaded.item_id_encoder.applied
+    loaded.decode()
+    assert loaded.data['user_id'].tolist() == ['u1', 'u1', 'u2', 'u3', 'u3', 'u3']
+
+    loaded.to_snapshot(str(tmp_path / 'decoded'))
+    assert not from_snapshot(dirpath=str(tmp_path / 'decoded')).user_id_encoder.applied
+
+
+def test_snapshot_missing_values_and_dtypes(tmp_path):
+    data = pd.DataFrame({
+        'user': ['a', np.nan, 'b'],
+        'item': pd.array([1, 2, None], dtype='Int64'),
+        'timestamp': pd.to_datetime([1, 2, 3], unit='s').tz_localize('Europe/Rome'),
+    })
+    datarec = DataRec(RawData(data, user='user', item='item', timestamp='timestamp'))
+    datarec.to_snapshot(str(tmp_path / 'snap'))
+
+    loaded = from_snapshot(dirpath=str(tmp_path / 'snap'))
+    pd.testing.assert_frame_equal(loaded.data, datarec.data)
+
+
+def test_snapshot_loaded_data_is_writable(sample_datarec, tmp_path):
+    sample_datarec.to_snapshot(str(tmp_path / 'snap'))
+    loaded = from_snapshot(dirpath=str(tmp_path / 'snap'))
+
+    loaded.data.loc[0, 'rating'] = 1.0
+    assert from_snapshot(dirpath=str(tmp_path / 'snap')).data.loc[0, 'rating'] == 5.0
+
+
+def test_from_snapshot_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        from_snapshot(dirpath=str(tmp_path / 'missing'))
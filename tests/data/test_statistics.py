@@ -0,0 +1,57 @@
+import pytest
+import pandas as pd
+from datarec import DataRec, RawData
+
+
+@pytest.fixture
+def sample_datarec():
+    data = pd.DataFrame({
+        'user': [1, 1, 2, 3, 3, 3],
+        'item': [10, 20, 10, 30, 10, 20],
+        'rating': [5, 4, 3, 5, 2, 1],
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating'))
+
+
+def test_statistics_are_cached(sample_datarec):
+    assert sample_datarec.n_users == 3
+    assert sample_datarec.user_index is sample_datarec.user_index
+    assert sample_datarec.sorted_users == {2: 1, 1: 2, 3: 3}
+    assert 'sorted_users' in sample_datarec._stats
+    # callers get copies, so changing them does not corrupt the cache
+    sample_datarec.sorted_users[2] = 99
+    sample_datarec.users.append(4)
+    assert sample_datarec.sorted_users == {2: 1, 1: 2, 3: 3}
+    assert sample_datarec.users == [1, 2, 3]
+    assert sample_datarec.sorted_items == {30: 1, 20: 2, 10: 3}
+    assert sample_datarec.user_degrees.to_dict() == {1: 2, 2: 1, 3: 3}
+
+
+def test_statistics_invalidated_by_api_changes(sample_datarec):
+    version = sample_datarec.data_version
+    users_before = sample_datarec.sorted_users
+
+    sample_datarec.build_encoding(on='users', offset=100)
+    sample_datarec.encode(users=True, items=False)
+
+    assert sample_datarec.data_version > version
+    assert sample_datarec.users == [100, 101, 102]
+    assert sample_datarec.sorted_users == {101: 1, 100: 2, 102: 3}
+    assert sample_datarec.sorted_users is not users_before
+
+    sample_datarec.data = RawData(pd.DataFrame({'u': [7], 'i': [8]}), user='u', item='i')
+    assert sample_datarec.n_users == 1
+    assert sample_datarec.users == [7]
+
+
+def test_statistics_guard_against_direct_changes(sample_datarec):
+    assert sample_datarec.n_items == 3
+    sample_datarec.data.drop(index=[3], inplace=True)
+    assert sample_datarec.n_items == 2
+    assert sample_datarec.transactions == 5
+
+
+def test_cached_users_list_is_not_shared(sample_datarec):
+    users = sample_datarec.users
+    users.append(99)
+    assert sample_datarec.users == [1, 2, 3]
@@ -55,3 +55,18 @@ def test_raw_data_append_incompatible_raises():
     r2 = RawData(dummy_random_dataset(), user="user", item="item")
     with pytest.raises(ValueError):
         _ = r1 + r2
+
+
+def test_raw_data_append_method():
+    """append concatenates the rows of a DataFrame or of a compatible RawData in place."""
+    dummy_data = dummy_fixed_dataset()
+    rawdata = RawData(dummy_data['data'], user='user_id', item='item_id', rating='rating', timestamp='timestamp')
+    rawdata.append(dummy_data['data'])
+    assert len(rawdata) == 2 * dummy_data['len']
+
+    other = RawData(dummy_data['data'], user='user_id', item='item_id', rating='rating', timestamp='timestamp')
+    rawdata.append(other)
+    assert len(rawdata) == 3 * dummy_data['len']
+
+    with pytest.raises(ValueError):
+        rawdata.append(RawData(dummy_data['data'], user='item_id', item='user_id'))
@@ -81,3 +81,20 @@ def test_read_transactions_jsonl_stream(tmp_path):
     assert len(rd.data) == 2
     assert rd.is_encoded(on="users") is True
     assert rd.is_encoded(on="items") is True
+
+
+def test_read_transactions_tabular_compact(tmp_path):
+    p = tmp_path / "tx.tsv"
+    p.write_text("user\titem\trating\ntom\tit1\t5\nbob\tit2\t3\n", encoding="utf-8")
+    rd = read_transactions_tabular(
+        str(p),
+        sep="\t",
+        user_col="user",
+        item_col="item",
+        rating_col="rating",
+        header=0,
+        compact=True,
+    )
+    assert str(rd.data[rd.user_col].dtype) == "category"
+    assert str(rd.data[rd.rating_col].dtype) == "int8"
+    assert rd.pipeline.steps[0].params["compact"] is True
@@ -0,0 +1,88 @@
+import pytest
+import pandas as pd
+from datarec import DataRec, RawData
+from datarec.io.readers.transactions.tabular import read_transactions_tabular
+from datarec.pipeline import MemoryTracker, MemoryBudgetExceeded
+from datarec.pipeline.memory import parse_bytes
+from datarec.processing import UserKCore, FilterByRatingThreshold, FilterByTime
+from datarec.processing.chain import ProcessingChain
+
+
+@pytest.fixture
+def sample_data():
+    data = pd.DataFrame({
+        'user': [1, 1, 2, 3, 3, 3, 4],
+        'item': [10, 20, 30, 40, 50, 70, 70],
+        'rating': [5, 4, 3, 5, 2, 1, 4],
+        'timestamp': [111, 112, 113, 114, 115, 116, 117]
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating', timestamp='timestamp'))
+
+
+def test_memory_usage_per_column(sample_data):
+    usage = sample_data.memory_usage()
+
+    assert list(usage.index) == ['Index', 'user_id', 'item_id', 'rating', 'timestamp']
+    assert usage['rating'] == 7 * 8
+
+
+def test_parse_bytes():
+    assert parse_bytes(100) == 100
+    assert parse_bytes('2KB') == 2048
+    assert parse_bytes('1.5 gb') == int(1.5 * 1024 ** 3)
+    with pytest.raises(ValueError):
+        parse_bytes('a lot')
+
+
+def test_tracker_records_processor_runs(sample_data):
+    with MemoryTracker() as tracker:
+        UserKCore(core=2).run(sample_data)
+    UserKCore(core=2).run(sample_data)
+
+    report = tracker.report()
+    assert report['step'].tolist() == ['UserKCore']
+    assert report['input_bytes'].iloc[0] == sample_data.memory_usage(deep=False).sum()
+    assert tracker.peak >= report['end_bytes'].iloc[0]
+
+
+def test_tracker_budget(sample_data):
+    with MemoryTracker(budget=1, on_exceed='warn') as tracker:
+        with pytest.warns(RuntimeWarning):
+            UserKCore(core=2).run(sample_data)
+
+    with MemoryTracker(budget=1, on_exceed='raise') as tracker:
+        with pytest.raises(MemoryBudgetExceeded):
+            UserKCore(core=2).run(sample_data)
+    assert tracker.records == []
+
+
+def test_pipeline_apply_with_tracker(sample_data, tmp_path):
+    sample_data.data.to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+    datarec = read_transactions_tabular(str(tmp_path / 'data.tsv'), sep='\t', header=0, user_col='user_id',
+                                        item_col='item_id', rating_col='rating', timestamp_col='timestamp')
+    pipeline = datarec.pipeline.copy()
+    pipeline.add_step('process', 'FilterByRatingThreshold', {'rating_threshold': 3})
+    pipeline.add_step('process', 'UserKCore', {'core': 2})
+
+    tracker = MemoryTracker(budget='1GB')
+    result = pipeline.apply(input_folder=str(tmp_path), memory_tracker=tracker)
+
+    steps = tracker.report()['step'].tolist()
+    assert steps[0] == 'read -> read_transactions_tabular'
+    assert steps[-1] == 'process -> FilterByRatingThreshold, UserKCore'
+    # the fused row-wise processors are recorded together, the others by Processor.run
+    assert 'FilterByRatingThreshold' in steps and 'UserKCore' in steps
+    assert result.data['user_id'].tolist() == [1, 1]
+
+
+def test_tracker_records_fused_processors(sample_data):
+    chain = ProcessingChain([FilterByRatingThreshold(rating_threshold=3),
+                             FilterByTime(time_threshold=112, drop='before'), UserKCore(core=2)])
+    with MemoryTracker() as tracker:
+        chain.run(sample_data)
+
+    assert tracker.report()['step'].tolist() == ['FilterByRatingThreshold + FilterByTime', 'UserKCore']
+
+    with MemoryTracker(budget=1, on_exceed='raise'):
+        with pytest.raises(MemoryBudgetExceeded, match='FilterByRatingThreshold \\+ FilterByTime'):
+            chain.run(sample_data)
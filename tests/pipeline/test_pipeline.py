@@ -32,7 +32,7 @@ PROCESSORS = [
     (UserItemIterativeKCore, {'user_core': 2, 'item_core': 2}),
     (UserItemNRoundsKCore, {'user_core': 2, 'item_core': 2, 'rounds': 2}),
     (FilterByRatingThreshold, {'rating_threshold': 2}),
-    #(FilterByUserMeanRating, {}), #TODO: manage classes whithout parameters
+    (FilterByUserMeanRating, {}),
     (FilterByTime, {'time_threshold': 0, 'drop': 'after'})
 ]
 
@@ -0,0 +1,77 @@
+import pytest
+import pandas as pd
+from datarec import DataRec, RawData
+from datarec.io.readers import read_transactions_tabular
+from datarec.processing import (Binarize, ProcessingChain, FilterByRatingThreshold, FilterByTime, UserKCore,
+                                ItemKCore)
+
+
+@pytest.fixture
+def sample_data():
+    data = pd.DataFrame({
+        'user': [1, 1, 1, 2, 2, 3, 3, 3, 4],
+        'item': [10, 20, 30, 10, 40, 20, 30, 50, 10],
+        'rating': [5, 2, 4, 3, 5, 1, 4, 5, 2],
+        'timestamp': [100, 110, 120, 130, 140, 150, 160, 170, 180]
+    })
+    return DataRec(RawData(data, user='user', item='item', rating='rating', timestamp='timestamp'))
+
+
+def _steps():
+    return [FilterByRatingThreshold(rating_threshold=2),
+            FilterByTime(time_threshold=170, drop='before'),
+            Binarize(threshold=4),
+            UserKCore(core=2),
+            FilterByRatingThreshold(rating_threshold=1),
+            ItemKCore(core=2)]
+
+
+def test_chain_matches_sequential_processors(sample_data):
+    expected = sample_data
+    for step in _steps():
+        expected = step.run(expected)
+
+    result = ProcessingChain(_steps()).run(sample_data)
+
+    assert result.data.equals(expected.data)
+    assert result.data.index.equals(expected.data.index)
+    assert [s.to_dict() for s in result.pipeline.steps] == [s.to_dict() for s in expected.pipeline.steps]
+
+
+def test_chain_records_every_step(sample_data):
+    result = ProcessingChain([FilterByRatingThreshold(rating_threshold=3),
+                              FilterByTime(time_threshold=150, drop='before')]).run(sample_data)
+
+    assert [s.operation for s in result.pipeline.steps] == ['FilterByRatingThreshold', 'FilterByTime']
+    assert result.data['rating'].tolist() == [5, 4, 3, 5]
+    assert len(sample_data.pipeline.steps) == 0
+
+
+def test_chain_drops_rating_column(sample_data):
+    result = ProcessingChain([Binarize(threshold=4, implicit=True), UserKCore(core=2)]).run(sample_data)
+
+    assert result.rating_col is None
+    assert 'rating' not in result.data.columns
+    assert result.data['user_id'].tolist() == [1, 1, 3, 3]
+
+
+def test_chain_invalid_step():
+    with pytest.raises(TypeError):
+        ProcessingChain([object()])
+
+
+def test_pipeline_apply_replays_fused_steps(sample_data, tmp_path):
+    sample_data.data.to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+    datarec = read_transactions_tabular(str(tmp_path / 'data.tsv'), sep='\t', header=0, user_col='user_id',
+                                        item_col='item_id', rating_col='rating', timestamp_col='timestamp')
+    pipeline = datarec.pipeline.copy()
+    for step in _steps():
+        pipeline.add_step('process', step.__class__.__name__, step.params)
+
+    result = pipeline.apply(input_folder=str(tmp_path))
+
+    expected = datarec
+    for step in _steps():
+        expected = step.run(expected)
+    assert result.data.equals(expected.data)
+    assert [s.to_dict() for s in result.pipeline.steps] == [s.to_dict() for s in expected.pipeline.steps]
@@ -1,8 +1,9 @@
 import pytest
+import numpy as np
 import pandas as pd
 from datarec import DataRec, RawData
 from datarec.processing.kcore import (KCore, UserKCore, ItemKCore, IterativeKCore, UserItemIterativeKCore,
-                                      NRoundsKCore, UserItemNRoundsKCore)
+                                      NRoundsKCore, UserItemNRoundsKCore, kcore_mask)
 
 
 @pytest.fixture
@@ -163,3 +164,47 @@ def test_useritemnroundskcore_invalid_cores_type():
 def test_nroundskcore_invalid_rounds_type():
     with pytest.raises(TypeError):
         NRoundsKCore(columns=['user_id', 'item_id'], cores=[2, 2], rounds="invalid")
+
+
+def _sequential_kcore(data, cores, rounds=None):
+    done = 0
+    while rounds is None or done < rounds:
+        prev_len = len(data)
+        for c, k in cores:
+            data = KCore(column=c, core=k).run(data)
+        done += 1
+        if len(data) == prev_len:
+            break
+    return data
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kcore_mask_matches_sequential_filters(seed):
+    rng = np.random.default_rng(seed)
+    n = 500
+    data = pd.DataFrame({
+        'user_id': rng.integers(0, 80, n),
+        'item_id': rng.integers(0, 60, n),
+        'rating': rng.integers(1, 6, n),
+    })
+    cores = [('user_id', 5), ('item_id', 6)]
+
+    expected = _sequential_kcore(data, cores)
+    result = data[kcore_mask(data, cores)]
+    assert result.equals(expected)
+    assert result.index.equals(expected.index)
+
+    expected = _sequential_kcore(data, cores, rounds=1)
+    result = data[kcore_mask(data, cores, rounds=1)]
+    assert result.index.equals(expected.index)
+
+
+def test_kcore_mask_drops_missing_keys():
+    data = pd.DataFrame({'user_id': [1, 1, None, None], 'item_id': [1, 1, 1, 1]})
+    mask = kcore_mask(data, [('user_id', 1), ('item_id', 1)])
+    assert mask.tolist() == [True, True, False, False]
+
+
+def test_kcore_mask_invalid_column():
+    with pytest.raises(ValueError):
+        kcore_mask(pd.DataFrame({'user_id': [1]}), [('invalid', 1)])
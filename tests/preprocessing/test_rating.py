@@ -1,8 +1,14 @@
+import numpy as np
 import pytest
 import pandas as pd
 from datarec import DataRec, RawData
 from datarec.processing.rating import (FilterByRatingThreshold,
+                                       FilterByRelativeRating,
                                        FilterByUserMeanRating,
+                                       FilterByUserMedianRating,
+                                       FilterByItemMeanRating,
+                                       FilterByUserTopKRating,
+                                       FilterByUserPercentileRating,
                                        FilterOutDuplicatedInteractions)
 
 
@@ -73,6 +79,60 @@ def test_filter_by_user_mean_rating_no_filter(sample_data):
     assert filtered_datarec.data.equals(new_datarec.data)
 
 
+def test_filter_by_user_median_rating(sample_data):
+    new_datarec = FilterByUserMedianRating().run(sample_data)
+
+    user_medians = sample_data.data.groupby('user_id')['rating'].median()
+    assert len(new_datarec.data) == 5
+    for _, row in new_datarec.data.iterrows():
+        assert row['rating'] >= user_medians[row['user_id']]
+
+
+def test_filter_by_item_mean_rating():
+    data = pd.DataFrame({
+        'user': [1, 2, 3, 1, 2],
+        'item': [10, 10, 10, 20, 20],
+        'rating': [1, 3, 5, 4, 4],
+    })
+    datarec = DataRec(RawData(data, user='user', item='item', rating='rating'))
+    new_datarec = FilterByItemMeanRating().run(datarec)
+
+    assert new_datarec.data['rating'].tolist() == [3, 5, 4, 4]
+
+
+def test_filter_by_user_top_k_rating(sample_data):
+    new_datarec = FilterByUserTopKRating(k=1).run(sample_data)
+
+    assert new_datarec.data['user_id'].tolist() == [1, 2, 3, 4]
+    assert new_datarec.data['item_id'].tolist() == [10, 40, 60, 80]
+
+
+def test_filter_by_user_percentile_rating(sample_data):
+    top = FilterByUserPercentileRating(percentile=100).run(sample_data)
+    everything = FilterByUserPercentileRating(percentile=0).run(sample_data)
+
+    assert top.data['item_id'].tolist() == [10, 40, 60, 80]
+    assert everything.data.equals(sample_data.data)
+
+
+def test_filter_by_relative_rating_matches_user_mean(sample_data):
+    generic = FilterByRelativeRating(on='user', statistic='mean').run(sample_data)
+    legacy = FilterByUserMeanRating().run(sample_data)
+
+    assert generic.data.equals(legacy.data)
+
+
+def test_filter_by_relative_rating_invalid():
+    with pytest.raises(ValueError):
+        FilterByRelativeRating(on='invalid')
+    with pytest.raises(ValueError):
+        FilterByRelativeRating(statistic='invalid')
+    with pytest.raises(ValueError):
+        FilterByRelativeRating(statistic='percentile', percentile=101)
+    with pytest.raises(ValueError):
+        FilterByUserTopKRating(k=0)
+
+
 def test_filter_out_duplicated_interactions_first(duplicate_data):
     flt = FilterOutDuplicatedInteractions(keep='first')
     result = flt.run(duplicate_data, verbose=False)
@@ -112,6 +172,33 @@ def test_filter_out_duplicated_interactions_random_is_deterministic(duplicate_da
     assert result1.data.equals(result2.data)
 
 
+def test_filter_out_duplicated_interactions_random_keeps_one_per_pair(duplicate_data):
+    result = FilterOutDuplicatedInteractions(keep='random', random_seed=3).run(duplicate_data, verbose=False)
+
+    assert len(result.data) == 4
+    assert not result.data.duplicated(subset=['user_id', 'item_id']).any()
+
+
+def test_filter_out_duplicated_interactions_without_sort(duplicate_data):
+    result = FilterOutDuplicatedInteractions(keep='latest', sort=False).run(duplicate_data, verbose=False)
+
+    assert result.data.index.tolist() == [1, 2, 4, 5]
+    assert result.data['timestamp'].tolist() == [200, 150, 60, 10]
+
+
+def test_filter_out_duplicated_interactions_latest_ignores_missing_timestamps():
+    data = pd.DataFrame({
+        'user': [1, 1, 1],
+        'item': [10, 10, 10],
+        'rating': [3, 5, 4],
+        'timestamp': [100, 200, None]
+    })
+    datarec = DataRec(RawData(data, user='user', item='item', rating='rating', timestamp='timestamp'))
+
+    result = FilterOutDuplicatedInteractions(keep='latest').run(datarec, verbose=False)
+    assert result.data['rating'].tolist() == [5]
+
+
 def test_filter_out_duplicated_interactions_requires_timestamp():
     data = pd.DataFrame({
         'user': [1, 1, 2],
@@ -128,3 +215,16 @@ def test_filter_out_duplicated_interactions_requires_timestamp():
 def test_filter_out_duplicated_interactions_invalid_strategy():
     with pytest.raises(ValueError):
         FilterOutDuplicatedInteractions(keep='invalid')
+
+
+@pytest.mark.parametrize('seed', [0, 7, 42])
+def test_filter_out_duplicated_interactions_random_matches_a_seeded_shuffle(seed):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({'user': rng.integers(0, 10, 300), 'item': rng.integers(0, 10, 300),
+                         'rating': rng.integers(1, 6, 300)})
+    datarec = DataRec(RawData(data, user='user', item='item', rating='rating'))
+
+    result = FilterOutDuplicatedInteractions(keep='random', random_seed=seed).run(datarec, verbose=False)
+
+    expected = datarec.data.sample(frac=1, random_state=seed).drop_duplicates(subset=['user_id', 'item_id'])
+    assert sorted(result.data.index) == sorted(expected.index)
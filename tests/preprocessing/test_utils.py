@@ -0,0 +1,41 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datarec.processing.utils import group_sizes, group_size_mask, filter_by_mask
+
+
+@pytest.fixture
+def sample_data():
+    return pd.DataFrame({
+        'user_id': [1, 1, 2, 3, 3, 3, None],
+        'item_id': [10, 20, 30, 40, 50, 70, 70],
+    })
+
+
+def test_group_sizes(sample_data):
+    sizes = group_sizes(sample_data, 'user_id')
+    assert sizes.tolist() == [2, 2, 1, 3, 3, 3, 0]
+
+
+def test_group_size_mask_bounds(sample_data):
+    assert group_size_mask(sample_data, 'user_id', min_size=2).tolist() == [True, True, False, True, True, True, False]
+    assert group_size_mask(sample_data, 'user_id', max_size=2).tolist() == [True, True, True, False, False, False, False]
+    assert group_size_mask(sample_data, 'item_id', min_size=2, max_size=2).tolist() == [False] * 5 + [True, True]
+
+
+def test_group_size_mask_matches_groupby_filter(sample_data):
+    expected = sample_data.groupby('user_id').filter(lambda x: len(x) >= 2)
+    result = filter_by_mask(sample_data, group_size_mask(sample_data, 'user_id', min_size=2))
+    assert result.equals(expected)
+
+
+def test_filter_by_mask_does_not_modify_input(sample_data):
+    original = sample_data.copy()
+    result = filter_by_mask(sample_data, np.ones(len(sample_data), dtype=bool))
+    result.loc[0, 'item_id'] = -1
+    assert sample_data.equals(original)
+
+
+def test_group_sizes_invalid_column(sample_data):
+    with pytest.raises(ValueError):
+        group_sizes(sample_data, 'invalid')
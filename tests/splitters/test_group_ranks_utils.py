@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from datarec.data.index import InteractionIndex
+from datarec.splitters.utils import (TRAIN, TEST, VALIDATION, group_ranks, random_ranks, latest_ranks,
+                                     UNASSIGNED, assign_by_rank, held_out_by_rank, temporal_holdout, temporal_holdout_assignment)
+
+
+def test_group_ranks_by_key():
+    codes = np.array([0, 1, 0, 0, 1, -1])
+    keys = np.array([3, 1, 1, 2, 5, 0])
+
+    assert group_ranks(codes, keys).tolist() == [2, 0, 0, 1, 1, -1]
+    assert group_ranks(codes, keys, ascending=False).tolist() == [0, 1, 2, 1, 0, -1]
+
+
+def test_group_ranks_ties_and_secondary_keys():
+    codes = np.array([0, 0, 0])
+    keys = np.array([1, 1, 0])
+
+    assert group_ranks(codes, keys).tolist() == [1, 2, 0]
+    assert group_ranks(codes, keys, np.array([2, 1, 0])).tolist() == [2, 1, 0]
+
+
+def test_random_ranks_are_permutations_per_group():
+    index = InteractionIndex(np.repeat(np.arange(50), 4))
+    ranks = random_ranks(index, seed=1)
+
+    assert (np.sort(ranks.reshape(50, 4), axis=1) == np.arange(4)).all()
+    np.testing.assert_array_equal(ranks, random_ranks(index, seed=1))
+    assert not np.array_equal(ranks, random_ranks(index, seed=2))
+
+
+def test_random_ranks_of_a_group_ignore_other_groups():
+    users = np.array(['a', 'b', 'a', 'c', 'a', 'b', 'a'], dtype=object)
+    ranks = random_ranks(InteractionIndex(users), seed=7)
+    alone = random_ranks(InteractionIndex(users[users == 'a']), seed=7)
+
+    np.testing.assert_array_equal(ranks[users == 'a'], alone)
+
+
+def test_assign_by_rank():
+    codes = np.array([0, 0, 0, 1, 1, -1])
+    ranks = np.array([0, 1, 2, 1, 0, -1])
+    assignment = assign_by_rank(ranks, codes, test_n=np.array([1, 0]), val_n=1)
+
+    assert assignment.dtype == np.uint8
+    assert assignment.tolist() == [TEST, VALIDATION, TRAIN, TRAIN, VALIDATION, UNASSIGNED]
+
+
+def test_held_out_by_rank_lists_held_out_rows_from_the_first_rank():
+    index = InteractionIndex(np.array(['a', 'b', 'a', 'a', 'b', 'a']))
+    ranks = np.array([3, 1, 0, 2, 0, 1])
+    assignment = assign_by_rank(ranks, index.codes, test_n=2, val_n=0)
+    order = held_out_by_rank(index, assignment, ranks)
+
+    assert order[assignment[order] == TRAIN].tolist() == [0, 3]
+    assert order[assignment[order] == TEST].tolist() == [2, 5, 4, 1]
+
+
+def test_temporal_holdout_assignment_matches_temporal_holdout():
+    frame = pd.DataFrame({'t': [5, 1, 3, 3, 9, 0, 3, 7, 2, 3]})
+    assignment, order = temporal_holdout_assignment(frame['t'], test_ratio=0.3, val_ratio=0.2)
+    train, test, val = temporal_holdout(frame, test_ratio=0.3, val_ratio=0.2, temporal_col='t')
+
+    for split, expected in ((TRAIN, train), (TEST, test), (VALIDATION, val)):
+        assert order[assignment[order] == split].tolist() == expected.index.tolist()
+
+
+def test_latest_ranks_missing_timestamps_last():
+    index = InteractionIndex(np.array([1, 1, 1, 2]))
+    timestamps = pd.Series([5.0, np.nan, 7.0, 1.0])
+
+    assert latest_ranks(index, timestamps, seed=0).tolist() == [1, 2, 0, 0]
@@ -40,3 +40,45 @@ def test_leave_n_last_splitting(sample_datarec):
     for user in sample_datarec.users:
         assert len(val[val['user_id'] == user]) == 1
         assert len(test[test['user_id'] == user]) == 1
+
+
+def test_leave_n_last_lists_held_out_interactions_from_the_most_recent():
+    data = pd.DataFrame({
+        'user': [1, 2, 1, 1, 2, 1, 2],
+        'item': [10, 50, 20, 30, 60, 40, 70],
+        'timestamp': [300, 100, 100, 400, 200, 200, 300],
+    })
+    datarec = DataRec(RawData(data, user="user", item="item", timestamp="timestamp"))
+    result = LeaveNLast(test_n=2, validation_n=1).run(datarec)
+
+    assert result["train"].data["item_id"].tolist() == [20]
+    assert result["test"].data["item_id"].tolist() == [30, 10, 70, 60]
+    assert result["val"].data["item_id"].tolist() == [40, 50]
+
+
+def test_leave_n_last_short_user_raises(sample_datarec):
+    with pytest.raises(ValueError):
+        LeaveNLast(test_n=2, validation_n=2).run(sample_datarec)
+
+
+def test_leave_n_last_ties_are_seeded():
+    data = pd.DataFrame({
+        'user': [1, 1, 1, 1, 2, 2],
+        'item': [10, 20, 30, 40, 50, 60],
+        'timestamp': [100, 300, 300, 300, 100, 200],
+    })
+    datarec = DataRec(RawData(data, user="user", item="item", timestamp="timestamp"))
+
+    picks = set()
+    for seed in range(20):
+        result = LeaveNLast(test_n=1, validation_n=1, seed=seed).run(datarec)
+        again = LeaveNLast(test_n=1, validation_n=1, seed=seed).run(datarec)
+        pd.testing.assert_frame_equal(result["test"].data, again["test"].data)
+
+        test, val = result["test"].data, result["val"].data
+        assert test.loc[test["user_id"] == 2, "item_id"].tolist() == [60]
+        assert val.loc[val["user_id"] == 2, "item_id"].tolist() == [50]
+        # among the tied latest interactions of user 1
+        assert set(test.loc[test["user_id"] == 1, "item_id"]) | set(val.loc[val["user_id"] == 1, "item_id"]) <= {20, 30, 40}
+        picks.add(test.loc[test["user_id"] == 1, "item_id"].item())
+    assert len(picks) > 1
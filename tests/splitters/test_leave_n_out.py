@@ -62,3 +62,28 @@ def test_leave_n_out_empty_split(sample_datarec):
 
     assert len(result["train"].data) == len(sample_datarec.data)
 
+
+
+def test_leave_n_out_short_user_raises(sample_datarec):
+    with pytest.raises(ValueError):
+        LeaveNOut(test_n=2, validation_n=2, seed=42).run(sample_datarec)
+
+
+def test_leave_n_out_groups_rows_by_user(sample_datarec):
+    result = LeaveNOut(test_n=1, validation_n=0, seed=3).run(sample_datarec)
+    train = result["train"].data
+
+    assert train["user_id"].tolist() == [1, 1, 2, 2, 3, 3]
+    assert train.index.tolist() == list(range(6))
+    # the rows of a user keep their relative order
+    for user in (1, 2, 3):
+        items = train.loc[train["user_id"] == user, "item_id"].tolist()
+        assert items == sorted(items)
+
+
+def test_leave_n_out_seed(sample_datarec):
+    picks = {seed: LeaveNOut(test_n=1, seed=seed).run(sample_datarec)["test"].data["item_id"].tolist()
+             for seed in range(10)}
+
+    assert picks[0] == LeaveNOut(test_n=1, seed=0).run(sample_datarec)["test"].data["item_id"].tolist()
+    assert len({tuple(pick) for pick in picks.values()}) > 1
@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datarec import DataRec, RawData
+from datarec.io.readers.transactions.tabular import read_transactions_tabular
+from datarec.io.writers.transactions.tabular import write_transactions_tabular
+from datarec.splitters import (SplitIndex, SplitView, LeaveOneOut, LeaveRatioLast, RandomHoldOut,
+                               TemporalHoldOut, TemporalThresholdSplit, UserStratifiedHoldOut)
+from datarec.splitters.split_index import pack_assignment, unpack_assignment
+from datarec.splitters.utils import TRAIN, TEST, VALIDATION, UNASSIGNED
+from datarec.pipeline import Pipeline
+
+
+@pytest.fixture
+def sample_datarec():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        'user': rng.integers(0, 20, 200),
+        'item': rng.integers(0, 50, 200),
+        'rating': rng.integers(1, 6, 200),
+        'timestamp': rng.permutation(200).astype(float),
+    }, index=rng.permutation(200) * 2)
+    return DataRec(RawData(data, user='user', item='item', rating='rating', timestamp='timestamp'))
+
+
+SPLITTERS = [
+    RandomHoldOut(test_ratio=0.2, val_ratio=0.1),
+    TemporalHoldOut(test_ratio=0.2, val_ratio=0.1),
+    TemporalThresholdSplit(val_threshold=120, test_threshold=160),
+    LeaveOneOut(test=True, validation=True),
+    LeaveRatioLast(test_ratio=0.2, val_ratio=0.1),
+    UserStratifiedHoldOut(test_ratio=0.2, val_ratio=0.1),
+]
+
+
+@pytest.mark.parametrize('splitter', SPLITTERS, ids=lambda s: s.__class__.__name__)
+def test_split_index_materializes_the_splits_of_run(splitter, sample_datarec):
+    splits = splitter.split_index(sample_datarec)
+    expected = splitter.run(sample_datarec)
+
+    assert isinstance(splits, SplitIndex)
+    assert splits.assignment.dtype == np.uint8
+    assert list(splits) == list(expected)
+    for name, datarec in expected.items():
+        assert splits[name].data.equals(datarec.data)
+        assert splits[name].data.index.equals(datarec.data.index)
+        assert splits.sizes[name] == len(datarec)
+        assert splits[name].pipeline.steps[-1].operation == splitter.__class__.__name__
+
+
+def test_splits_are_gathered_on_access(sample_datarec):
+    splits = LeaveOneOut(test=True, validation=False).split_index(sample_datarec)
+
+    assert 'val' not in splits
+    assert len(splits) == 2
+    assert splits._splits == {}
+    train = splits['train']
+    assert list(splits._splits) == ['train']
+    assert splits['train'] is train
+    with pytest.raises(KeyError):
+        splits['val']
+
+
+def test_unassigned_rows_are_left_out(sample_datarec):
+    sample_datarec.data.loc[sample_datarec.data.index[:5], 'timestamp'] = np.nan
+    splits = TemporalThresholdSplit(val_threshold=120, test_threshold=160).split_index(sample_datarec)
+
+    assert (splits.assignment[:5] == UNASSIGNED).all()
+    assert sum(splits.sizes.values()) == len(sample_datarec) - 5
+
+
+def test_assignment_must_cover_the_dataset(sample_datarec):
+    with pytest.raises(ValueError):
+        SplitIndex(sample_datarec, np.zeros(3, dtype=np.uint8))
+
+
+def test_positions_follow_the_order(sample_datarec):
+    assignment = np.full(len(sample_datarec), TRAIN, dtype=np.uint8)
+    assignment[[4, 1, 7]] = TEST
+    splits = SplitIndex(sample_datarec, assignment, order=np.arange(len(sample_datarec))[::-1])
+
+    assert splits.positions('test').tolist() == [7, 4, 1]
+    assert splits.sizes == {'train': len(sample_datarec) - 3, 'test': 3, 'val': 0}
+
+
+def test_view_streams_rows_from_the_parent(sample_datarec, tmp_path):
+    splits = LeaveOneOut(test=True, validation=False).split_index(sample_datarec)
+    view = splits.view('train')
+
+    assert isinstance(view, SplitView)
+    assert len(view) == splits.sizes['train']
+    blocks = list(view.iter_rawdata(chunksize=50))
+    assert len(blocks) == -(-len(view) // 50)
+    assert pd.concat([block.data for block in blocks]).equals(splits['train'].data)
+
+    write_transactions_tabular(view, str(tmp_path / 'streamed.tsv'), include_rating=True, verbose=False)
+    write_transactions_tabular(splits['train'], str(tmp_path / 'whole.tsv'), include_rating=True, verbose=False)
+    assert (tmp_path / 'streamed.tsv').read_text() == (tmp_path / 'whole.tsv').read_text()
+
+
+def test_pipeline_writes_split_views(sample_datarec, tmp_path):
+    sample_datarec.data.to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+    datarec = read_transactions_tabular(str(tmp_path / 'data.tsv'), sep='\t', header=0, user_col='user_id',
+                                        item_col='item_id', rating_col='rating', timestamp_col='timestamp')
+    splitter = LeaveOneOut(test=True, validation=False)
+    pipeline = datarec.pipeline.copy()
+    pipeline.add_step('split', 'LeaveOneOut', splitter.params)
+    pipeline.add_step('write', 'write_transactions_tabular', {'filename': 'out.tsv', 'verbose': False})
+
+    pipeline.apply(input_folder=str(tmp_path), output_folder=str(tmp_path))
+
+    expected = splitter.run(datarec)
+    for name in ('train', 'test'):
+        written = pd.read_csv(tmp_path / f'out_{name}.tsv', sep='\t')
+        assert written.values.tolist() == expected[name].data[['user_id', 'item_id']].values.tolist()
+
+
+def test_pack_assignment_round_trip():
+    rng = np.random.default_rng(1)
+    for n in (0, 1, 7, 8, 1001):
+        assignment = rng.choice(np.array([TRAIN, TEST, VALIDATION, UNASSIGNED], dtype=np.uint8), n)
+        packed = pack_assignment(assignment)
+        assert len(packed) == -(-n // 4)
+        np.testing.assert_array_equal(unpack_assignment(packed, n), assignment)
+
+
+def test_fingerprint_follows_the_rows(sample_datarec):
+    fingerprint = sample_datarec.fingerprint()
+
+    assert sample_datarec.copy().fingerprint() == fingerprint
+    shuffled = DataRec(RawData(sample_datarec.data.iloc[::-1], user='user_id', item='item_id',
+                               rating='rating', timestamp='timestamp'))
+    assert shuffled.fingerprint() != fingerprint
+
+
+@pytest.mark.parametrize('packed', [False, True])
+@pytest.mark.parametrize('splitter', SPLITTERS, ids=lambda s: s.__class__.__name__)
+def test_saved_split_reloads_the_same_splits(splitter, packed, sample_datarec, tmp_path):
+    splits = splitter.split_index(sample_datarec)
+    splits.save(str(tmp_path / 'split'), packed=packed)
+
+    loaded = SplitIndex.load(str(tmp_path / 'split'), sample_datarec.copy())
+
+    np.testing.assert_array_equal(loaded.assignment, splits.assignment)
+    assert list(loaded) == list(splits)
+    for name in splits:
+        assert loaded[name].data.equals(splits[name].data)
+        assert loaded[name].data.index.equals(splits[name].data.index)
+        assert loaded[name].pipeline.steps[-1].params['split_path'] == str(tmp_path / 'split')
+
+
+def test_saved_split_needs_the_same_dataset(sample_datarec, tmp_path):
+    LeaveOneOut().split_index(sample_datarec).save(str(tmp_path / 'split'))
+    changed = DataRec(RawData(sample_datarec.data.assign(rating=sample_datarec.data['rating'] + 1), user='user_id',
+                              item='item_id', rating='rating', timestamp='timestamp'))
+
+    with pytest.raises(ValueError):
+        SplitIndex.load(str(tmp_path / 'split'), changed)
+    assert len(SplitIndex.load(str(tmp_path / 'split'), changed, verify=False)) == 3
+    with pytest.raises(FileNotFoundError):
+        SplitIndex.load(str(tmp_path / 'missing'), sample_datarec)
+
+
+def test_pipeline_loads_the_saved_split(sample_datarec, tmp_path, monkeypatch):
+    sample_datarec.data.to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+    datarec = read_transactions_tabular(str(tmp_path / 'data.tsv'), sep='\t', header=0, user_col='user_id',
+                                        item_col='item_id', rating_col='rating', timestamp_col='timestamp')
+    splits = LeaveOneOut(test=True, validation=False).split_index(datarec)
+    splits.save(str(tmp_path / 'split'), packed=True)
+    splits['train'].pipeline.to_yaml(str(tmp_path / 'pipeline.yml'))
+
+    def fail(self, datarec):
+        raise AssertionError('the splitter must not run')
+
+    monkeypatch.setattr(LeaveOneOut, 'split_index', fail)
+    result = Pipeline.from_yaml(str(tmp_path / 'pipeline.yml')).apply(input_folder=str(tmp_path))
+
+    assert result['train'].data.equals(splits['train'].data)
+    assert result['test'].data.equals(splits['test'].data)
+
+
+def test_pipeline_runs_the_splitter_if_the_saved_split_is_stale(sample_datarec, tmp_path):
+    sample_datarec.data.to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+    datarec = read_transactions_tabular(str(tmp_path / 'data.tsv'), sep='\t', header=0, user_col='user_id',
+                                        item_col='item_id', rating_col='rating', timestamp_col='timestamp')
+    splits = LeaveOneOut(test=True, validation=False).split_index(datarec)
+    splits.save(str(tmp_path / 'split'))
+    splits['train'].pipeline.to_yaml(str(tmp_path / 'pipeline.yml'))
+    sample_datarec.data.iloc[::-1].to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+
+    with pytest.warns(UserWarning, match='Saved split not used'):
+        result = Pipeline.from_yaml(str(tmp_path / 'pipeline.yml')).apply(input_folder=str(tmp_path))
+
+    assert sum(len(split) for split in result.values()) == len(datarec)
+
+
+def test_pipeline_runs_the_splitter_if_the_params_are_edited(sample_datarec, tmp_path):
+    sample_datarec.data.to_csv(tmp_path / 'data.tsv', sep='\t', index=False)
+    datarec = read_transactions_tabular(str(tmp_path / 'data.tsv'), sep='\t', header=0, user_col='user_id',
+                                        item_col='item_id', rating_col='rating', timestamp_col='timestamp')
+    splits = UserStratifiedHoldOut(test_ratio=0.2, val_ratio=0.1).split_index(datarec)
+    splits.save(str(tmp_path / 'split'))
+    pipeline = splits['train'].pipeline
+    pipeline.steps[-1].params = {**pipeline.steps[-1].params, 'test_ratio': 0.5}
+    pipeline.to_yaml(str(tmp_path / 'pipeline.yml'))
+
+    with pytest.warns(UserWarning, match='was not made by UserStratifiedHoldOut'):
+        result = Pipeline.from_yaml(str(tmp_path / 'pipeline.yml')).apply(input_folder=str(tmp_path))
+
+    expected = UserStratifiedHoldOut(test_ratio=0.5, val_ratio=0.1).run(datarec)
+    assert {name: len(split) for name, split in result.items()} == \
+           {name: len(split) for name, split in expected.items()}
+    assert result['test'].data.equals(expected['test'].data)
@@ -94,3 +94,41 @@ def test_run_splitting(sample_datarec):
 
 
 
+
+
+def test_skipped_user_counts(too_small_dataset):
+    splitter = UserStratifiedHoldOut(test_ratio=0.5, val_ratio=0.5)
+
+    with pytest.warns(UserWarning, match="skipped splitting 2 users for validation"):
+        result = splitter.run(too_small_dataset)
+
+    # users 1 and 2 keep a single training interaction after the test split, user 3 keeps two
+    assert result["test"].data["user_id"].tolist() == [1, 1, 2, 3, 3]
+    assert result["val"].data["user_id"].tolist() == [3]
+    assert result["train"].data["user_id"].tolist() == [1, 2, 3]
+
+
+def test_can_split_vectorized():
+    assert UserStratifiedHoldOut._can_split(5, 0.2) is True
+    assert UserStratifiedHoldOut._can_split(1, 0.5) is False
+    assert UserStratifiedHoldOut._can_split([1, 2, 5], 0.5).tolist() == [False, True, True]
+    assert not UserStratifiedHoldOut._can_split([2, 5], 0).any()
+
+
+def test_run_reproducible_per_seed(sample_datarec):
+    first = UserStratifiedHoldOut(test_ratio=0.4, seed=1).run(sample_datarec)
+    again = UserStratifiedHoldOut(test_ratio=0.4, seed=1).run(sample_datarec)
+    pd.testing.assert_frame_equal(first["test"].data, again["test"].data)
+
+    picks = {tuple(UserStratifiedHoldOut(test_ratio=0.4, seed=seed).run(sample_datarec)["test"].data["item_id"])
+             for seed in range(10)}
+    assert len(picks) > 1
+
+
+def test_skipped_user_warning_points_at_the_caller(too_small_dataset):
+    splitter = UserStratifiedHoldOut(test_ratio=0.5, val_ratio=0.5)
+
+    for split in (splitter.run, splitter.split_index):
+        with pytest.warns(UserWarning, match="skipped splitting") as record:
+            split(too_small_dataset)
+        assert record[0].filename == __file__